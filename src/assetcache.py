@@ -0,0 +1,148 @@
+"""
+On-disk cache of preprocessed images: the final, already sliced and scaled pixels.
+
+    python src/assetcache.py info
+    python src/assetcache.py clear
+
+An entry holds raw RGBA frames behind a small header, so a warm start maps the
+file and builds surfaces straight from the mapped bytes: no PNG decode, no
+slicing, no scaling. Entries are named by a hash of the source file's contents,
+the preprocessing mode, TILE_SIZE and WIDTH/HEIGHT, so editing an image or
+changing any of those settings simply misses and writes a new entry.
+
+Modes:
+    'frames'  horizontal strip of 32px frames, each scaled to TILE_SIZE (player sheets)
+    'tile'    single image scaled to TILE_SIZE
+    'height'  smoothscaled to HEIGHT keeping the aspect ratio (parallax layers)
+"""
+import os
+import sys
+import mmap
+import struct
+import hashlib
+import argparse
+import threading
+from pathlib import Path
+import pygame
+from settings import TILE_SIZE, WIDTH, HEIGHT
+from utils import slice_spritesheet
+
+MAGIC = b"PXC1"
+VERSION = 1
+_HEADER = struct.Struct("<4sBHHH")  # magic, version, frame width, frame height, frame count
+
+CACHE_DIR = Path(__file__).resolve().parent / "asset_cache"
+
+SHEET_FRAME = 32
+
+
+def prepare(image, mode):
+    """The preprocessing a cache entry stands for; returns a list of frames."""
+    if mode == 'frames':
+        return [pygame.transform.scale(f, (TILE_SIZE, TILE_SIZE))
+                for f in slice_spritesheet(image, SHEET_FRAME, SHEET_FRAME)]
+    if mode == 'tile':
+        if image.get_size() == (TILE_SIZE, TILE_SIZE):
+            return [image]
+        return [pygame.transform.scale(image, (TILE_SIZE, TILE_SIZE))]
+    if mode == 'height':
+        w, h = image.get_size()
+        scale = HEIGHT / h if h else 1.0
+        return [pygame.transform.smoothscale(image, (int(w * scale), int(HEIGHT)))]
+    raise ValueError(f"unknown preprocessing mode {mode!r}")
+
+
+def entry_path(source_hash, mode):
+    key = f"{VERSION}|{source_hash}|{mode}|{TILE_SIZE}|{WIDTH}x{HEIGHT}"
+    return CACHE_DIR / (hashlib.sha1(key.encode("utf-8")).hexdigest() + ".px")
+
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def read(path):
+    """Map an entry and return its frames as surfaces over the mapped bytes, or None."""
+    try:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(mm) < _HEADER.size:
+        mm.close()
+        return None
+    magic, version, w, h, count = _HEADER.unpack_from(mm)
+    frame_bytes = w * h * 4
+    if magic != MAGIC or version != VERSION or len(mm) != _HEADER.size + count * frame_bytes:
+        mm.close()
+        return None
+    # Each surface keeps its slice of the map alive; the map closes once they are gone
+    view = memoryview(mm)
+    return [
+        pygame.image.frombuffer(view[_HEADER.size + i * frame_bytes:_HEADER.size + (i + 1) * frame_bytes],
+                                (w, h), "RGBA")
+        for i in range(count)
+    ]
+
+
+def write(path, frames):
+    """Store frames (all the same size) atomically; a failed write just means a miss next time."""
+    if not frames:
+        return
+    w, h = frames[0].get_size()
+    # Unique per process and thread: loader workers may write the same entry at once
+    tmp = path.with_name(path.name + f".{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, w, h, len(frames)))
+            for frame in frames:
+                f.write(pygame.image.tobytes(frame, "RGBA"))
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def load(source, mode):
+    """
+    Preprocessed frames for an image file: (frames, hit). Safe to call from worker
+    threads; the caller still has to convert the frames to the display format.
+    """
+    entry = entry_path(file_hash(source), mode)
+    frames = read(entry)
+    if frames is not None:
+        return frames, True
+    frames = prepare(pygame.image.load(str(source)), mode)
+    write(entry, frames)
+    return frames, False
+
+
+def info():
+    entries = sorted(CACHE_DIR.glob("*.px")) + sorted(CACHE_DIR.glob("reach-*")) if CACHE_DIR.exists() else []
+    return len(entries), sum(p.stat().st_size for p in entries)
+
+
+def clear():
+    # reach.py keeps its jump table here too (reach-*.json; reach-*.bin before that)
+    for pattern in ("*.px*", "reach-*"):
+        for p in CACHE_DIR.glob(pattern) if CACHE_DIR.exists() else []:
+            p.unlink()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=("info", "clear"))
+    args = parser.parse_args(argv)
+    if args.command == "clear":
+        clear()
+    count, nbytes = info()
+    print(f"{CACHE_DIR}: {count} entries, {nbytes / 1e6:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""
+Neighbour-bitmask autotiling for ground ('X') cells.
+
+Each ground cell gets a 4-bit mask of which of its neighbours are ground too
+(N, E, S, W); ROLES maps every mask to the tile image it is drawn with:
+grass on top of a column, dirt below it, and the left/right corner variants
+where only one side is open. masks() computes the masks of a whole layout in
+one NumPy pass for Level.build; mask_at() does a single cell, for re-tiling
+the 3x3 block around an edited cell (Level.set_cell).
+"""
+N, E, S, W = 1, 2, 4, 8
+GROUND = 'X'
+
+
+def _role(mask):
+    kind = 'dirt' if mask & N else 'grass'
+    left_air = not mask & W
+    right_air = not mask & E
+    if left_air and not right_air:
+        return kind + '_cl'
+    if right_air and not left_air:
+        return kind + '_cr'
+    return kind + '_mid'
+
+
+# mask -> image name in Level's tile images (S is free for art that needs it)
+ROLES = tuple(_role(mask) for mask in range(16))
+
+
+def masks(layout):
+    """Neighbour masks for every cell of layout (rows of strings); 0 where it isn't ground."""
+    # numpy only here: level.py is imported before the menu shows up
+    import numpy as np
+    rows = len(layout)
+    cols = len(layout[0]) if rows else 0
+    text = "".join(layout).encode("latin-1")
+    # 1 per ground cell, with a border of air around the layout
+    p = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+    p[1:-1, 1:-1] = np.frombuffer(text, dtype=np.uint8).reshape(rows, cols) == ord(GROUND)
+    m = (p[:-2, 1:-1] * N) | (p[1:-1, 2:] * E) | (p[2:, 1:-1] * S) | (p[1:-1, :-2] * W)
+    m *= p[1:-1, 1:-1]
+    return m
+
+
+def mask_at(cell, r, c):
+    """Neighbour mask of one cell; cell(r, c) returns the layout character there."""
+    return ((cell(r - 1, c) == GROUND) * N | (cell(r, c + 1) == GROUND) * E |
+            (cell(r + 1, c) == GROUND) * S | (cell(r, c - 1) == GROUND) * W)
@@ -14,13 +14,18 @@ class ParallaxBackground:
         for layer in layers:
             img = layer['image']
             spd = float(layer.get('speed', 0.5))
-            # scale to height, keep aspect
+            # scale to height, keep aspect (load_assets usually hands them over already scaled)
             w, h = img.get_size()
+            if h == HEIGHT:
+                self.layers.append({'image': img, 'speed': spd})
+                continue
             scale = HEIGHT / h if h else 1.0
             scaled = pygame.transform.smoothscale(img, (int(w * scale), int(HEIGHT)))
             self.layers.append({'image': scaled, 'speed': spd})
 
-    def draw(self, surf, camera_x: float):
+    def blit_sequence(self, camera_x: float):
+        """[(image, pos), ...] covering the screen, back layer first, for Surface.blits."""
+        seq = []
         for layer in self.layers:
             img = layer['image']
             spd = layer['speed']
@@ -28,9 +33,12 @@ class ParallaxBackground:
             # Parallax offset moves opposite the camera
             offset_x = -camera_x * spd
             # Tile horizontally to cover the whole screen
-            start_x = int(offset_x) % iw - iw
-            x = start_x
+            x = int(offset_x) % iw - iw
             while x < WIDTH:
                 # Align layers to bottom of the screen
-                surf.blit(img, (x, HEIGHT - ih))
+                seq.append((img, (x, HEIGHT - ih)))
                 x += iw
+        return seq
+
+    def draw(self, surf, camera_x: float):
+        surf.blits(self.blit_sequence(camera_x), doreturn=False)
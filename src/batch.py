@@ -0,0 +1,225 @@
+"""
+Vectorized batch simulator: thousands of independent players on one layout.
+
+    python src/batch.py --agents 4096 --steps 600     # throughput
+    python src/batch.py --check --seeds 20            # equivalence with the scalar Player
+
+Positions, velocities and on-ground flags live in NumPy arrays and collisions are
+resolved against a boolean solid grid built from the layout string. Each tick
+reproduces Player.update exactly (input, gravity, horizontal then vertical pass,
+tile order, pygame's rounding of float moves), so a batch agent fed the same
+inputs as a Player ends every tick on the same pixel with the same velocity.
+"""
+import sys
+import time
+import argparse
+import numpy as np
+from settings import TILE_SIZE, GRAVITY, JUMP_VELOCITY, PLAYER_SPEED, KILL_PLANE_Y
+from inputs import LEFT, RIGHT, JUMP
+
+# Same hitbox as Player.__init__
+PLAYER_W = int(TILE_SIZE * 0.6)
+PLAYER_H = TILE_SIZE
+MAX_FALL = 20
+
+# TileGrid.near() looks one cell past the rect on every side; the player spans at
+# most two cells each way, so a 4x4 window covers every candidate tile.
+WINDOW = 4
+
+SOLID_CHARS = b"XB"
+
+
+def solid_grid(layout):
+    """Boolean (rows, cols) array: True where the layout has a solid tile."""
+    rows = len(layout)
+    cols = len(layout[0]) if rows else 0
+    chars = np.frombuffer("".join(row[:cols].ljust(cols, '.') for row in layout).encode('ascii'),
+                          dtype=np.uint8).reshape(rows, cols)
+    return np.isin(chars, np.frombuffer(SOLID_CHARS, dtype=np.uint8))
+
+
+def find_spawn(layout):
+    """Spawn point Level.build would pick: first 'P' in row-major order, else (64, 64)."""
+    for r, row in enumerate(layout):
+        c = row.find('P')
+        if c != -1:
+            return c * TILE_SIZE, r * TILE_SIZE
+    return 64, 64
+
+
+def _round_move(v):
+    """Round float positions like pygame does when a Rect coordinate gets a float (lround)."""
+    f = np.floor(v)
+    frac = v - f
+    up = np.where(v >= 0, frac >= 0.5, frac > 0.5)
+    return (f + up).astype(np.int64)
+
+
+class BatchSim:
+    """N players on one layout, stepped together."""
+    def __init__(self, layout, n):
+        self.solid = solid_grid(layout)
+        self.rows, self.cols = self.solid.shape
+        self.n = n
+        self.spawn = find_spawn(layout)
+        self.x = np.zeros(n, dtype=np.int64)
+        self.y = np.zeros(n, dtype=np.int64)
+        self.vx = np.zeros(n, dtype=np.float64)
+        self.vy = np.zeros(n, dtype=np.float64)
+        self.on_ground = np.zeros(n, dtype=bool)
+        self.alive = np.ones(n, dtype=bool)
+        self.reset()
+
+    def reset(self, idx=None):
+        """Put agents (all, or an index/mask) back on the spawn, like a fresh Player."""
+        idx = slice(None) if idx is None else idx
+        sx, sy = self.spawn
+        # Player centres its hitbox on the sprite: rect.centerx = x + TILE_SIZE // 2
+        self.x[idx] = sx + TILE_SIZE // 2 - PLAYER_W // 2
+        self.y[idx] = sy
+        self.vx[idx] = 0.0
+        self.vy[idx] = 0.0
+        self.on_ground[idx] = False
+        self.alive[idx] = True
+
+    def _window_tiles(self, x, y):
+        """Yield (has_tile, tile_left, tile_top) per cell of the 4x4 candidate window, row-major."""
+        cs = TILE_SIZE
+        c0 = (x - cs) // cs
+        r0 = (y - cs) // cs
+        c1 = (x + PLAYER_W - 1 + cs) // cs
+        r1 = (y + PLAYER_H - 1 + cs) // cs
+        for dr in range(WINDOW):
+            r = r0 + dr
+            row_ok = (r <= r1) & (r >= 0) & (r < self.rows)
+            rr = np.clip(r, 0, self.rows - 1)
+            for dc in range(WINDOW):
+                c = c0 + dc
+                ok = row_ok & (c <= c1) & (c >= 0) & (c < self.cols)
+                cc = np.clip(c, 0, self.cols - 1)
+                tile = ok & self.solid[rr, cc]
+                if tile.any():
+                    yield tile, c * cs, r * cs
+
+    def step(self, masks):
+        """Advance every live agent one physics tick; masks is an (n,) array of input bits."""
+        masks = np.asarray(masks)
+        live = self.alive
+        cs = TILE_SIZE
+        w, h = PLAYER_W, PLAYER_H
+
+        # handle_input
+        left = (masks & LEFT) != 0
+        right = (masks & RIGHT) != 0
+        vx = np.where(right, float(PLAYER_SPEED), np.where(left, float(-PLAYER_SPEED), 0.0))
+        jump = ((masks & JUMP) != 0) & self.on_ground
+        vy = np.where(jump, float(JUMP_VELOCITY), self.vy)
+        on_ground = self.on_ground & ~jump
+
+        # apply_gravity
+        vy = np.minimum(vy + GRAVITY, float(MAX_FALL))
+
+        # horizontal_movement: every colliding tile pushes the rect back, in tile order
+        x = _round_move(self.x + vx)
+        y = self.y
+        for tile, tl, tt in self._window_tiles(x, y):
+            hit = tile & (x < tl + cs) & (x + w > tl) & (y < tt + cs) & (y + h > tt)
+            x = np.where(hit & (vx > 0), tl - w, x)
+            x = np.where(hit & (vx < 0), tl + cs, x)
+
+        # vertical_movement: the first colliding tile zeroes vy, so later ones do nothing
+        y = _round_move(y + vy)
+        on_ground = np.zeros_like(on_ground)
+        for tile, tl, tt in self._window_tiles(x, y):
+            hit = tile & (x < tl + cs) & (x + w > tl) & (y < tt + cs) & (y + h > tt)
+            down = hit & (vy > 0)
+            up = hit & (vy < 0)
+            y = np.where(down, tt - h, np.where(up, tt + cs, y))
+            on_ground |= down
+            vy = np.where(down | up, 0.0, vy)
+
+        # Dead agents stay frozen where they fell
+        self.x = np.where(live, x, self.x)
+        self.y = np.where(live, y, self.y)
+        self.vx = np.where(live, vx, self.vx)
+        self.vy = np.where(live, vy, self.vy)
+        self.on_ground = np.where(live, on_ground, self.on_ground)
+        self.alive = live & (self.y <= KILL_PLANE_Y)
+
+
+def check_equivalence(layout, masks_per_agent):
+    """
+    Run every input sequence through both a real Player (via Level.update) and one
+    BatchSim, tick by tick. Returns a list of (agent, tick, scalar_state, batch_state)
+    mismatches; empty means both paths agree exactly.
+    """
+    from level import Level
+    from headless import headless_assets
+    from inputs import FRAMES
+    from settings import FIXED_DT
+
+    assets = headless_assets()
+    n = len(masks_per_agent)
+    steps = len(masks_per_agent[0]) if n else 0
+    sim = BatchSim(layout, n)
+    levels = [Level(layout, assets) for _ in range(n)]
+    inputs = np.array(masks_per_agent, dtype=np.uint8)
+    mismatches = []
+    for t in range(steps):
+        sim.step(inputs[:, t])
+        for i, level in enumerate(levels):
+            if level.lost:
+                continue
+            level.update(FIXED_DT, FRAMES[inputs[i, t]])
+            p = level.player
+            scalar = (p.rect.x, p.rect.y, p.vel.x, p.vel.y, p.on_ground, not level.lost)
+            batch = (int(sim.x[i]), int(sim.y[i]), float(sim.vx[i]), float(sim.vy[i]),
+                     bool(sim.on_ground[i]), bool(sim.alive[i]))
+            if scalar != batch:
+                mismatches.append((i, t, scalar, batch))
+                level.lost = True  # report the first divergence per agent only
+    return mismatches
+
+
+def main(argv=None):
+    from main import generate_level_layout
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, default=4096)
+    parser.add_argument("--steps", type=int, default=600)
+    parser.add_argument("--width", type=int, default=42)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check", action="store_true", help="compare against the scalar Player instead")
+    parser.add_argument("--seeds", type=int, default=10, help="layouts to check with --check")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    if args.check:
+        failures = 0
+        for seed in range(args.seed, args.seed + args.seeds):
+            layout = generate_level_layout(width_tiles=args.width, seed=seed)
+            masks = rng.integers(0, 8, size=(32, args.steps), dtype=np.uint8)
+            # Bias toward holding right so agents cover the whole layout
+            masks |= (rng.random(masks.shape) < 0.6).astype(np.uint8) * RIGHT
+            bad = check_equivalence(layout, masks.tolist())
+            failures += len(bad)
+            for agent, tick, scalar, batch in bad[:3]:
+                print(f"seed {seed} agent {agent} tick {tick}: scalar {scalar} != batch {batch}")
+        print("equivalent" if failures == 0 else f"{failures} agents diverged")
+        return 1 if failures else 0
+
+    layout = generate_level_layout(width_tiles=args.width, seed=args.seed)
+    sim = BatchSim(layout, args.agents)
+    masks = rng.integers(0, 8, size=(args.steps, args.agents), dtype=np.uint8)
+    start = time.perf_counter()
+    for t in range(args.steps):
+        sim.step(masks[t])
+    elapsed = time.perf_counter() - start
+    agent_steps = args.agents * args.steps
+    print(f"{args.agents} agents x {args.steps} ticks in {elapsed:.2f}s -> "
+          f"{agent_steps / elapsed:,.0f} agent-steps/s ({int(sim.alive.sum())} still alive)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
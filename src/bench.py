@@ -0,0 +1,269 @@
+"""
+Micro-benchmarks for the game loop. Runs without a visible window.
+
+    python src/bench.py collision
+    python src/bench.py draw
+    python src/bench.py textures
+    python src/bench.py blits
+    python src/bench.py layout
+    python src/bench.py edit
+"""
+import os
+import sys
+import time
+import argparse
+from collections import defaultdict
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from settings import WIDTH, HEIGHT, TILE_SIZE
+from main import load_assets, generate_level_layout
+from level import Level
+import textures
+
+
+def _setup():
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    return load_assets()
+
+
+def _time_per_call(fn, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        fn()
+    return (time.perf_counter() - start) / frames
+
+
+def bench_collision(args):
+    assets = _setup()
+    # Hold right + jump so the player actually travels through the level
+    keys = defaultdict(bool, {pygame.K_RIGHT: True, pygame.K_SPACE: True})
+
+    print(f"{'width':>6} {'tiles':>6} {'scan us/frame':>14} {'grid us/frame':>14} {'speedup':>8}")
+    for width in args.widths:
+        level = Level(generate_level_layout(width_tiles=width, seed=args.seed), assets)
+
+        def scan_frame():
+            level.player.update(1 / 60, level.tiles.sprites(), keys)
+
+        def grid_frame():
+            level.player.update(1 / 60, level.grid, keys)
+
+        level.respawn()
+        scan = _time_per_call(scan_frame, args.frames)
+        level.respawn()
+        grid = _time_per_call(grid_frame, args.frames)
+        print(f"{width:>6} {len(level.tiles):>6} {scan * 1e6:>14.1f} {grid * 1e6:>14.1f} {scan / grid:>7.1f}x")
+
+
+def bench_draw(args):
+    assets = _setup()
+    screen = pygame.display.get_surface()
+
+    print(f"{'width':>6} {'tiles':>6} {'per-tile us/frame':>18} {'chunks us/frame':>16} {'speedup':>8}")
+    for width in args.widths:
+        level = Level(generate_level_layout(width_tiles=width, seed=args.seed), assets)
+        # Park the camera in the middle of the level
+        level.camera.update(width * TILE_SIZE // 2, 0)
+
+        def per_tile():
+            for t in level.tiles:
+                screen.blit(t.image, (t.rect.x - level.camera.x, t.rect.y - level.camera.y))
+
+        def chunked():
+            level.tile_layer.draw(screen, level.camera)
+
+        old = _time_per_call(per_tile, args.frames)
+        new = _time_per_call(chunked, args.frames)
+        print(f"{width:>6} {len(level.tiles):>6} {old * 1e6:>18.1f} {new * 1e6:>16.1f} {old / new:>7.1f}x")
+
+
+def dense_layout(cols, rows=11, seed=0):
+    """Worst case for drawing: ground, stacked platforms and a coin above almost every block."""
+    import random
+    rnd = random.Random(seed)
+    grid = [['.'] * cols for _ in range(rows)]
+    for c in range(cols):
+        grid[rows - 1][c] = 'X'
+        grid[rows - 2][c] = 'X'
+        for r in range(1, rows - 3, 2):
+            if rnd.random() < 0.6:
+                grid[r][c] = rnd.choice('XB')
+                grid[r - 1][c] = 'C'
+    grid[rows - 3][1] = 'P'
+    grid[rows - 3][cols - 2] = 'E'
+    return ["".join(row) for row in grid]
+
+
+def bench_blits(args):
+    assets = _setup()
+    screen = pygame.display.get_surface()
+    level = Level(dense_layout(args.width, seed=args.seed), assets)
+    level.camera.update(args.width * TILE_SIZE // 2, 0)
+    cam = level.camera
+
+    def parallax_loop():
+        for img, pos in level.parallax.blit_sequence(cam.x):
+            screen.blit(img, pos)
+
+    def per_object():
+        # Original Level.draw: one blit per terrain tile, coin and flag, nothing culled
+        parallax_loop()
+        for t in level.tiles:
+            screen.blit(t.image, (t.rect.x - cam.x, t.rect.y - cam.y))
+        for coin in level.coins:
+            screen.blit(coin.image, (coin.rect.x - cam.x, coin.rect.y - cam.y))
+        for f in level.flags:
+            screen.blit(f.image, (f.rect.x - cam.x, f.rect.y - cam.y))
+        screen.blit(level.player.image, level.player.rect.move(-cam.x, -cam.y))
+
+    def culled_loop():
+        # Same visible set as Level.draw (chunks, culled sprites), but one blit call each
+        parallax_loop()
+        for img, pos in level.tile_layer.blit_sequence(cam, screen.get_size()):
+            screen.blit(img, pos)
+        view = level.view_rect(screen.get_size())
+        for coin in level.coin_cells.query(view):
+            screen.blit(coin.image, (coin.rect.x - cam.x, coin.rect.y - cam.y))
+        for f in level.flag_cells.query(view):
+            screen.blit(f.image, (f.rect.x - cam.x, f.rect.y - cam.y))
+        screen.blit(level.player.image, level.player.rect.move(-cam.x, -cam.y))
+
+    def batched():
+        level.draw(screen)
+
+    # All three produce the same pixels (the player sprite is offset differently, so hide it)
+    image = level.player.image
+    level.player.image = pygame.Surface((1, 1), pygame.SRCALPHA)
+    frames = []
+    for fn in (per_object, culled_loop, batched):
+        screen.fill((0, 0, 0))
+        fn()
+        frames.append(pygame.image.tobytes(screen, "RGB"))
+    level.player.image = image
+    same = frames[0] == frames[1] == frames[2]
+
+    view = level.view_rect(screen.get_size())
+    visible = sum(1 for _ in level.grid.query(view)) + len(level.coin_cells.query(view))
+    print(f"dense level, {args.width} columns: {len(level.tiles)} tiles, {len(level.coins)} coins, "
+          f"{visible} tiles+coins on screen; pixels {'identical' if same else 'DIFFER'}")
+    # Parallax is a handful of full-screen blits either way and dominates the frame,
+    # so also time the paths without it to see the per-call overhead on its own
+    paths = (("per-object blits", per_object), ("culled blit loop", culled_loop), ("batched blits", batched))
+    layers = level.parallax.layers
+    for title, parallax_layers in (("with parallax", layers), ("terrain and sprites only", [])):
+        level.parallax.layers = parallax_layers
+        print(f"{title}:")
+        times = [(name, _time_per_call(fn, args.frames)) for name, fn in paths]
+        for name, t in times:
+            print(f"  {name:<18} {t * 1e6:9.1f} us/frame  {times[0][1] / t:5.1f}x")
+    level.parallax.layers = layers
+
+
+def bench_textures(args):
+    assets = _setup()
+    layouts = [generate_level_layout(width_tiles=args.width, seed=args.seed + i) for i in range(args.levels)]
+
+    start = time.perf_counter()
+    for layout in layouts:
+        Level(layout, assets)
+    build = (time.perf_counter() - start) / len(layouts)
+
+    st = textures.stats()
+    print(f"level build: {build * 1e3:.2f} ms avg over {len(layouts)} levels ({args.width} wide)")
+    print(f"texture cache: {st['hits']} hits / {st['misses']} misses ({st['hit_rate']:.1%}), "
+          f"{st['surfaces']} surfaces, {st['bytes'] / 1024:.1f} KiB")
+
+
+def bench_layout(args):
+    # Pure generation, no pygame or assets involved
+    print(f"{'width':>6} {'seeds':>6} {'ms/seed':>9} {'seeds/s':>9}")
+    for width in args.widths:
+        seeds = max(1, args.columns // width)
+        start = time.perf_counter()
+        for seed in range(args.seed, args.seed + seeds):
+            generate_level_layout(width_tiles=width, seed=seed)
+        elapsed = time.perf_counter() - start
+        print(f"{width:>6} {seeds:>6} {elapsed / seeds * 1e3:>9.3f} {seeds / elapsed:>9.1f}")
+
+
+def bench_edit(args):
+    assets = _setup()
+    screen = pygame.display.get_surface()
+    print(f"{'width':>6} {'tiles':>6} {'rebuild ms':>11} {'set_cell us':>12} {'+ redraw us':>12} {'speedup':>8}")
+    for width in args.widths:
+        layout = generate_level_layout(width_tiles=width, seed=args.seed)
+        level = Level(layout, assets)
+        level.camera.update(width * TILE_SIZE // 2, 0)
+        # Toggle a ground cell near the middle of the view: removes/adds a tile and re-tiles its neighbours
+        r = len(layout) - 1
+        c = (width * TILE_SIZE // 2 + WIDTH // 2) // TILE_SIZE
+        chars = iter(['.', 'X'] * args.frames)
+
+        def rebuild():
+            Level(layout, assets).tile_layer.draw(screen, level.camera)
+
+        def edit():
+            level.set_cell(r, c, next(chars))
+
+        def edit_and_draw():
+            level.set_cell(r, c, next(chars))
+            level.tile_layer.draw(screen, level.camera)
+
+        full = _time_per_call(rebuild, max(1, args.frames // 100))
+        one = _time_per_call(edit, args.frames)
+        drawn = _time_per_call(edit_and_draw, args.frames)
+        print(f"{width:>6} {len(level.tiles):>6} {full * 1e3:>11.2f} {one * 1e6:>12.1f} {drawn * 1e6:>12.1f} "
+              f"{full / drawn:>7.0f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    p = sub.add_parser("collision", help="player collision cost: full tile scan vs TileGrid")
+    p.add_argument("--widths", type=int, nargs="+", default=[40, 2000])
+    p.add_argument("--frames", type=int, default=2000)
+    p.add_argument("--seed", type=int, default=1)
+    p.set_defaults(func=bench_collision)
+
+    p = sub.add_parser("draw", help="tile draw cost: per-tile blits vs pre-baked chunks")
+    p.add_argument("--widths", type=int, nargs="+", default=[40, 2000])
+    p.add_argument("--frames", type=int, default=500)
+    p.add_argument("--seed", type=int, default=1)
+    p.set_defaults(func=bench_draw)
+
+    p = sub.add_parser("textures", help="level build time and shared texture cache stats")
+    p.add_argument("--width", type=int, default=42)
+    p.add_argument("--levels", type=int, default=20)
+    p.add_argument("--seed", type=int, default=1)
+    p.set_defaults(func=bench_textures)
+
+    p = sub.add_parser("blits", help="Level.draw: per-object blit calls vs batched Surface.blits")
+    p.add_argument("--width", type=int, default=200)
+    p.add_argument("--frames", type=int, default=500)
+    p.add_argument("--seed", type=int, default=1)
+    p.set_defaults(func=bench_blits)
+
+    p = sub.add_parser("layout", help="generate_level_layout throughput in seeds per second")
+    p.add_argument("--widths", type=int, nargs="+", default=[42, 1000, 10000])
+    p.add_argument("--columns", type=int, default=200_000, help="total columns generated per width")
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=bench_layout)
+
+    p = sub.add_parser("edit", help="changing one cell: full Level rebuild vs Level.set_cell (3x3 re-tile)")
+    p.add_argument("--widths", type=int, nargs="+", default=[42, 1000])
+    p.add_argument("--frames", type=int, default=1000)
+    p.add_argument("--seed", type=int, default=1)
+    p.set_defaults(func=bench_edit)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
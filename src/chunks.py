@@ -0,0 +1,103 @@
+
+from collections import OrderedDict
+import pygame
+from settings import CHUNK_TILES, CHUNK_CACHE_SIZE
+
+
+class StaticTileLayer:
+    """
+    Solid tiles pre-rendered into fixed-size chunk surfaces.
+    Terrain never changes after Level.build, so each chunk is baked once the first
+    time it scrolls into view and every frame only blits the few chunks overlapping
+    the camera. Baked chunks live in a small LRU so memory stays bounded on long levels.
+    On a TileWindow (endless level) only the columns it currently holds are drawn;
+    invalidate_columns() and drop_columns() follow its edges as it slides.
+    """
+    def __init__(self, grid, chunk_tiles=CHUNK_TILES, max_cached=CHUNK_CACHE_SIZE):
+        self.grid = grid
+        self.chunk_tiles = chunk_tiles
+        self.chunk_px = chunk_tiles * grid.cell_size
+        self.chunks_y = -(-grid.rows // chunk_tiles)
+        self.max_cached = max_cached
+        self._baked = OrderedDict()  # (cx, cy) -> Surface, or None for an empty chunk
+        self._seq_key = None  # camera position and view size the cached blit sequence is for
+        self._seq = []
+
+    def _bake(self, cx, cy):
+        grid = self.grid
+        cs = grid.cell_size
+        first = grid.col0
+        c0, r0 = cx * self.chunk_tiles, cy * self.chunk_tiles
+        c1 = min(first + grid.cols, c0 + self.chunk_tiles)
+        r1 = min(grid.rows, r0 + self.chunk_tiles)
+        surf = None
+        for r in range(r0, r1):
+            row = grid.cells[r]
+            for c in range(max(c0, first), c1):
+                tile = row[c - first]
+                if tile is None:
+                    continue
+                if surf is None:
+                    surf = pygame.Surface(((c1 - c0) * cs, (r1 - r0) * cs), pygame.SRCALPHA)
+                surf.blit(tile.image, ((c - c0) * cs, (r - r0) * cs))
+        if surf is not None:
+            # RLE lets SDL skip the chunk's transparent runs when blitting
+            surf.set_alpha(255, pygame.RLEACCEL)
+        return surf
+
+    def chunk(self, cx, cy):
+        key = (cx, cy)
+        if key in self._baked:
+            self._baked.move_to_end(key)
+            return self._baked[key]
+        surf = self._bake(cx, cy)
+        self._baked[key] = surf
+        if len(self._baked) > self.max_cached:
+            self._baked.popitem(last=False)
+        return surf
+
+    def invalidate(self, row, col):
+        """Drop the baked chunk holding (row, col) so it is re-baked on next draw."""
+        self._baked.pop((col // self.chunk_tiles, row // self.chunk_tiles), None)
+        self._seq_key = None
+
+    def invalidate_columns(self, c0, c1):
+        """Drop every baked chunk overlapping columns [c0, c1), e.g. after they were filled in."""
+        ct = self.chunk_tiles
+        for key in [k for k in self._baked if c0 // ct <= k[0] <= (c1 - 1) // ct]:
+            del self._baked[key]
+        self._seq_key = None
+
+    def drop_columns(self, before):
+        """Forget baked chunks lying wholly left of column `before` (the camera won't come back)."""
+        ct = self.chunk_tiles
+        for key in [k for k in self._baked if (k[0] + 1) * ct <= before]:
+            del self._baked[key]
+
+    def blit_sequence(self, camera, view_size):
+        """
+        [(chunk surface, screen pos), ...] for the chunks overlapping the view, ready
+        for Surface.blits. Rebuilt only when the camera or view size changes.
+        """
+        key = (camera.x, camera.y, view_size)
+        if key == self._seq_key:
+            return self._seq
+        size = self.chunk_px
+        view_w, view_h = view_size
+        first, end = self.grid.col0, self.grid.col0 + self.grid.cols
+        cx0 = max(first // self.chunk_tiles, int(camera.x) // size)
+        cx1 = min((end - 1) // self.chunk_tiles, int(camera.x + view_w) // size)
+        cy0 = max(0, int(camera.y) // size)
+        cy1 = min(self.chunks_y - 1, int(camera.y + view_h) // size)
+        seq = []
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                img = self.chunk(cx, cy)
+                if img is not None:
+                    seq.append((img, (cx * size - camera.x, cy * size - camera.y)))
+        self._seq_key = key
+        self._seq = seq
+        return seq
+
+    def draw(self, surf, camera):
+        surf.blits(self.blit_sequence(camera, surf.get_size()), doreturn=False)
@@ -0,0 +1,30 @@
+
+import textures
+
+
+class AnimationSet:
+    """
+    Named animation strips ('idle', 'run', ...) with right- and left-facing frames.
+    Mirrored copies are made once when the set is built (through the shared texture
+    cache), so entities only index into ready frames instead of flipping every tick.
+    Build one set per asset load and share it between every entity that uses it.
+    """
+    def __init__(self, strips):
+        self.right = {name: list(frames) for name, frames in strips.items()}
+        self.left = {
+            name: [textures.scaled(f, f.get_size(), flip_x=True) for f in frames]
+            for name, frames in self.right.items()
+        }
+
+    def frames(self, name, facing=1):
+        """Frames of one animation; facing is 1 (right) or -1 (left)."""
+        return self.left[name] if facing == -1 else self.right[name]
+
+    def __getitem__(self, name):
+        return self.right[name]
+
+    def __contains__(self, name):
+        return name in self.right
+
+    def keys(self):
+        return self.right.keys()
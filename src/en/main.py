@@ -4,6 +4,8 @@ import random
 from settings import WIDTH, HEIGHT, TITLE, FPS, TILE_SIZE
 from utils import load_spritesheet
 from level import Level
+import textures
+from animation import AnimationSet
 
 from score import load_score, add_points, subtract_points
 
@@ -336,7 +338,8 @@ def load_assets():
     }
     # Scale player frames up to TILE_SIZE
     for k, frames in assets['player_anims'].items():
-        assets['player_anims'][k] = [pygame.transform.scale(f, (TILE_SIZE, TILE_SIZE)) for f in frames]
+        assets['player_anims'][k] = [textures.scaled(f, (TILE_SIZE, TILE_SIZE)) for f in frames]
+    assets['player_anims'] = AnimationSet(assets['player_anims'])
 
     # --- Tiles (grass/dirt corners & mid, boxes/platform) ---
     def _load_img(p):
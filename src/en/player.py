@@ -5,7 +5,7 @@ from settings import GRAVITY, JUMP_VELOCITY, TILE_SIZE, PLAYER_SPEED
 class Player(pygame.sprite.Sprite):
     def __init__(self, pos, anims):
         super().__init__()
-        self.anims = anims  # dict with 'idle','run','jump','fall' lists
+        self.anims = anims  # AnimationSet with 'idle','run','jump','fall' strips
         self.anim_state = 'idle'
         self.anim_index = 0.0
         self.anim_speed = 10.0
@@ -50,18 +50,20 @@ class Player(pygame.sprite.Sprite):
             self.anim_state = 'run' if abs(self.vel.x) > 0.1 else 'idle'
 
     def _animate(self, dt):
-        frames = self.anims[self.anim_state]
+        frames = self.anims.frames(self.anim_state, self.facing)
         self.anim_index += self.anim_speed * dt
         if self.anim_index >= len(frames):
             self.anim_index = 0.0
-        frame = frames[int(self.anim_index)]
-        if self.facing == -1:
-            frame = pygame.transform.flip(frame, True, False)
-        self.image = frame
+        self.image = frames[int(self.anim_index)]
+
+    @staticmethod
+    def _nearby(tiles, rect):
+        # TileGrid only hands back the cells around rect; plain lists are scanned whole
+        return tiles.near(rect) if hasattr(tiles, 'near') else tiles
 
     def horizontal_movement(self, tiles):
         self.rect.x += self.vel.x
-        for tile in tiles:
+        for tile in self._nearby(tiles, self.rect):
             if self.rect.colliderect(tile.rect):
                 if self.vel.x > 0:
                     self.rect.right = tile.rect.left
@@ -71,7 +73,7 @@ class Player(pygame.sprite.Sprite):
     def vertical_movement(self, tiles):
         self.rect.y += self.vel.y
         self.on_ground = False
-        for tile in tiles:
+        for tile in self._nearby(tiles, self.rect):
             if self.rect.colliderect(tile.rect):
                 if self.vel.y > 0:
                     self.rect.bottom = tile.rect.top
@@ -13,6 +13,11 @@ CAMERA_MARGIN_Y = 100   # vertical margin before scrolling vertically
 KILL_PLANE_Y = HEIGHT + 200
 # Horizontal speed the Player uses when moving left/right (see player.handle_input)
 PLAYER_SPEED = 5
+# Static terrain is baked into square chunks of CHUNK_TILES x CHUNK_TILES tiles (see chunks.py)
+CHUNK_TILES = 16
+CHUNK_CACHE_SIZE = 16   # max baked chunk surfaces kept around at once
+# Coins outside the camera view don't advance their spin animation
+SKIP_OFFSCREEN_COIN_ANIMATION = True
 
 
 LEVELS = [
@@ -0,0 +1,101 @@
+
+class TileGrid:
+    """
+    Grid-backed collision index for solid tiles.
+    Each cell of the level layout holds at most one solid Tile, so collision
+    queries only look at the handful of cells around a rect instead of
+    scanning every tile in the level.
+    """
+    def __init__(self, rows, cols, cell_size):
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = cell_size
+        self.cells = [[None] * cols for _ in range(rows)]
+
+    def add(self, row, col, tile):
+        self.cells[row][col] = tile
+
+    def remove(self, row, col):
+        self.cells[row][col] = None
+
+    def get(self, row, col):
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return self.cells[row][col]
+        return None
+
+    def query(self, rect, margin=0):
+        """Return tiles whose cells overlap rect (grown by margin px), in row-major order."""
+        cs = self.cell_size
+        c0 = max(0, (rect.left - margin) // cs)
+        c1 = min(self.cols - 1, (rect.right - 1 + margin) // cs)
+        r0 = max(0, (rect.top - margin) // cs)
+        r1 = min(self.rows - 1, (rect.bottom - 1 + margin) // cs)
+        found = []
+        for r in range(r0, r1 + 1):
+            row = self.cells[r]
+            for c in range(c0, c1 + 1):
+                tile = row[c]
+                if tile is not None:
+                    found.append(tile)
+        return found
+
+    def near(self, rect):
+        """
+        Tiles that can touch rect during one collision pass.
+        One extra cell of margin covers the push-back a resolution step may apply,
+        so results match a full scan of the level.
+        """
+        return self.query(rect, self.cell_size)
+
+    def __iter__(self):
+        for row in self.cells:
+            for tile in row:
+                if tile is not None:
+                    yield tile
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class SpatialHash:
+    """
+    Buckets sprites by the coarse cells their rect overlaps, keyed on (cell_x, cell_y).
+    Used for viewport culling and pickup checks of coins and flags, so only
+    the cells under a query rect are looked at instead of every sprite in the level.
+    """
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.buckets = {}
+
+    def _cells(self, rect):
+        cs = self.cell_size
+        for cy in range(rect.top // cs, (rect.bottom - 1) // cs + 1):
+            for cx in range(rect.left // cs, (rect.right - 1) // cs + 1):
+                yield cx, cy
+
+    def add(self, sprite):
+        for key in self._cells(sprite.rect):
+            self.buckets.setdefault(key, []).append(sprite)
+
+    def remove(self, sprite):
+        for key in self._cells(sprite.rect):
+            bucket = self.buckets.get(key)
+            if bucket and sprite in bucket:
+                bucket.remove(sprite)
+                if not bucket:
+                    del self.buckets[key]
+
+    def query(self, rect):
+        """Sprites in the cells overlapped by rect (each once; may include near misses)."""
+        found = {}
+        buckets = self.buckets
+        for key in self._cells(rect):
+            bucket = buckets.get(key)
+            if bucket:
+                for sprite in bucket:
+                    found[sprite] = None
+        return list(found)
+
+    def colliding(self, rect):
+        """Sprites whose rect actually overlaps rect."""
+        return [s for s in self.query(rect) if rect.colliderect(s.rect)]
@@ -0,0 +1,260 @@
+"""
+Gym-style environment for bots: reset() / step(action) over generated levels.
+
+    python src/env.py --envs 64 --steps 2000             # vectorized throughput
+    python src/env.py --envs 256 --workers 32 --steps 5000
+
+An episode is one level from generate_level_layout. Actions are input bitmasks
+(0..7, see inputs.py: LEFT=1, RIGHT=2, JUMP=4). step() returns
+(observation, reward, done, info) with rewards for coins, reaching the exit and
+dying (Level.lost). VecEnv spreads N environments over worker processes and moves
+observations, rewards and dones through shared memory instead of pickling them.
+"""
+import os
+import sys
+import time
+import argparse
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+import pygame
+from settings import TILE_SIZE, PLAYER_SPEED
+from headless import HeadlessEngine, LOST, WON
+from inputs import CallbackInput
+from batch import solid_grid
+
+REWARD_COIN = 1.0
+REWARD_EXIT = 10.0
+REWARD_DEATH = -10.0
+
+N_ACTIONS = 8
+
+# Observation: a VIEW_ROWS x VIEW_COLS window of cell codes centred on the player,
+# followed by a few scalar features.
+VIEW_COLS = 15
+VIEW_ROWS = 9
+CELL_EMPTY, CELL_SOLID, CELL_COIN, CELL_EXIT = 0.0, 1.0, 2.0, 3.0
+N_FEATURES = 6  # vx, vy, on_ground, x/y offset inside the cell, coins left
+OBS_SIZE = VIEW_ROWS * VIEW_COLS + N_FEATURES
+
+
+class PlatformerEnv:
+    """One environment; a fresh level is generated on every reset."""
+    def __init__(self, width_tiles=42, height_tiles=11, seed=None, max_steps=3600):
+        self.width_tiles = width_tiles
+        self.height_tiles = height_tiles
+        self.max_steps = max_steps
+        self.rnd = np.random.default_rng(seed)
+        self.engine = None
+        self.level_seed = None
+        self._action = 0
+        self._inputs = CallbackInput(lambda level: self._action)
+
+    def reset(self, seed=None):
+        from main import generate_level_layout
+
+        self.level_seed = int(self.rnd.integers(0, 1_000_000)) if seed is None else seed
+        layout = generate_level_layout(self.width_tiles, self.height_tiles, seed=self.level_seed)
+        self.engine = HeadlessEngine(layout, self._inputs)
+        self.layout = layout
+        # Padded code grid so the view window never has to bounds-check
+        pad_r, pad_c = VIEW_ROWS, VIEW_COLS
+        codes = np.where(solid_grid(layout), CELL_SOLID, CELL_EMPTY).astype(np.float32)
+        self._codes = np.pad(codes, ((pad_r, pad_r), (pad_c, pad_c)))
+        self._coins_total = len(self.engine.level.coins)
+        return self.observation()
+
+    def step(self, action):
+        engine = self.engine
+        coins_before = len(engine.level.coins)
+        self._action = int(action) & 7
+        status = engine.step()
+        level = engine.level
+
+        reward = REWARD_COIN * (coins_before - len(level.coins))
+        if status == WON:
+            reward += REWARD_EXIT
+        elif status == LOST:
+            reward += REWARD_DEATH
+        truncated = not engine.done and engine.steps >= self.max_steps
+        done = engine.done or truncated
+        info = {
+            'status': status,
+            'coins_left': len(level.coins),
+            'steps': engine.steps,
+            'level_seed': self.level_seed,
+            'truncated': truncated,
+        }
+        return self.observation(), reward, done, info
+
+    def observation(self, out=None):
+        """Fill (or return) a float32 vector of OBS_SIZE."""
+        if out is None:
+            out = np.empty(OBS_SIZE, dtype=np.float32)
+        level = self.engine.level
+        p = level.player
+        pc = p.rect.centerx // TILE_SIZE
+        pr = p.rect.centery // TILE_SIZE
+        r0 = pr - VIEW_ROWS // 2 + VIEW_ROWS
+        c0 = pc - VIEW_COLS // 2 + VIEW_COLS
+        rows, cols = self._codes.shape
+        view = out[:VIEW_ROWS * VIEW_COLS].reshape(VIEW_ROWS, VIEW_COLS)
+        view[:] = CELL_EMPTY
+        # Clip the window against the padded grid (the player can fly above or fall below it)
+        sr0, sr1 = max(r0, 0), min(r0 + VIEW_ROWS, rows)
+        sc0, sc1 = max(c0, 0), min(c0 + VIEW_COLS, cols)
+        if sr0 < sr1 and sc0 < sc1:
+            view[sr0 - r0:sr1 - r0, sc0 - c0:sc1 - c0] = self._codes[sr0:sr1, sc0:sc1]
+        # Only coins and flags in the cells under the view: cost doesn't grow with level width
+        near = pygame.Rect((pc - VIEW_COLS // 2) * TILE_SIZE, (pr - VIEW_ROWS // 2) * TILE_SIZE,
+                           VIEW_COLS * TILE_SIZE, VIEW_ROWS * TILE_SIZE)
+        for cells, code in ((level.coin_cells, CELL_COIN), (level.flag_cells, CELL_EXIT)):
+            for sprite in cells.query(near):
+                vr = sprite.rect.centery // TILE_SIZE - pr + VIEW_ROWS // 2
+                vc = sprite.rect.centerx // TILE_SIZE - pc + VIEW_COLS // 2
+                if 0 <= vr < VIEW_ROWS and 0 <= vc < VIEW_COLS:
+                    view[vr, vc] = code
+        f = out[VIEW_ROWS * VIEW_COLS:]
+        f[0] = p.vel.x / PLAYER_SPEED
+        f[1] = p.vel.y / 20.0
+        f[2] = 1.0 if p.on_ground else 0.0
+        f[3] = (p.rect.centerx % TILE_SIZE) / TILE_SIZE
+        f[4] = (p.rect.centery % TILE_SIZE) / TILE_SIZE
+        f[5] = len(level.coins) / max(1, self._coins_total)
+        return out
+
+
+def _worker(conn, shm_names, n_envs, lo, hi, env_kwargs, base_seed):
+    """Runs envs[lo:hi] in a child process, reading actions from and writing results to shared memory."""
+    shms = [shared_memory.SharedMemory(name=name) for name in shm_names]
+    obs, rewards, dones, actions = _views(shms, n_envs)
+    envs = [PlatformerEnv(seed=base_seed + i, **env_kwargs) for i in range(lo, hi)]
+    try:
+        while True:
+            cmd = conn.recv()
+            if cmd == 'reset':
+                for i, env in enumerate(envs, lo):
+                    env.reset()
+                    env.observation(obs[i])
+                conn.send(None)
+            elif cmd == 'step':
+                infos = []
+                for i, env in enumerate(envs, lo):
+                    _, reward, done, info = env.step(actions[i])
+                    rewards[i] = reward
+                    dones[i] = done
+                    if done:
+                        # Auto-reset: the returned observation starts the next episode
+                        env.reset()
+                    env.observation(obs[i])
+                    infos.append(info)
+                conn.send(infos)
+            elif cmd == 'close':
+                break
+    finally:
+        del obs, rewards, dones, actions
+        for shm in shms:
+            shm.close()
+        conn.close()
+
+
+def _views(shms, n):
+    obs = np.ndarray((n, OBS_SIZE), dtype=np.float32, buffer=shms[0].buf)
+    rewards = np.ndarray((n,), dtype=np.float32, buffer=shms[1].buf)
+    dones = np.ndarray((n,), dtype=np.bool_, buffer=shms[2].buf)
+    actions = np.ndarray((n,), dtype=np.uint8, buffer=shms[3].buf)
+    return obs, rewards, dones, actions
+
+
+class VecEnv:
+    """
+    N PlatformerEnvs spread over worker processes (one contiguous slice each).
+    step(actions) takes an (n,) array of action bitmasks and returns
+    (obs[n, OBS_SIZE], rewards[n], dones[n], infos); finished envs reset themselves.
+    """
+    def __init__(self, n_envs, num_workers=None, seed=0, **env_kwargs):
+        self.n = n_envs
+        num_workers = max(1, min(n_envs, num_workers or os.cpu_count() or 1))
+        sizes = (n_envs * OBS_SIZE * 4, n_envs * 4, n_envs, n_envs)
+        self._shms = [shared_memory.SharedMemory(create=True, size=max(1, s)) for s in sizes]
+        self.obs, self.rewards, self.dones, self.actions = _views(self._shms, n_envs)
+
+        ctx = mp.get_context()
+        bounds = np.linspace(0, n_envs, num_workers + 1).astype(int)
+        self._conns = []
+        self._procs = []
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_worker, daemon=True,
+                               args=(child, [s.name for s in self._shms], n_envs, int(lo), int(hi), env_kwargs, seed))
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+        self.closed = False
+
+    def reset(self):
+        for conn in self._conns:
+            conn.send('reset')
+        for conn in self._conns:
+            conn.recv()
+        return self.obs.copy()
+
+    def step(self, actions):
+        self.actions[:] = actions
+        for conn in self._conns:
+            conn.send('step')
+        infos = []
+        for conn in self._conns:
+            infos.extend(conn.recv())
+        return self.obs.copy(), self.rewards.copy(), self.dones.copy(), infos
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for conn in self._conns:
+            try:
+                conn.send('close')
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._procs:
+            proc.join(timeout=5)
+        del self.obs, self.rewards, self.dones, self.actions
+        for shm in self._shms:
+            shm.close()
+            shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--envs", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--steps", type=int, default=2000, help="vectorized steps to run")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    with VecEnv(args.envs, args.workers, seed=args.seed) as venv:
+        venv.reset()
+        episodes = 0
+        start = time.perf_counter()
+        for _ in range(args.steps):
+            _, _, dones, _ = venv.step(rng.integers(0, N_ACTIONS, size=args.envs))
+            episodes += int(dones.sum())
+        elapsed = time.perf_counter() - start
+        workers = len(venv._procs)
+    total = args.envs * args.steps
+    print(f"{args.envs} envs on {workers} workers: {total} env-steps in {elapsed:.2f}s -> "
+          f"{total / elapsed:,.0f} env-steps/s, {episodes} episodes finished")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+Headless simulation: runs Level ticks with no window, no drawing and no frame cap.
+
+    python src/headless.py --steps 200000 --width 200 --input random
+
+Inputs come from an input provider (see inputs.py) instead of the keyboard, so the
+same engine serves tests, bots and replays. The game rules match the playing state
+in main.py: lose on the kill plane, advance when all coins are taken and the exit
+is touched, win after the last level of the pack.
+"""
+import sys
+import time
+import random
+import argparse
+import pygame
+from settings import TILE_SIZE, FIXED_DT
+from level import Level
+from animation import AnimationSet
+from inputs import RandomInput, ScriptedInput, RIGHT, JUMP
+
+RUNNING = "running"
+LOST = "lost"
+NEXT_LEVEL = "next_level"
+WON = "won"
+
+
+def headless_assets():
+    """Minimal stand-in assets: plain surfaces, no image files, no display, no sound."""
+    def solid(color):
+        surf = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+        surf.fill(color)
+        return surf
+
+    frame = solid((240, 240, 240))
+    return {
+        'player_anims': AnimationSet({name: [frame] for name in ('idle', 'run', 'jump', 'fall')}),
+        'tiles': {'grass_mid': solid((100, 200, 100)), 'box': solid((180, 140, 80))},
+        'coin_image': solid((255, 215, 0)),
+        'flag': solid((200, 40, 50)),
+        'parallax_layers': [],
+        'sfx': {},
+    }
+
+
+class HeadlessEngine:
+    """
+    Steps one run through a pack of layouts as fast as the CPU allows.
+    layouts: a single layout (list of row strings) or a list of layouts.
+    inputs: any provider with poll(level) -> keys-like frame.
+    """
+    def __init__(self, layouts, inputs, assets=None):
+        if layouts and isinstance(layouts[0], str):
+            layouts = [layouts]
+        self.layouts = layouts
+        self.inputs = inputs
+        self.assets = assets or headless_assets()
+        self.level_index = 0
+        self.level = Level(self.layouts[0], self.assets)
+        self.status = RUNNING
+        self.steps = 0
+        # (level_index, seconds or None, deaths, coins) per level finished or lost
+        self.results = []
+
+    @property
+    def done(self):
+        return self.status in (LOST, WON)
+
+    def step(self):
+        """Advance one physics tick; returns the run status after it."""
+        if self.done:
+            return self.status
+        level = self.level
+        level.tick(self.inputs.poll(level))
+        self.steps += 1
+        self.status = RUNNING
+        if level.lost:
+            self.status = LOST
+            self.results.append((self.level_index, None, 1, level.coins_total - len(level.coins)))
+        elif level.collected_all() and level.at_exit():
+            self.results.append((self.level_index, level.ticks * FIXED_DT, 0, level.coins_total))
+            self.level_index += 1
+            if self.level_index >= len(self.layouts):
+                self.status = WON
+            else:
+                self.level = Level(self.layouts[self.level_index], self.assets)
+                self.status = NEXT_LEVEL
+        return self.status
+
+    def run(self, max_steps=None):
+        """Step until the run ends (or max_steps); returns throughput stats."""
+        start = time.perf_counter()
+        first = self.steps
+        while not self.done and (max_steps is None or self.steps - first < max_steps):
+            self.step()
+        return run_stats(self.steps - first, time.perf_counter() - start)
+
+
+def run_stats(steps, seconds):
+    return {
+        'steps': steps,
+        'seconds': seconds,
+        'steps_per_sec': steps / seconds if seconds > 0 else float('inf'),
+        'sim_seconds': steps * FIXED_DT,
+    }
+
+
+def main(argv=None):
+    from main import generate_level_pack
+    from stats import StatsStore
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=100_000, help="total physics ticks to simulate")
+    parser.add_argument("--width", type=int, default=42, help="level width in tiles")
+    parser.add_argument("--levels", type=int, default=3, help="levels per pack")
+    parser.add_argument("--seed", type=int, default=0, help="first pack seed; each new run uses the next one")
+    parser.add_argument("--input", choices=("random", "run-right"), default="random")
+    parser.add_argument("--stats", action="store_true", help="record every level result in stats.db as 'bot'")
+    args = parser.parse_args(argv)
+    store = StatsStore() if args.stats else None
+
+    total_steps = 0
+    total_time = 0.0
+    runs = {LOST: 0, WON: 0, RUNNING: 0}
+    seed = args.seed
+    while total_steps < args.steps:
+        pack = generate_level_pack(args.levels, width_tiles=args.width, seed=seed)
+        if args.input == "random":
+            provider = RandomInput(seed)
+        else:
+            provider = ScriptedInput([RIGHT, RIGHT | JUMP] * 10, loop=True)
+        engine = HeadlessEngine(pack, provider)
+        stats = engine.run(args.steps - total_steps)
+        total_steps += stats['steps']
+        total_time += stats['seconds']
+        runs[engine.status if engine.done else RUNNING] += 1
+        if store is not None:
+            run_id = random.getrandbits(62)
+            for level_index, seconds, deaths, coins in engine.results:
+                store.record(run_id, seed, level_index, seconds, deaths, coins, source="bot")
+        seed += 1
+    if store is not None:
+        store.close()
+
+    stats = run_stats(total_steps, total_time)
+    print(f"{stats['steps']} steps in {stats['seconds']:.2f}s -> {stats['steps_per_sec']:,.0f} steps/s "
+          f"({stats['sim_seconds'] / stats['seconds']:,.0f}x real time)")
+    print(f"runs: {runs[WON]} won, {runs[LOST]} lost, {runs[RUNNING]} unfinished")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
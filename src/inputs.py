@@ -0,0 +1,98 @@
+"""
+Input providers: where the player's left/right/jump come from each physics tick.
+
+Everything is reduced to a small bitmask (LEFT | RIGHT | JUMP) wrapped in an
+InputFrame, which answers keys[pygame.K_...] like pygame.key.get_pressed() does,
+so Player.handle_input works the same for the keyboard, scripts, bots and replays.
+"""
+import random
+import pygame
+
+LEFT = 1
+RIGHT = 2
+JUMP = 4
+
+_KEY_BITS = {
+    pygame.K_LEFT: LEFT, pygame.K_a: LEFT,
+    pygame.K_RIGHT: RIGHT, pygame.K_d: RIGHT,
+    pygame.K_SPACE: JUMP, pygame.K_UP: JUMP, pygame.K_w: JUMP,
+}
+
+
+class InputFrame:
+    """Read-only, keys-like view of one input bitmask."""
+    __slots__ = ('mask',)
+
+    def __init__(self, mask=0):
+        self.mask = mask
+
+    def __getitem__(self, key):
+        return bool(self.mask & _KEY_BITS.get(key, 0))
+
+    def __repr__(self):
+        return f"InputFrame({self.mask:#05b})"
+
+
+# One shared frame per possible mask, so polling never allocates
+FRAMES = tuple(InputFrame(m) for m in range(8))
+
+
+def mask_from_keys(keys):
+    """Collapse a pygame.key.get_pressed() result into an input bitmask."""
+    mask = 0
+    for key, bit in _KEY_BITS.items():
+        if keys[key]:
+            mask |= bit
+    return mask
+
+
+class KeyboardInput:
+    """Live keyboard state (needs a display)."""
+    def poll(self, level):
+        return FRAMES[mask_from_keys(pygame.key.get_pressed())]
+
+
+class ScriptedInput:
+    """Plays back a fixed sequence of masks; idles (or loops) when it runs out."""
+    def __init__(self, masks, loop=False):
+        self.masks = list(masks)
+        self.loop = loop
+        self.pos = 0
+
+    def poll(self, level):
+        if self.pos >= len(self.masks):
+            if not self.loop or not self.masks:
+                return FRAMES[0]
+            self.pos = 0
+        mask = self.masks[self.pos]
+        self.pos += 1
+        return FRAMES[mask]
+
+
+class RandomInput:
+    """Seeded random presses, biased to the right so runs make progress."""
+    def __init__(self, seed=None, p_left=0.15, p_right=0.7, p_jump=0.2):
+        self.rnd = random.Random(seed)
+        self.p_left = p_left
+        self.p_right = p_right
+        self.p_jump = p_jump
+
+    def poll(self, level):
+        r = self.rnd.random
+        mask = 0
+        if r() < self.p_left:
+            mask |= LEFT
+        if r() < self.p_right:
+            mask |= RIGHT
+        if r() < self.p_jump:
+            mask |= JUMP
+        return FRAMES[mask]
+
+
+class CallbackInput:
+    """Asks fn(level) -> mask every tick; the hook for bots."""
+    def __init__(self, fn):
+        self.fn = fn
+
+    def poll(self, level):
+        return FRAMES[self.fn(level) & 7]
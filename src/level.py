@@ -1,9 +1,18 @@
 import pygame
 from tile import Tile
+from spatial import TileGrid, SpatialHash
+from chunks import StaticTileLayer
 from coin import Coin
 from player import Player
 from background import ParallaxBackground
-from settings import TILE_SIZE, KILL_PLANE_Y, WIDTH, HEIGHT, CAMERA_MARGIN_X, CAMERA_MARGIN_Y
+import autotile
+import textures
+import profiler
+from settings import (TILE_SIZE, KILL_PLANE_Y, WIDTH, HEIGHT, CAMERA_MARGIN_X, CAMERA_MARGIN_Y,
+                      SKIP_OFFSCREEN_COIN_ANIMATION, FIXED_DT)
+
+# coins/flags are bucketed in 4x4-tile cells for culling and pickups
+SPRITE_CELL = TILE_SIZE * 4
 
 
 class Level:
@@ -14,12 +23,19 @@ class Level:
         self.layout = layout
         self.assets = assets
         self.camera = pygame.Vector2(0, 0)
+        self.prev_camera = pygame.Vector2(0, 0)
         self.sfx = assets.get('sfx', {})
         self.tiles = pygame.sprite.Group()
         self.coins = pygame.sprite.Group()
         self.flags = pygame.sprite.Group()
+        self.grid = TileGrid(0, 0, TILE_SIZE)
+        self.tile_layer = None
+        self.coin_cells = SpatialHash(SPRITE_CELL)
+        self.flag_cells = SpatialHash(SPRITE_CELL)
         self.player = None
         self.spawn = (64, 64)
+        self.ticks = 0  # physics steps taken, for level times
+        self._imgs = None  # tile images by autotile role, looked up on first place()
 
         self.build()
         # Init parallax background (safe even if empty list)
@@ -30,78 +46,175 @@ class Level:
         self.tiles.empty()
         self.coins.empty()
         self.flags.empty()
+        self.coin_cells = SpatialHash(SPRITE_CELL)
+        self.flag_cells = SpatialHash(SPRITE_CELL)
         self.player = None
 
         grid = self.layout
         rows = len(grid)
         cols = len(grid[0]) if rows else 0
+        self.grid = TileGrid(rows, cols, TILE_SIZE)
+        # Editable copy of the layout for set_cell()
+        self.chars = [list(row) for row in grid]
+
+        # Build map: ground tiles pick their image from the neighbour masks,
+        # all computed in one pass (see autotile.py)
+        masks = autotile.masks(grid).tolist() if rows else []
+        for r in range(rows):
+            row, mask_row = grid[r], masks[r]
+            for c in range(cols):
+                if row[c] != '.':
+                    self.place(r, c, row[c], mask_row[c])
 
-        def in_bounds(r, c):
-            return 0 <= r < rows and 0 <= c < cols
+        # FIXED: Ensure we always have a player (no extra TILE_SIZE parameter)
+        if self.player is None:
+            self.player = Player(self.spawn, self.assets['player_anims'], self.sfx)
 
-        def cell(r, c):
-            return grid[r][c] if in_bounds(r, c) else '.'
+        self.tile_layer = StaticTileLayer(self.grid)
+        self.coins_total = len(self.coins)
 
+    def _tile_images(self):
         tile_imgs = self.assets.get('tiles', {})
         grass_mid = tile_imgs.get('grass_mid')
-        grass_cl = tile_imgs.get('grass_corner_left') or grass_mid
-        grass_cr = tile_imgs.get('grass_corner_right') or grass_mid
         dirt_mid = tile_imgs.get('dirt_mid') or grass_mid
-        dirt_cl = tile_imgs.get('dirt_corner_left') or dirt_mid
-        dirt_cr = tile_imgs.get('dirt_corner_right') or dirt_mid
-        box_img = tile_imgs.get('box')
+        return {
+            'grass_mid': grass_mid,
+            'grass_cl': tile_imgs.get('grass_corner_left') or grass_mid,
+            'grass_cr': tile_imgs.get('grass_corner_right') or grass_mid,
+            'dirt_mid': dirt_mid,
+            'dirt_cl': tile_imgs.get('dirt_corner_left') or dirt_mid,
+            'dirt_cr': tile_imgs.get('dirt_corner_right') or dirt_mid,
+            'box': tile_imgs.get('box'),
+        }
 
-        # Build map
-        for r in range(rows):
-            for c in range(cols):
-                ch = grid[r][c]
-                x, y = c * TILE_SIZE, r * TILE_SIZE
-
-                if ch == 'X':  # solid ground with autotiling
-                    above = cell(r - 1, c) == 'X'
-                    left_air = cell(r, c - 1) != 'X'
-                    right_air = cell(r, c + 1) != 'X'
-                    if not above:  # surface => grass
-                        img = grass_mid
-                        if left_air and not right_air:
-                            img = grass_cl
-                        elif right_air and not left_air:
-                            img = grass_cr
-                    else:  # dirt below surface
-                        img = dirt_mid
-                        if left_air and not right_air:
-                            img = dirt_cl
-                        elif right_air and not left_air:
-                            img = dirt_cr
-                    if img is None:
-                        # very simple fallback
-                        img = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
-                        img.fill((100, 200, 100))
-                    self.tiles.add(Tile((x, y), img, TILE_SIZE))
-
-                elif ch == 'B':  # box solid
-                    if box_img is None:
-                        box_img = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
-                        pygame.draw.rect(box_img, (180, 140, 80), (4, 4, TILE_SIZE - 8, TILE_SIZE - 8), 0, border_radius=6)
-                        pygame.draw.rect(box_img, (100, 70, 40), (4, 4, TILE_SIZE - 8, TILE_SIZE - 8), 2, border_radius=6)
-                    self.tiles.add(Tile((x, y), box_img, TILE_SIZE))
-
-                elif ch == 'C':  # coin
-                    coin_img = self.assets['coin_image']
-                    self.coins.add(Coin((x + TILE_SIZE // 2, y + TILE_SIZE // 2), coin_img, TILE_SIZE))
-
-                elif ch == 'E':  # exit flag
-                    self.flags.add(Tile((x, y - TILE_SIZE // 2), self.assets['flag'], TILE_SIZE))
-
-                elif ch == 'P':  # player spawn
-                    self.spawn = (x, y)
-                    # FIXED: Only create player once, not twice
-                    if self.player is None:
-                        self.player = Player(self.spawn, self.assets['player_anims'], self.sfx)
+    def _ground_image(self, mask):
+        imgs = self._imgs
+        if imgs is None:
+            imgs = self._imgs = self._tile_images()
+        img = imgs[autotile.ROLES[mask]]
+        if img is None:
+            # very simple fallback
+            img = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+            img.fill((100, 200, 100))
+        return img
 
-        # FIXED: Ensure we always have a player (no extra TILE_SIZE parameter)
-        if self.player is None:
-            self.player = Player(self.spawn, self.assets['player_anims'], self.sfx)
+    def place(self, r, c, ch, mask=0):
+        """
+        Create whatever layout character ch stands for at (r, c) and register it.
+        mask is the cell's autotile.masks() entry (only used for ground). Returns
+        the new sprite, or None.
+        """
+        imgs = self._imgs
+        if imgs is None:
+            imgs = self._imgs = self._tile_images()
+        x, y = c * TILE_SIZE, r * TILE_SIZE
+
+        if ch == 'X':  # solid ground, image from the autotile lookup table
+            tile = Tile((x, y), self._ground_image(mask), TILE_SIZE)
+            self.tiles.add(tile)
+            self.grid.add(r, c, tile)
+            return tile
+
+        elif ch == 'B':  # box solid
+            box_img = imgs['box']
+            if box_img is None:
+                box_img = imgs['box'] = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+                pygame.draw.rect(box_img, (180, 140, 80), (4, 4, TILE_SIZE - 8, TILE_SIZE - 8), 0, border_radius=6)
+                pygame.draw.rect(box_img, (100, 70, 40), (4, 4, TILE_SIZE - 8, TILE_SIZE - 8), 2, border_radius=6)
+            tile = Tile((x, y), box_img, TILE_SIZE)
+            self.tiles.add(tile)
+            self.grid.add(r, c, tile)
+            return tile
+
+        elif ch == 'C':  # coin
+            coin_img = self.assets['coin_image']
+            coin = Coin((x + TILE_SIZE // 2, y + TILE_SIZE // 2), coin_img, TILE_SIZE)
+            self.coins.add(coin)
+            self.coin_cells.add(coin)
+            return coin
+
+        elif ch == 'E':  # exit flag
+            flag = Tile((x, y - TILE_SIZE // 2), self.assets['flag'], TILE_SIZE)
+            self.flags.add(flag)
+            self.flag_cells.add(flag)
+            return flag
+
+        elif ch == 'P':  # player spawn
+            self.spawn = (x, y)
+            # FIXED: Only create player once, not twice
+            if self.player is None:
+                self.player = Player(self.spawn, self.assets['player_anims'], self.sfx)
+            return self.player
+        return None
+
+    def _char(self, r, c):
+        if 0 <= r < self.grid.rows and 0 <= c < self.grid.cols:
+            return self.chars[r][c]
+        return '.'
+
+    def _set_char(self, r, c, ch):
+        self.chars[r][c] = ch
+
+    def retile(self, r, c):
+        """Recompute the ground images of the 3x3 block around (r, c) after an edit."""
+        for rr in range(r - 1, r + 2):
+            for cc in range(c - 1, c + 2):
+                tile = self.grid.get(rr, cc)
+                if tile is None or self._char(rr, cc) != 'X':
+                    continue
+                img = textures.scaled(self._ground_image(autotile.mask_at(self._char, rr, cc)), (TILE_SIZE, TILE_SIZE))
+                if tile.image is not img:
+                    tile.image = img
+                    self.tile_layer.invalidate(rr, cc)
+
+    def set_cell(self, r, c, ch):
+        """
+        Change one layout cell (level editors, destructible terrain). Only that cell's
+        sprite is replaced and only the 3x3 block around it is re-tiled; the baked
+        chunks holding changed tiles are invalidated so they are re-baked on next draw.
+        A solid put on the spawn cell moves the spawn to the first free cell above it,
+        and one put where the player stands lifts the player on top of it.
+        """
+        grid = self.grid
+        if not (0 <= r < grid.rows and grid.col0 <= c < grid.col0 + grid.cols):
+            raise IndexError(f"cell ({r}, {c}) is outside the level")
+        old = self._char(r, c)
+        if old == ch:
+            return
+        solid = ch in 'XB'
+        if old == 'P' and solid:
+            above = next((rr for rr in range(r - 1, -1, -1) if self._char(rr, c) == '.'), None)
+            if above is None:
+                raise ValueError(f"no free cell above ({r}, {c}) to move the spawn to")
+            self._set_char(above, c, 'P')
+            self.spawn = (c * TILE_SIZE, above * TILE_SIZE)
+        self._set_char(r, c, ch)
+        x, y = c * TILE_SIZE, r * TILE_SIZE
+        if old in 'XB':
+            grid.get(r, c).kill()
+            grid.remove(r, c)
+        elif old == 'C':
+            here = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
+            for coin in self.coin_cells.query(here):
+                if here.collidepoint(coin.rect.center):
+                    coin.kill()
+                    self.coin_cells.remove(coin)
+                    self.coins_total -= 1
+        elif old == 'E':
+            for flag in self.flag_cells.query(pygame.Rect(x, y - TILE_SIZE // 2, TILE_SIZE, TILE_SIZE)):
+                if flag.rect.topleft == (x, y - TILE_SIZE // 2):
+                    flag.kill()
+                    self.flag_cells.remove(flag)
+        if ch != '.':
+            sprite = self.place(r, c, ch)
+            if ch == 'C':
+                self.coins_total += 1
+            if solid and self.player is not None and sprite.rect.colliderect(self.player.rect):
+                self.player.rect.bottom = sprite.rect.top
+                self.player.vel.y = 0
+                self.player.prev_pos.update(self.player.rect.topleft)
+        self.tile_layer.invalidate(r, c)
+        self.retile(r, c)
 
     def respawn(self):
         """Respawn player at saved spawn point."""
@@ -111,10 +224,26 @@ class Level:
             # If Player has velocity vector, reset it
             if hasattr(self.player, "vel"):
                 self.player.vel.update(0, 0)
+            # Don't interpolate across the teleport
+            self.player.prev_pos.update(self.spawn)
+        self.prev_camera.update(self.camera)
+
+    def tick(self, keys):
+        """Advance one fixed physics step: movement, camera and coin pickups."""
+        self.ticks += 1
+        self.update(FIXED_DT, keys)
+        self.try_collect()
 
     def update(self, dt, keys):
-        self.player.update(dt, self.tiles.sprites(), keys)
-        self.coins.update(dt)
+        self.prev_camera.update(self.camera)
+        t = profiler.now()
+        self.player.update(dt, self.grid, keys)
+        profiler.add("collision", t)
+        if SKIP_OFFSCREEN_COIN_ANIMATION:
+            for coin in self.coin_cells.query(self.view_rect((WIDTH, HEIGHT))):
+                coin.update(dt)
+        else:
+            self.coins.update(dt)
 
         # Camera follows player with margins
         px = self.player.rect.centerx
@@ -144,39 +273,59 @@ class Level:
                     pass
             self.lost = True
         
-    def draw(self, surf):
+    def view_rect(self, size, camera=None):
+        """World-space rect covered by the camera (defaults to the current one)."""
+        camera = self.camera if camera is None else camera
+        return pygame.Rect(int(camera.x), int(camera.y), size[0], size[1])
+
+    def draw(self, surf, alpha=1.0):
+        """
+        Render the level. alpha (0..1) is how far the real time is between the
+        previous and the current physics tick; camera and player are blended by it
+        so motion stays smooth when the render rate differs from PHYSICS_HZ.
+        """
+        camera = self.prev_camera.lerp(self.camera, alpha)
+        camera.update(round(camera.x), round(camera.y))
+
         # Parallax background
+        t = profiler.now()
         if hasattr(self, "parallax") and self.parallax:
-            self.parallax.draw(surf, self.camera.x)
+            self.parallax.draw(surf, camera.x)
         else:
             surf.fill((25, 30, 45))
+        profiler.add("parallax", t)
+
+        # Draw tiles (pre-baked chunks overlapping the camera)
+        t = profiler.now()
+        self.tile_layer.draw(surf, camera)
+        profiler.add("tiles", t)
+        t = profiler.now()
+        # Draw coins (animated sprites) and flags, culled to the camera view
+        # (one batched Surface.blits call for all of them, player last)
+        view = self.view_rect(surf.get_size(), camera)
+        cam_x, cam_y = camera.x, camera.y
+        seq = [(coin.image, (coin.rect.x - cam_x, coin.rect.y - cam_y)) for coin in self.coin_cells.query(view)]
+        seq.extend((f.image, (f.rect.x - cam_x, f.rect.y - cam_y)) for f in self.flag_cells.query(view))
 
-        # Draw tiles
-        for t in self.tiles:
-            surf.blit(t.image, (t.rect.x - self.camera.x, t.rect.y - self.camera.y))
-        # Draw coins (animated sprites)
-        for coin in self.coins:
-            surf.blit(coin.image, (coin.rect.x - self.camera.x, coin.rect.y - self.camera.y))
-        # Draw flags
-        for f in self.flags:
-            surf.blit(f.image, (f.rect.x - self.camera.x, f.rect.y - self.camera.y))
-
-        # Draw player sprite (player.image is scaled to TILE_SIZE)
-        sprite_x = self.player.rect.centerx - TILE_SIZE // 2
-        sprite_y = self.player.rect.top
-        surf.blit(self.player.image, (sprite_x - self.camera.x, sprite_y - self.camera.y))
+        # Player sprite (player.image is scaled to TILE_SIZE)
+        pos = self.player.render_pos(alpha)
+        sprite_x = round(pos.x) + self.player.rect.width // 2 - TILE_SIZE // 2
+        sprite_y = round(pos.y)
+        seq.append((self.player.image, (sprite_x - cam_x, sprite_y - cam_y)))
+        surf.blits(seq, doreturn=False)
+        profiler.add("sprites", t)
 
     def collected_all(self):
         return len(self.coins) == 0
 
     def at_exit(self):
-        for flag in self.flags:
-            if self.player.rect.colliderect(flag.rect):
-                return True
-        return False
+        return bool(self.flag_cells.colliding(self.player.rect))
 
     def try_collect(self):
-        caught = pygame.sprite.spritecollide(self.player, self.coins, dokill=True)
+        caught = self.coin_cells.colliding(self.player.rect)
+        for coin in caught:
+            coin.kill()
+            self.coin_cells.remove(coin)
         if caught:
             try:
                 snd = self.sfx.get('coin')
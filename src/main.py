@@ -1,10 +1,37 @@
-import pygame, sys
+import sys
+import time
+_T_INICIO = time.perf_counter()
+if __name__ == "__main__":
+    # Início rápido: ao ser importado o pygame puxa surfarray/sndarray (que importam o numpy)
+    # e o pkg_resources; o jogo não usa nenhum deles, então ficam de fora só durante o import.
+    _PULAR = [m for m in ("pygame.surfarray", "pygame.sndarray", "pkg_resources") if m not in sys.modules]
+    for _m in _PULAR:
+        sys.modules[_m] = None
+import pygame
+if __name__ == "__main__":
+    for _m in _PULAR:
+        del sys.modules[_m]
 from pathlib import Path
 import random
-from settings import WIDTH, HEIGHT, TITLE, FPS, TILE_SIZE
-from utils import load_spritesheet
-from level import Level
-from score import load_score, add_points, subtract_points
+import argparse
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from settings import WIDTH, HEIGHT, TITLE, FPS, TILE_SIZE, FIXED_DT, MAX_FRAME_TIME, LOAD_WORKERS, ASSET_CACHE
+from concurrent.futures import ThreadPoolExecutor
+import textures
+import textcache
+import assetcache
+from animation import AnimationSet
+from inputs import KeyboardInput
+from replay import Replay, RecordingInput, ReplayInput
+from pregen import Pregenerator
+from score import use_backend, add_points, subtract_points, flush_score
+from stats import StatsStore
+import screens
+import profiler
+from screens import MenuScreen, PausedScreen, LostScreen, VictoryScreen
+from utils import LazySound
+_T_IMPORTS = time.perf_counter()
 
 STATE_MENU = "menu"
 STATE_PLAYING = "playing"
@@ -12,229 +39,325 @@ STATE_PAUSED = "paused"
 STATE_VICTORY = "victory"
 STATE_LOST = "lost"
 
-class Button:
-    def __init__(self, rect, text, font):
-        self.rect = pygame.Rect(rect)
-        self.text = text
-        self.font = font
-        self.hovered = False
-
-    def update_hover(self, mouse_pos):
-        self.hovered = self.rect.collidepoint(mouse_pos)
-
-    def was_clicked(self, event):
-        return (
-            event.type == pygame.MOUSEBUTTONDOWN and
-            event.button == 1 and
-            self.rect.collidepoint(event.pos)
-        )
-
-    def draw(self, screen):
-        cor = (120, 160, 255) if self.hovered else (80, 120, 200)
-        pygame.draw.rect(screen, cor, self.rect, border_radius=8)
-        label = self.font.render(self.text, True, (255, 255, 255))
-        screen.blit(label, label.get_rect(center=self.rect.center))
-
 # ===== Geração Procedural =====
-def _jump_tiles_from_settings():
-    from settings import JUMP_VELOCITY, GRAVITY, TILE_SIZE
-    v = abs(JUMP_VELOCITY)
-    g = GRAVITY
-    px_height = (v * v) / (2.0 * g)
-    return max(2, int(px_height // TILE_SIZE))
-
-def _derived_reach_tiles():
-    from settings import JUMP_VELOCITY, GRAVITY, TILE_SIZE, PLAYER_SPEED
-    v = abs(JUMP_VELOCITY)
-    g = GRAVITY
-    max_height_px = (v * v) / (2.0 * g)
-    max_up_tiles = max(1, int(max_height_px // TILE_SIZE))
-    airtime_frames = int((2.0 * v) / g)
-    horiz_px = PLAYER_SPEED * airtime_frames
-    max_gap_tiles = max(1, int(horiz_px // TILE_SIZE) - 1)
-    return max_up_tiles, max_gap_tiles
-
-def generate_level_layout(width_tiles=42, height_tiles=11, seed=None, gem_count=None):
-    rnd = random.Random(seed) if seed is not None else random
-    MAX_UP, MAX_GAP = _derived_reach_tiles()
-    W, H = width_tiles, height_tiles
-    GY = H - 1
-
-    grid = [['.' for _ in range(W)] for _ in range(H)]
-    for x in range(W):
-        grid[GY][x] = 'X'
-
-    pit_ranges = []
-    pit_x = 8
-    while pit_x < W - 10:
-        if rnd.random() < 0.3:
-            pit_w = rnd.randint(2, 3)
-            pit_start = pit_x
-            pit_end = min(W - 4, pit_x + pit_w)
-            for px in range(pit_start, pit_end):
-                grid[GY][px] = '.'
-            pit_ranges.append((pit_start, pit_end - 1))
-            pit_x += pit_w + rnd.randint(6, 10)
-        else:
-            pit_x += rnd.randint(4, 8)
-
-    def platform_crosses_pit(x0, x1, y):
-        if y != GY:
+_VAZIO, _BLOCO = ord('.'), ord('X')
+_TENTATIVAS = 20
+# Nível sem fim: buracos do chão ficam cavados até esta distância à frente do cursor
+_FOLGA_BURACOS = 32
+
+class GeradorDeTrechos:
+    """
+    Estado da geração procedural: a grade de bytes, os buracos do chão e os trechos
+    (chunk_flat, chunk_gap, chunk_stairs_up, ...), que vão sendo sorteados da esquerda
+    para a direita a partir do cursor (x, y).
+
+    Com largura é um nível comum (generate_level_layout): todos os buracos são cavados
+    antes do primeiro trecho. Sem largura o nível não acaba (stream.StreamLevel): os
+    buracos são cavados aos poucos à frente do cursor, a grade é só uma janela de
+    colunas que anda junto com ele e colunas_prontas() entrega as que nenhum trecho
+    muda mais; a memória não cresce com a distância.
+    """
+    def __init__(self, height_tiles=11, width_tiles=None, rnd=random, janela=128):
+        # numpy só aqui dentro: o menu abre sem ele e a geração roda na thread do Pregenerator
+        import numpy as np
+        import reach
+        self.np = np
+        self.rnd = rnd
+        # Alcance do pulo simulado com a física real (reach.py), não estimado por fórmula
+        self.alcance = reach.table()
+        self.max_up, self.max_gap = self.alcance.max_rise(), self.alcance.max_gap()
+        self.infinito = width_tiles is None
+        self.W = float('inf') if self.infinito else width_tiles
+        self.H = height_tiles
+        self.GY = GY = height_tiles - 1
+
+        # Grade de bytes (um caractere ASCII por célula); plataformas e folgas são fatias.
+        # A coluna x do nível fica em grid[:, x - base] (base só anda no nível sem fim)
+        self.base = 0
+        self.entregue = 0
+        self.grid = np.full((height_tiles, janela if self.infinito else width_tiles), _VAZIO, dtype=np.uint8)
+        self.grid[GY] = _BLOCO
+
+        # Buracos em ordem crescente e sem sobreposição: início e fim ficam ordenados,
+        # então basta uma busca binária em vez de percorrer a lista toda
+        self.pit_starts = []
+        self.pit_ends = []
+        self.pit_x = 8
+        if not self.infinito:
+            self._cavar_buracos(self.W - 10)
+
+        self.spawn = (3, GY - 1)
+        self.grid[GY - 1, 3] = ord('P')
+        self.x = self.spawn[0] + 2
+        self.y = self.spawn[1]
+        self.ultima = (self.spawn[0], GY)  # o jogador começa no chão
+
+        # Os trechos só anotam plataformas e folgas; elas vão para a grade depois que o
+        # trecho passa no teste de alcance, então um trecho recusado não deixa restos
+        self.pendentes = []
+
+        trechos = [(self.chunk_flat, 3), (self.chunk_gap, 2), (self.chunk_stairs_up, 2),
+                   (self.chunk_stairs_down, 2), (self.chunk_floater, 2)]
+        # Sorteio com pesos acumulados prontos: mesmos números do rnd.choices(weights=...) de antes,
+        # sem montar listas a cada trecho. Perto do chão não há escada descendo.
+        def tabela(opcoes):
+            return [c[0] for c in opcoes], list(accumulate(c[1] for c in opcoes))
+        self.todos = tabela(trechos)
+        self.perto_do_chao = tabela([c for c in trechos if c[0] != self.chunk_stairs_down])
+
+    def _garantir(self, coluna):
+        # nível sem fim: a janela desliza por cima das colunas já entregues (ou cresce)
+        largura = self.grid.shape[1]
+        if not self.infinito or coluna < self.base + largura:
+            return
+        s = self.entregue - self.base
+        if s:
+            self.grid[:, :largura - s] = self.grid[:, s:]
+            self.grid[:, largura - s:] = _VAZIO
+            self.grid[self.GY, largura - s:] = _BLOCO
+            self.base += s
+            i = bisect_left(self.pit_ends, self.base)
+            del self.pit_starts[:i], self.pit_ends[:i]
+        if coluna >= self.base + largura:
+            extra = self.np.full((self.H, coluna + 1 - self.base), _VAZIO, dtype=self.np.uint8)
+            extra[self.GY] = _BLOCO
+            self.grid = self.np.concatenate([self.grid, extra], axis=1)
+
+    def _cavar_buracos(self, ate):
+        rnd = self.rnd
+        while self.pit_x < ate:
+            if rnd.random() < 0.3:
+                pit_w = rnd.randint(2, 3)
+                pit_start = self.pit_x
+                pit_end = min(self.W - 4, self.pit_x + pit_w)
+                self._garantir(pit_end - 1)
+                b = self.base
+                self.grid[self.GY, pit_start - b:pit_end - b] = _VAZIO
+                self.pit_starts.append(pit_start)
+                self.pit_ends.append(pit_end - 1)
+                self.pit_x += pit_w + rnd.randint(6, 10)
+            else:
+                self.pit_x += rnd.randint(4, 8)
+
+    def platform_crosses_pit(self, x0, x1, y):
+        if y != self.GY:
             return False
-        for pit_start, pit_end in pit_ranges:
-            if not (x1 < pit_start or x0 > pit_end):
-                return True
-        return False
-
-    spawn_x, spawn_y = 3, GY - 1
-    grid[spawn_y][spawn_x] = 'P'
-
-    def headroom_clear(y, x0, x1, hr=2):
-        for x in range(max(1, x0), min(W - 1, x1) + 1):
-            for k in range(1, hr + 1):
-                yy = y - k
-                if 0 <= yy < H:
-                    grid[yy][x] = '.'
-
-    def stamp_platform(y, x0, x1, hr=2):
-        for x in range(max(1, x0), min(W - 1, x1) + 1):
-            grid[y][x] = 'X'
-        headroom_clear(y, x0, x1, hr)
-
-    def chunk_flat(x0, y):
-        length = rnd.randint(5, 9)
+        # primeiro buraco que termina em x0 ou depois; cruza se começa até x1
+        i = bisect_left(self.pit_ends, x0)
+        return i < len(self.pit_starts) and self.pit_starts[i] <= x1
+
+    def headroom_clear(self, y, x0, x1, hr=2):
+        self.pendentes.append((False, y, max(1, x0), min(self.W - 1, x1) + 1, hr))
+
+    def stamp_platform(self, y, x0, x1, hr=2):
+        self.pendentes.append((True, y, max(1, x0), min(self.W - 1, x1) + 1, hr))
+
+    def alcancavel(self, origem):
+        # cada plataforma nova tem que ser alcançável a partir do fim da anterior
+        ox, oy = origem
+        for bloco, y, xa, xb, hr in self.pendentes:
+            if bloco and xa < xb:
+                if not self.alcance.can_reach(xa - ox, y - oy):
+                    return False
+                ox, oy = xb - 1, y
+        return True
+
+    def aplicar(self, origem):
+        # grava o que está pendente; devolve o fim da última plataforma
+        for bloco, y, xa, xb, hr in self.pendentes:
+            self._garantir(xb - 1)
+            grid, b = self.grid, self.base
+            if bloco:
+                grid[y, xa - b:xb - b] = _BLOCO
+                if xa < xb:
+                    origem = (xb - 1, y)
+            grid[max(0, y - hr):max(0, y), xa - b:xb - b] = _VAZIO
+        self.pendentes.clear()
+        return origem
+
+    def chunk_flat(self, x0, y):
+        length = self.rnd.randint(5, 9)
         x1 = x0 + length - 1
-        if platform_crosses_pit(x0, x1, y):
-            for pit_start, pit_end in pit_ranges:
-                if x0 < pit_start <= x1:
-                    x1 = pit_start - 1
-                    break
+        if self.platform_crosses_pit(x0, x1, y):
+            i = bisect_right(self.pit_starts, x0)
+            if i < len(self.pit_starts) and self.pit_starts[i] <= x1:
+                x1 = self.pit_starts[i] - 1
             if x1 - x0 < 3:
                 return x0, y, []
-        stamp_platform(y, x0, x1, 2)
+        self.stamp_platform(y, x0, x1, 2)
         mid = x0 + (x1 - x0) // 2
         return x1, y, [(mid, y - 1)]
 
-    def chunk_gap(x0, y):
-        gap = rnd.randint(2, min(MAX_GAP, 3))
+    def chunk_gap(self, x0, y):
+        gap = self.rnd.randint(2, self.max_gap)
         left_x1 = x0 + 2
-        if platform_crosses_pit(x0, left_x1, y):
+        if self.platform_crosses_pit(x0, left_x1, y):
             return x0, y, []
-        stamp_platform(y, x0, left_x1, 2)
-        headroom_clear(y, x0 + 3, x0 + 2 + gap, 2)
+        self.stamp_platform(y, x0, left_x1, 2)
+        self.headroom_clear(y, x0 + 3, x0 + 2 + gap, 2)
         rx0 = x0 + 3 + gap
         rx1 = rx0 + 2
-        if platform_crosses_pit(rx0, rx1, y):
+        if self.platform_crosses_pit(rx0, rx1, y):
             return left_x1, y, []
-        stamp_platform(y, rx0, rx1, 2)
+        self.stamp_platform(y, rx0, rx1, 2)
         return rx1, y, []
 
-    def chunk_stairs_up(x0, y):
-        rnd_steps = rnd.randint(2, min(3, MAX_UP))
+    def chunk_stairs_up(self, x0, y):
+        rnd_steps = self.rnd.randint(2, min(3, self.max_up))
         width = 3
         gem_spots = []
         cx, cy = x0, y
         for _ in range(rnd_steps):
-            if platform_crosses_pit(cx, cx + width - 1, cy):
+            if cy <= 2:  # mesma linha mais alta dos flutuantes
+                break
+            if self.platform_crosses_pit(cx, cx + width - 1, cy):
                 break
-            stamp_platform(cy, cx, cx + width - 1, 2)
+            self.stamp_platform(cy, cx, cx + width - 1, 2)
             gem_spots.append((cx + 1, cy - 1))
             cx += width
             cy -= 1
-        if not platform_crosses_pit(cx, cx + width - 1, cy):
-            stamp_platform(cy, cx, cx + width - 1, 2)
+        if not self.platform_crosses_pit(cx, cx + width - 1, cy):
+            self.stamp_platform(cy, cx, cx + width - 1, 2)
         return cx + width - 1, cy, gem_spots
 
-    def chunk_stairs_down(x0, y):
+    def chunk_stairs_down(self, x0, y):
+        GY = self.GY
         max_steps_possible = GY - y - 1
-        steps = rnd.randint(2, min(3, MAX_UP, max(2, max_steps_possible)))
+        steps = self.rnd.randint(2, min(3, self.max_up, max(2, max_steps_possible)))
         width = 3
         gem_spots = []
         cx, cy = x0, y
         for _ in range(steps):
             if cy >= GY:
                 break
-            if platform_crosses_pit(cx, cx + width - 1, cy):
+            if self.platform_crosses_pit(cx, cx + width - 1, cy):
                 break
-            stamp_platform(cy, cx, cx + width - 1, 2)
+            self.stamp_platform(cy, cx, cx + width - 1, 2)
             if cy > 0:
                 gem_spots.append((cx + 1, cy - 1))
             cx += width
             cy += 1
         cy = min(cy, GY)
-        if not platform_crosses_pit(cx, cx + width - 1, cy):
-            stamp_platform(cy, cx, cx + width - 1, 2)
+        if not self.platform_crosses_pit(cx, cx + width - 1, cy):
+            self.stamp_platform(cy, cx, cx + width - 1, 2)
         return cx + width - 1, cy, gem_spots
 
-    def chunk_floater(x0, y):
-        dy = rnd.randint(-min(MAX_UP, 2), min(MAX_UP, 2))
+    def chunk_floater(self, x0, y):
+        # o flutuante começa depois de uma coluna vazia (dx = 2 do fim do trecho anterior)
+        GY = self.GY
+        subida = self.alcance.max_rise(2)
+        dy = self.rnd.randint(-subida, subida)
         ny = max(2, min(GY - 2, y + dy))
-        length = rnd.randint(3, 5)
+        length = self.rnd.randint(3, 5)
         x1 = x0 + length - 1
-        if platform_crosses_pit(x0, x1, ny):
+        if self.platform_crosses_pit(x0, x1, ny):
             ny = max(2, GY - 2)
-        stamp_platform(ny, x0, x1, 2)
+        self.stamp_platform(ny, x0, x1, 2)
         return x1, ny, [(x0 + length // 2, ny - 1)]
 
-    chunks = [("flat", 3), ("gap", 2), ("stairs_up", 2), ("stairs_down", 2), ("floater", 2)]
-
-    x = spawn_x + 2
-    y = spawn_y
-    footholds = [(spawn_x, spawn_y)]
-
-    while x < W - 8:
-        available_chunks = chunks[:]
-        if y >= GY - 2:
-            available_chunks = [c for c in chunks if c[0] != "stairs_down"]
-        if not available_chunks:
-            available_chunks = [("flat", 1)]
-        name = rnd.choices([c[0] for c in available_chunks], weights=[c[1] for c in available_chunks])[0]
-
-        if name == "flat":
-            nx, ny, gems = chunk_flat(x, y)
-        elif name == "gap":
-            nx, ny, gems = chunk_gap(x, y)
-        elif name == "stairs_up":
-            nx, ny, gems = chunk_stairs_up(x, y)
-        elif name == "stairs_down":
-            nx, ny, gems = chunk_stairs_down(x, y)
-        else:
-            nx, ny, gems = chunk_floater(x, y)
+    def proximo_trecho(self):
+        """Sorteia e grava o trecho seguinte ao cursor; devolve o apoio (x, y) onde ele termina."""
+        if self.infinito:
+            self._cavar_buracos(self.x + _FOLGA_BURACOS)
+        funcs, pesos = self.perto_do_chao if self.y >= self.GY - 2 else self.todos
+        nx, ny, gems = self.rnd.choices(funcs, cum_weights=pesos)[0](self.x, self.y)
+
+        # Só é recusado o trecho com um salto que a física não alcança; vira um trecho plano
+        if not self.alcancavel(self.ultima):
+            self.pendentes.clear()
+            nx, ny, gems = self.chunk_flat(self.x, self.y)
+        self.ultima = self.aplicar(self.ultima)
+
+        self.x = nx + 2
+        self.y = ny
+        return nx, ny
+
+    def livre_acima(self, fx, fy):
+        """True se cabe uma moeda em cima do apoio (fx, fy): as duas células acima estão vazias."""
+        c = fx - self.base
+        return fy - 2 >= 0 and self.grid[fy - 1, c] == _VAZIO and self.grid[fy - 2, c] == _VAZIO
+
+    def marcar(self, x, y, ch):
+        self.grid[y, x - self.base] = ord(ch)
+
+    def colunas_prontas(self):
+        """
+        (primeira coluna, linhas) com as colunas à esquerda do cursor ainda não entregues;
+        nenhum trecho mexe nelas depois. Cada coluna sai uma vez só.
+        """
+        c0, c1 = self.entregue, self.x
+        self._garantir(c1 - 1)
+        fatia = self.grid[:, c0 - self.base:c1 - self.base]
+        texto = self.np.ascontiguousarray(fatia).tobytes().decode('ascii')
+        n = c1 - c0
+        self.entregue = c1
+        return c0, [texto[i:i + n] for i in range(0, n * self.H, n)]
 
-        if abs(ny - y) > MAX_UP or (nx - x) > (MAX_GAP * 2):
-            nx, ny, gems = chunk_flat(x, y)
+def generate_level_layout(width_tiles=42, height_tiles=11, seed=None, gem_count=None):
+    rnd = random.Random(seed) if seed is not None else random
+    gerador = GeradorDeTrechos(height_tiles, width_tiles, rnd)
+    W = width_tiles
+    grid = gerador.grid
 
-        footholds.append((nx, ny))
-        x = nx + 2
-        y = ny
+    footholds = [gerador.spawn]
+    while gerador.x < W - 8:
+        footholds.append(gerador.proximo_trecho())
 
     last_x, last_y = footholds[-1]
-    exit_x = min(W - 3, last_x + min(MAX_GAP, W - 3 - last_x))
+    exit_x = min(W - 3, last_x + min(gerador.max_gap, W - 3 - last_x))
     exit_y = last_y
-    grid[exit_y][exit_x] = 'E'
+    grid[exit_y, exit_x] = ord('E')
 
     if gem_count is None:
         gem_count = rnd.randint(3, 6)
-    candidates = []
-    for fx, fy in footholds[1:-1]:
-        if fy - 2 >= 0 and grid[fy - 1][fx] == '.' and grid[fy - 2][fx] == '.':
-            candidates.append((fx, fy - 1))
+    candidates = [(fx, fy - 1) for fx, fy in footholds[1:-1] if gerador.livre_acima(fx, fy)]
     rnd.shuffle(candidates)
     for (cx, cy) in candidates[:gem_count]:
-        grid[cy][cx] = 'C'
+        grid[cy, cx] = ord('C')
 
-    return [''.join(row) for row in grid]
+    texto = grid.tobytes().decode('ascii')
+    return [texto[i:i + W] for i in range(0, W * height_tiles, W)]
 
 def generate_level_pack(num_levels=3, width_tiles=42, height_tiles=11, seed=None):
+    import validate
     rnd = random.Random(seed) if seed is not None else random
-    return [
-        generate_level_layout(width_tiles, height_tiles, seed=rnd.randint(0, 1_000_000))
-        for _ in range(num_levels)
-    ]
+    pack = []
+    for _ in range(num_levels):
+        # Semente cujo nível não dá para terminar (validate.py) é trocada pela próxima;
+        # depois de _TENTATIVAS fica a última, para a geração nunca travar
+        for _ in range(_TENTATIVAS):
+            layout = generate_level_layout(width_tiles, height_tiles, seed=rnd.randint(0, 1_000_000))
+            if validate.completable(layout):
+                break
+        pack.append(layout)
+    return pack
 
 # ===== Fim Procedural =====
 
+def _timed(fn, *args):
+    """Roda fn(*args) numa thread do pool; devolve (resultado ou None, erro ou None, segundos)."""
+    t0 = time.perf_counter()
+    try:
+        return fn(*args), None, time.perf_counter() - t0
+    except Exception as exc:
+        return None, exc, time.perf_counter() - t0
+
+def _load_image(path, modo):
+    """Imagem já no tamanho final (ver assetcache.prepare); devolve (frames, veio_do_cache)."""
+    if modo is None:
+        return [pygame.image.load(str(path))], False
+    if ASSET_CACHE:
+        return assetcache.load(path, modo)
+    return assetcache.prepare(pygame.image.load(str(path)), modo), False
+
 def load_assets():
+    """
+    Carrega imagens e sons. A decodificação dos PNGs e a escala rodam em paralelo num
+    pool de threads; o convert_alpha (formato de pixel da tela) fica na thread principal.
+    Imagens já escaladas ficam em cache no disco (assetcache), então a partir da
+    segunda vez nem PNG nem escala: os pixels saem direto do arquivo mapeado.
+    O tempo de cada arquivo fica em assets['load_timings'] (ver print_load_timings).
+    """
     # tenta achar uma pasta 'assets' válida
     import os
     here = Path(__file__).resolve().parent
@@ -254,198 +377,316 @@ def load_assets():
     def ap(*parts):
         return ASSETS_ROOT.joinpath(*parts)
 
-    assets = {}
-
-    # player (32x32 -> escala pra TILE_SIZE)
-    assets['player_anims'] = {
-        'idle': load_spritesheet(str(ap("player", "Idle.png")), 32, 32),
-        'run' : load_spritesheet(str(ap("player", "Run.png")), 32, 32),
-        'jump': load_spritesheet(str(ap("player", "Jump.png")), 32, 32),
-        'fall': load_spritesheet(str(ap("player", "Fall.png")), 32, 32),
-    }
-    for k, frames in assets['player_anims'].items():
-        assets['player_anims'][k] = [pygame.transform.scale(f, (TILE_SIZE, TILE_SIZE)) for f in frames]
-
-    # tiles
-    def _load_img(p):
-        try:
-            return pygame.image.load(p).convert_alpha()
-        except Exception:
-            return None
-
     tileset_dir = ap("tileset")
-    assets['tiles'] = {
-        'grass_mid'        : _load_img(str(tileset_dir / "grasstilemid.png")),
-        'grass_corner_left': _load_img(str(tileset_dir / "grasstilecornerleft.png")),
-        'grass_corner_right': _load_img(str(tileset_dir / "grasstilecornerright.png")),
-        'dirt_mid'         : _load_img(str(tileset_dir / "dirttilemid.png")),
-        'dirt_corner_left' : _load_img(str(tileset_dir / "dirttilecornerleft.png")),
-        'dirt_corner_right': _load_img(str(tileset_dir / "dirttilecornerright.png")),
-        'box'              : _load_img(str(tileset_dir / "box.png")),
-        'platform'         : _load_img(str(tileset_dir / "platform.png")),
-    }
-    if not assets['tiles']['grass_mid']:
-        fallback = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
-        fallback.fill((100, 200, 100))
-        assets['tiles']['grass_mid'] = fallback
-
-    # moeda e bandeira (placeholders se não houver arquivo)
-    try:
-        assets['coin_image'] = pygame.image.load(str(ap("coin.png"))).convert_alpha()
-    except Exception:
-        coin_h = 16
-        coin_w = coin_h * 4
-        surf = pygame.Surface((coin_w, coin_h), pygame.SRCALPHA)
-        for i in range(4):
-            pygame.draw.circle(surf, (255, 215, 0), (coin_h//2 + i*coin_h, coin_h//2), coin_h//2)
-            pygame.draw.circle(surf, (255, 240, 170), (coin_h//2 + i*coin_h, coin_h//2), coin_h//3, 2)
-        assets['coin_image'] = surf
-
-    try:
-        assets['flag'] = pygame.image.load(str(ap("flag.png"))).convert_alpha()
-    except Exception:
-        flag = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
-        pygame.draw.rect(flag, (80, 50, 30), (10, 8, 6, TILE_SIZE-12))
-        pygame.draw.polygon(flag, (200, 40, 50), [(16, 10),(36, 18),(16, 26)])
-        assets['flag'] = flag
-
-    # parallax (opcional)
     par_dir = ap("parallax", "forest")
-    layers = []
-    def add_layer(name, speed):
-        p = par_dir / name
-        img = _load_img(str(p))
-        if img:
-            layers.append({'image': img, 'speed': speed})
-    add_layer("forest_sky.png",      0.05)
-    add_layer("forest_moon.png",     0.08)
-    add_layer("forest_mountain.png", 0.12)
-    add_layer("forest_back.png",     0.22)
-    add_layer("forest_mid.png",      0.35)
-    add_layer("forest_short.png",    0.55)
-    assets['parallax_layers'] = layers
-
-    # sons (opcionais)
-    try:
-        if not pygame.mixer.get_init():
-            pygame.mixer.init()
-    except Exception:
-        pass
-
-    def _load_sound(p):
-        try:
-            return pygame.mixer.Sound(p)
-        except Exception:
-            return None
-
     sfx_dir = ap("sfx")
-    assets['sfx'] = {
-        'jump': _load_sound(str(sfx_dir / "pular.wav")),
-        'coin': _load_sound(str(sfx_dir / "moeda.wav")),
-        'death': _load_sound(str(sfx_dir / "death.wav")),
-        'flag': _load_sound(str(sfx_dir / "passar.wav")),
+    arquivos_img = {
+        'player/idle': ap("player", "Idle.png"),
+        'player/run': ap("player", "Run.png"),
+        'player/jump': ap("player", "Jump.png"),
+        'player/fall': ap("player", "Fall.png"),
+        'grass_mid': tileset_dir / "grasstilemid.png",
+        'grass_corner_left': tileset_dir / "grasstilecornerleft.png",
+        'grass_corner_right': tileset_dir / "grasstilecornerright.png",
+        'dirt_mid': tileset_dir / "dirttilemid.png",
+        'dirt_corner_left': tileset_dir / "dirttilecornerleft.png",
+        'dirt_corner_right': tileset_dir / "dirttilecornerright.png",
+        'box': tileset_dir / "box.png",
+        'platform': tileset_dir / "platform.png",
+        'coin': ap("coin.png"),
+        'flag': ap("flag.png"),
+    }
+    # parallax (opcional), do fundo pra frente
+    camadas = [
+        ("forest_sky.png",      0.05),
+        ("forest_moon.png",     0.08),
+        ("forest_mountain.png", 0.12),
+        ("forest_back.png",     0.22),
+        ("forest_mid.png",      0.35),
+        ("forest_short.png",    0.55),
+    ]
+    for nome, _ in camadas:
+        arquivos_img['parallax/' + nome] = par_dir / nome
+    arquivos_sfx = {
+        'jump': sfx_dir / "pular.wav",
+        'coin': sfx_dir / "moeda.wav",
+        'death': sfx_dir / "death.wav",
+        'flag': sfx_dir / "passar.wav",
     }
 
+    assets = {}
+    tempos = {}  # nome -> {'decode': s, 'convert': s, 'cached': bool}
+    def modo(nome):
+        if nome.startswith('player/'):
+            return 'frames'
+        if nome.startswith('parallax/'):
+            return 'height'
+        return None if nome in ('coin', 'flag') else 'tile'
+
+    with ThreadPoolExecutor(max_workers=LOAD_WORKERS) as pool:
+        fut_img = {nome: pool.submit(_timed, _load_image, p, modo(nome)) for nome, p in arquivos_img.items()}
+
+        def quadros(nome, obrigatoria=False):
+            res, erro, decode = fut_img[nome].result()
+            t0 = time.perf_counter()
+            frames, cache = res if res is not None else ([], False)
+            frames = [f.convert_alpha() for f in frames]
+            tempos[nome] = {'decode': decode, 'convert': time.perf_counter() - t0, 'cached': cache}
+            if erro is not None and obrigatoria:
+                raise erro
+            return frames
+
+        def imagem(nome):
+            frames = quadros(nome)
+            return frames[0] if frames else None
+
+        # player (32x32 -> já vem escalado pra TILE_SIZE)
+        anims = {}
+        for k in ('idle', 'run', 'jump', 'fall'):
+            anims[k] = [textures.scaled(f, (TILE_SIZE, TILE_SIZE)) for f in quadros('player/' + k, obrigatoria=True)]
+        assets['player_anims'] = AnimationSet(anims)
+
+        # tiles
+        assets['tiles'] = {
+            nome: imagem(nome)
+            for nome in ('grass_mid', 'grass_corner_left', 'grass_corner_right', 'dirt_mid',
+                         'dirt_corner_left', 'dirt_corner_right', 'box', 'platform')
+        }
+        if not assets['tiles']['grass_mid']:
+            fallback = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+            fallback.fill((100, 200, 100))
+            assets['tiles']['grass_mid'] = fallback
+
+        # moeda e bandeira (placeholders se não houver arquivo)
+        assets['coin_image'] = imagem('coin')
+        if assets['coin_image'] is None:
+            coin_h = 16
+            coin_w = coin_h * 4
+            surf = pygame.Surface((coin_w, coin_h), pygame.SRCALPHA)
+            for i in range(4):
+                pygame.draw.circle(surf, (255, 215, 0), (coin_h//2 + i*coin_h, coin_h//2), coin_h//2)
+                pygame.draw.circle(surf, (255, 240, 170), (coin_h//2 + i*coin_h, coin_h//2), coin_h//3, 2)
+            assets['coin_image'] = surf
+
+        assets['flag'] = imagem('flag')
+        if assets['flag'] is None:
+            flag = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+            pygame.draw.rect(flag, (80, 50, 30), (10, 8, 6, TILE_SIZE-12))
+            pygame.draw.polygon(flag, (200, 40, 50), [(16, 10),(36, 18),(16, 26)])
+            assets['flag'] = flag
+
+        layers = []
+        for nome, speed in camadas:
+            img = imagem('parallax/' + nome)
+            if img:
+                layers.append({'image': img, 'speed': speed})
+        assets['parallax_layers'] = layers
+
+    # sons (opcionais): mixer e decodificação só no primeiro play()
+    assets['sfx'] = {nome: LazySound(p) if p.exists() else None for nome, p in arquivos_sfx.items()}
+    assets['load_timings'] = tempos
     return assets
 
-def draw_centered_text(screen, font, text, y, color=(240, 240, 240)):
-    surf = font.render(text, True, color)
-    screen.blit(surf, (WIDTH // 2 - surf.get_width() // 2, y))
+def print_boot_timings(marcas, file=sys.stderr):
+    """Tempo de cada etapa da abertura, até o menu aparecer."""
+    for nome, segundos in marcas:
+        print(f"{nome:<28} {segundos * 1e3:>10.2f} ms", file=file)
+
+def print_load_timings(tempos, file=sys.stderr):
+    """Tabela do tempo de carga por asset, do mais lento pro mais rápido."""
+    total = 0.0
+    print(f"{'asset':<28} {'decode ms':>10} {'convert ms':>11}  cache", file=file)
+    for nome, t in sorted(tempos.items(), key=lambda kv: -(kv[1]['decode'] + kv[1]['convert'])):
+        total += t['decode'] + t['convert']
+        print(f"{nome:<28} {t['decode'] * 1e3:>10.2f} {t['convert'] * 1e3:>11.2f}  {'hit' if t['cached'] else ''}", file=file)
+    print(f"{'(soma, sem paralelismo)':<28} {total * 1e3:>22.2f}", file=file)
+
+def nova_partida(fila, replay=None):
+    """
+    Começa uma partida. Sem replay: pega o próximo pacote pré-gerado e grava a entrada do teclado.
+    Com replay: refaz o mesmo pacote e devolve a entrada gravada.
+    Retorna (partida, entrada, gravação ou None); os níveis saem de partida.level(i).
+    """
+    if replay is None:
+        partida = fila.pop()
+        gravacao = Replay(seed=partida.seed, levels=len(partida))
+        entrada = RecordingInput(KeyboardInput(), gravacao)
+    else:
+        replay.check_settings()
+        partida = fila.prepare(replay.seed, replay.levels, replay.width, replay.height)
+        gravacao = None
+        entrada = ReplayInput(replay)
+    return partida, entrada, gravacao
+
+def salvar_gravacao(gravacao):
+    """Salva o replay da partida (se tiver algo gravado); erro de disco não derruba o jogo."""
+    if gravacao is None or not gravacao.runs:
+        return None
+    try:
+        return gravacao.save()
+    except OSError:
+        return None
 
 def main():
     import os
     if os.path.basename(os.getcwd()) == "src":
         os.chdir(os.path.dirname(os.getcwd()))
 
-    pygame.init()
+    parser = argparse.ArgumentParser(description=TITLE)
+    parser.add_argument("--replay", help="assiste um replay (.rpl) em vez de jogar")
+    parser.add_argument("--fast", action="store_true", help="replay sem limite de velocidade")
+    parser.add_argument("--timings", action="store_true", help="mostra o tempo de abertura e de carga de cada asset")
+    parser.add_argument("--seed", type=int, help="seed da sessão (mesma sequência de pacotes)")
+    parser.add_argument("--profile", metavar="ARQUIVO", help="mede cada fase do frame e salva p50/p95/p99 (.csv ou .json) ao sair")
+    parser.add_argument("--endless", action="store_true", help="modo sem fim: um nível só, gerado enquanto se corre (sem replay)")
+    args = parser.parse_args()
+    replay = Replay.load(args.replay) if args.replay else None
+    sem_fim = args.endless and replay is None
+    rapido = bool(replay and args.fast)
+
+    # só display e fonte: o mixer sobe no primeiro som (utils.LazySound)
+    inicio = [("imports", _T_IMPORTS - _T_INICIO)]
+    def marcar(nome, t0):
+        inicio.append((nome, time.perf_counter() - t0))
+
+    t0 = time.perf_counter()
+    pygame.display.init()
+    pygame.font.init()
+    marcar("display/font init", t0)
+    t0 = time.perf_counter()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption(TITLE)
+    marcar("set_mode", t0)
     clock = pygame.time.Clock()
-    font = pygame.font.SysFont(None, 28)
-    big = pygame.font.SysFont(None, 48)
-
-    pontuacao = load_score()
-    assets = load_assets()
-    level_pack = []
+    # fonte padrão embutida no pygame: SysFont varreria as fontes do sistema (fontconfig)
+    t0 = time.perf_counter()
+    font = pygame.font.Font(None, 28)
+    big = pygame.font.Font(None, 48)
+    marcar("fontes", t0)
+
+    # histórico de partidas (SQLite); a pontuação passa a morar lá também
+    t0 = time.perf_counter()
+    estatisticas = StatsStore()
+    pontuacao = use_backend(estatisticas.score_backend())
+    marcar("stats/pontuação", t0)
+
+    # assets e pré-geração de níveis só depois do menu aparecer (ou já, num replay)
+    assets = None
+    fila = None
+    def preparar():
+        nonlocal assets, fila
+        if assets is not None:
+            return
+        if args.timings:
+            inicio.append(("menu visível (total)", time.perf_counter() - _T_INICIO))
+            print_boot_timings(inicio)
+        assets = load_assets()
+        if args.timings:
+            print_load_timings(assets['load_timings'])
+        # pacotes e próximos níveis são gerados numa thread enquanto o jogador está no menu/jogando
+        # (no modo sem fim não há pacotes: o nível vai sendo gerado durante a corrida)
+        if not sem_fim:
+            fila = Pregenerator(assets, seed=args.seed)
+    partida = None
 
     state = STATE_MENU
     level_index = 0
     level = None
+    entrada = KeyboardInput()
+    gravacao = None
+    if replay is not None:
+        # replay pula o menu e começa direto
+        preparar()
+        partida, entrada, gravacao = nova_partida(fila, replay)
+        level = partida.level(0)
+        state = STATE_PLAYING
+    # telas paradas: criadas uma vez, desenham e esperam eventos (sem loop a 60 FPS)
+    telas = {
+        STATE_MENU: MenuScreen(font, big),
+        STATE_PAUSED: PausedScreen(font, big),
+        STATE_LOST: LostScreen(font, big),
+        STATE_VICTORY: VictoryScreen(font, big),
+    }
+    # F3 liga/desliga o overlay com o tempo de cada fase do frame
+    if args.profile:
+        profiler.enable()
+    overlay = profiler.Overlay(pygame.font.Font(None, 20))
+    mostrar_overlay = False
+    hud_chave = None
+    # tempo real ainda não simulado; consumido em passos de FIXED_DT durante o jogo
+    acumulador = 0.0
 
     rodando = True
     while rodando:
-        dt = clock.tick(FPS) / 1000.0
+        if state != STATE_PLAYING:
+            acao = telas[state].run(screen, ao_mostrar=preparar)
+            if acao == screens.QUIT:
+                rodando = False
+            elif acao == screens.START:
+                if sem_fim:
+                    from stream import StreamLevel
+                    partida, entrada, gravacao = None, KeyboardInput(), None
+                    level = StreamLevel(assets, seed=args.seed)
+                else:
+                    partida, entrada, gravacao = nova_partida(fila, replay)
+                    level = partida.level(0)
+                level_index = 0
+                acumulador = 0.0
+                state = STATE_PLAYING
+            elif acao == screens.RESUME:
+                state = STATE_PLAYING
+            elif acao == screens.MENU:
+                state = STATE_MENU
+            # o tempo parado na tela não conta como tempo de jogo
+            clock.tick()
+            continue
+
+        dt = clock.tick(0 if rapido else FPS) / 1000.0
+        inicio_frame = profiler.now()
 
         events = pygame.event.get()
         for event in events:
             if event.type == pygame.QUIT:
                 rodando = False
 
-        keys = pygame.key.get_pressed()
-
-        if state == STATE_MENU:
-            screen.fill((20, 25, 40))
-            draw_centered_text(screen, big, "Protótipo de Plataforma", HEIGHT // 2 - 100)
-
-            btn_jogar = Button((WIDTH // 2 - 100, HEIGHT // 2 - 20, 200, 50), "Começar", font)
-            btn_sair  = Button((WIDTH // 2 - 100, HEIGHT // 2 + 50, 200, 50), "Sair", font)
-
-            mouse_pos = pygame.mouse.get_pos()
-            btn_jogar.update_hover(mouse_pos)
-            btn_sair.update_hover(mouse_pos)
-
-            for e in events:
-                if e.type == pygame.KEYDOWN and e.key in (pygame.K_RETURN, pygame.K_SPACE):
-                    state = STATE_PLAYING
-                    level_pack = generate_level_pack(num_levels=3)
-                    level_index = 0
-                    level = Level(level_pack[level_index], assets)
-                if btn_jogar.was_clicked(e):
-                    state = STATE_PLAYING
-                    level_pack = generate_level_pack(num_levels=3)
-                    level_index = 0
-                    level = Level(level_pack[level_index], assets)
-                if btn_sair.was_clicked(e):
-                    rodando = False
-
-            btn_jogar.draw(screen)
-            btn_sair.draw(screen)
-            pygame.display.flip()
-            continue
+        # Eventos só do estado PLAYING
+        for e in events:
+            if e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE:
+                state = STATE_PAUSED
+                break
+            if e.type == pygame.KEYDOWN and e.key == pygame.K_F3:
+                mostrar_overlay = not mostrar_overlay
+                if mostrar_overlay and not profiler.enabled:
+                    profiler.enable()
+            # som de pulo ao apertar a tecla (Space/Up)
+            if e.type == pygame.KEYDOWN and e.key in (pygame.K_SPACE, pygame.K_UP) and getattr(level.player, 'on_ground', False):
+                try:
+                    sfx = assets.get('sfx', {})
+                    snd = sfx.get('jump')
+                    if snd: snd.play()
+                except Exception:
+                    pass
 
-        if state == STATE_PLAYING:
-            # Eventos só do estado PLAYING
-            for e in events:
-                if e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE:
-                    state = STATE_PAUSED
-                    break
-                # som de pulo ao apertar a tecla (Space/Up)
-                if e.type == pygame.KEYDOWN and e.key in (pygame.K_SPACE, pygame.K_UP) and getattr(level.player, 'on_ground', False):
-                    try:
-                        sfx = assets.get('sfx', {})
-                        snd = sfx.get('jump')
-                        if snd: snd.play()
-                    except Exception:
-                        pass
-
-            # Atualização do nível
-            level.update(dt, keys)
+        # Atualização do nível em passos fixos (física igual em qualquer FPS)
+        # (no --fast o replay roda passos à vontade por ~15 ms e só então desenha)
+        acumulador += min(dt, MAX_FRAME_TIME)
+        t = profiler.now()
+        limite = time.perf_counter() + 0.015
+        while state == STATE_PLAYING and (acumulador >= FIXED_DT or (rapido and time.perf_counter() < limite)):
+            acumulador = max(0.0, acumulador - FIXED_DT)
+            comando = entrada.poll(level)
+            if replay is not None and entrada.finished:
+                # gravação acabou antes de cair ou vencer (saiu no meio): encerra o replay
+                state = STATE_LOST
+                break
+            level.tick(comando)
             if level.lost:
-                pontuacao = subtract_points(3)
+                if partida is not None and replay is None:
+                    pontuacao = subtract_points(3)
+                    estatisticas.record(partida.run_id, partida.seed, level_index, None,
+                                        deaths=1, coins=level.coins_total - len(level.coins))
                 state = STATE_LOST
-            level.try_collect()
-
-            # Desenho
-            level.draw(screen)
-
-            restantes = len(level.coins)
-            txt = font.render(f"Nível {level_index + 1}/3  |  Moedas restantes: {restantes}", True, (20, 20, 20))
-            screen.blit(txt, (16, 12))
-
-            hud_score = font.render(f"Pontuação: {pontuacao}", True, (20, 20, 20))
-            screen.blit(hud_score, (WIDTH - hud_score.get_width() - 16, 12))
-
-            if restantes == 0 and level.at_exit():
+            elif level.collected_all() and level.at_exit():
                 # som da bandeira
                 try:
                     sfx = assets.get('sfx', {})
@@ -453,71 +694,58 @@ def main():
                     if snd: snd.play()
                 except Exception:
                     pass
-                pontuacao = add_points(1)
+                if replay is None:
+                    pontuacao = add_points(1)
+                    estatisticas.record(partida.run_id, partida.seed, level_index,
+                                        level.ticks * FIXED_DT, coins=level.coins_total)
                 level_index += 1
-                if level_index >= 3:
+                if level_index >= len(partida):
                     state = STATE_VICTORY
                 else:
-                    level = Level(level_pack[level_index], assets)
-
-            pygame.display.flip()
-            continue
-
-
-        if state == STATE_PAUSED:
-            screen.fill((0, 0, 0))
-            overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 140))
-            screen.blit(overlay, (0, 0))
-
-            draw_centered_text(screen, big, "Pausado", HEIGHT // 2 - 30)
-            draw_centered_text(screen, font, "ESC = Voltar  •  Q = Sair", HEIGHT // 2 + 20)
-            pygame.display.flip()
-
-            for e in events:
-                if e.type == pygame.KEYDOWN:
-                    if e.key == pygame.K_ESCAPE:
-                        state = STATE_PLAYING
-                    elif e.key == pygame.K_q:
-                        rodando = False
-            continue
-
-        if state == STATE_LOST:
-            screen.fill((20, 25, 40))
-            draw_centered_text(screen, big, "Você caiu!", HEIGHT // 2 - 100)
-            btn_tentar = Button((WIDTH // 2 - 120, HEIGHT // 2 - 10, 240, 50), "Recomeçar do Nível 1", font)
-            btn_sair  = Button((WIDTH // 2 - 120, HEIGHT // 2 + 60, 240, 50), "Sair", font)
-            mouse_pos = pygame.mouse.get_pos()
-            btn_tentar.update_hover(mouse_pos)
-            btn_sair.update_hover(mouse_pos)
-            btn_tentar.draw(screen)
-            btn_sair.draw(screen)
-            for e in events:
-                if btn_tentar.was_clicked(e) or (e.type == pygame.KEYDOWN and e.key in (pygame.K_RETURN, pygame.K_SPACE)):
-                    state = STATE_PLAYING
-                    level_pack = generate_level_pack(num_levels=3)
-                    level_index = 0
-                    level = Level(level_pack[level_index], assets)
-                if btn_sair.was_clicked(e) or (e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE):
-                    rodando = False
-            pygame.display.flip()
-            clock.tick(FPS)
-            continue
-
-        if state == STATE_VICTORY:
-            screen.fill((10, 10, 10))
-            draw_centered_text(screen, big, "Você Venceu!", HEIGHT // 2 - 20)
-            draw_centered_text(screen, font, "ENTER = Menu  •  ESC = Sair", HEIGHT // 2 + 30)
-            pygame.display.flip()
-
-            for e in events:
-                if e.type == pygame.KEYDOWN:
-                    if e.key == pygame.K_ESCAPE:
-                        rodando = False
-                    if e.key == pygame.K_RETURN:
-                        state = STATE_MENU
-            continue
-
+                    level = partida.level(level_index)
+        profiler.add("physics", t)
+
+        if state in (STATE_LOST, STATE_VICTORY):
+            # fim da partida (caiu ou venceu): guarda o replay e o histórico
+            salvar_gravacao(gravacao)
+            gravacao = None
+            estatisticas.flush()
+
+        # Desenho (interpolado entre os dois últimos passos)
+        level.draw(screen, min(acumulador / FIXED_DT, 1.0))
+
+        t = profiler.now()
+        # HUD: só renderiza texto quando nível, moedas ou pontuação mudam
+        if sem_fim:
+            chave = (level.distance(), level.coins_collected, pontuacao)
+        else:
+            chave = (level_index, len(level.coins), pontuacao)
+        if chave != hud_chave:
+            hud_chave = chave
+            if sem_fim:
+                txt = textcache.render(font, f"Distância: {chave[0]}  |  Moedas: {chave[1]}", (20, 20, 20))
+            else:
+                txt = textcache.render(font, f"Nível {level_index + 1}/{len(partida)}  |  Moedas restantes: {chave[1]}", (20, 20, 20))
+            hud_score = textcache.render(font, f"Pontuação: {pontuacao}", (20, 20, 20))
+        screen.blit(txt, (16, 12))
+        screen.blit(hud_score, (WIDTH - hud_score.get_width() - 16, 12))
+        profiler.add("hud", t)
+        if mostrar_overlay:
+            overlay.draw(screen)
+
+        t = profiler.now()
+        pygame.display.flip()
+        profiler.add("flip", t)
+        profiler.add("frame", inicio_frame)
+        profiler.end_frame()
+
+    salvar_gravacao(gravacao)
+    if args.profile:
+        profiler.dump(args.profile)
+    flush_score()
+    estatisticas.close()
+    if fila is not None:
+        fila.close()
     pygame.quit()
     sys.exit()
 
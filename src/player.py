@@ -5,7 +5,7 @@ from settings import GRAVITY, JUMP_VELOCITY, TILE_SIZE, PLAYER_SPEED
 class Player(pygame.sprite.Sprite):
     def __init__(self, pos, anims, sfx=None):
         super().__init__()
-        self.anims = anims  # dict with 'idle','run','jump','fall' lists
+        self.anims = anims  # AnimationSet with 'idle','run','jump','fall' strips
         self.anim_state = 'idle'
         self.anim_index = 0.0
         self.anim_speed = 10.0
@@ -22,6 +22,8 @@ class Player(pygame.sprite.Sprite):
         sprite_center_x = pos[0] + TILE_SIZE // 2
         self.rect.centerx = sprite_center_x
 
+        # Position at the start of the last physics tick, used for render interpolation
+        self.prev_pos = pygame.Vector2(self.rect.topleft)
         self.vel = pygame.Vector2(0, 0)
         self.on_ground = False
         self.facing = 1  # 1 right, -1 left
@@ -56,18 +58,20 @@ class Player(pygame.sprite.Sprite):
             self.anim_state = 'run' if abs(self.vel.x) > 0.1 else 'idle'
 
     def _animate(self, dt):
-        frames = self.anims[self.anim_state]
+        frames = self.anims.frames(self.anim_state, self.facing)
         self.anim_index += self.anim_speed * dt
         if self.anim_index >= len(frames):
             self.anim_index = 0.0
-        frame = frames[int(self.anim_index)]
-        if self.facing == -1:
-            frame = pygame.transform.flip(frame, True, False)
-        self.image = frame
+        self.image = frames[int(self.anim_index)]
+
+    @staticmethod
+    def _nearby(tiles, rect):
+        # TileGrid only hands back the cells around rect; plain lists are scanned whole
+        return tiles.near(rect) if hasattr(tiles, 'near') else tiles
 
     def horizontal_movement(self, tiles):
         self.rect.x += self.vel.x
-        for tile in tiles:
+        for tile in self._nearby(tiles, self.rect):
             if self.rect.colliderect(tile.rect):
                 if self.vel.x > 0:
                     self.rect.right = tile.rect.left
@@ -77,7 +81,7 @@ class Player(pygame.sprite.Sprite):
     def vertical_movement(self, tiles):
         self.rect.y += self.vel.y
         self.on_ground = False
-        for tile in tiles:
+        for tile in self._nearby(tiles, self.rect):
             if self.rect.colliderect(tile.rect):
                 if self.vel.y > 0:
                     self.rect.bottom = tile.rect.top
@@ -87,7 +91,12 @@ class Player(pygame.sprite.Sprite):
                     self.rect.top = tile.rect.bottom
                     self.vel.y = 0
 
+    def render_pos(self, alpha):
+        """Top-left of the collision rect blended between the last two ticks (alpha in 0..1)."""
+        return self.prev_pos.lerp(self.rect.topleft, alpha)
+
     def update(self, dt, tiles, keys):
+        self.prev_pos.update(self.rect.topleft)
         self.handle_input(keys)
         self.apply_gravity()
         self.horizontal_movement(tiles)
@@ -0,0 +1,77 @@
+"""
+Background level pre-generation: packs and Levels are built before they are needed.
+
+A single worker thread keeps PREGEN_PACKS packs ready (layouts generated and the
+first Level built). Popping one starts a run and immediately queues the build of
+that run's later levels, so starting, retrying and advancing only wait on work
+that is normally already finished.
+
+Pack seeds come from one random.Random(seed) in pop order, so a session seed
+gives the same sequence of packs, and every run still records its own pack seed
+for replays.
+"""
+import random
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from settings import PREGEN_PACKS
+from level import Level
+
+
+class PreparedRun:
+    """One pack being played: its seed, layouts and (future) Level objects."""
+    def __init__(self, seed, pack, levels):
+        self.seed = seed
+        self.run_id = random.getrandbits(62)  # identifies this attempt in the stats database
+        self.pack = pack
+        self._levels = levels  # one Future per layout
+
+    def __len__(self):
+        return len(self.pack)
+
+    def level(self, index):
+        """Level for pack[index]; blocks only if the worker hasn't finished it yet."""
+        return self._levels[index].result()
+
+
+class Pregenerator:
+    def __init__(self, assets, seed=None, packs=PREGEN_PACKS, levels=3, width=42, height=11):
+        from main import generate_level_pack
+        self._generate = generate_level_pack
+        self.assets = assets
+        self.levels = levels
+        self.width = width
+        self.height = height
+        self.rnd = random.Random(seed)
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pregen")
+        self._ready = deque(self._submit_pack() for _ in range(max(1, packs)))
+
+    def _submit_pack(self):
+        seed = self.rnd.randrange(2 ** 31)
+        return seed, self._pool.submit(self._build_pack, seed, self.levels, self.width, self.height)
+
+    def _build_pack(self, seed, levels, width, height):
+        pack = self._generate(levels, width, height, seed=seed)
+        return pack, Level(pack[0], self.assets)
+
+    def _start(self, seed, pack, first):
+        # The rest of this pack goes ahead of any refill, so the next level is always built first
+        later = [self._pool.submit(Level, layout, self.assets) for layout in pack[1:]]
+        done = Future()
+        done.set_result(first)
+        return PreparedRun(seed, pack, [done] + later)
+
+    def pop(self):
+        """Next pre-generated run; the queue is refilled in the background."""
+        seed, future = self._ready.popleft()
+        pack, first = future.result()
+        run = self._start(seed, pack, first)
+        self._ready.append(self._submit_pack())
+        return run
+
+    def prepare(self, seed, levels, width, height):
+        """A specific pack (e.g. from a replay): built now, later levels in the background."""
+        pack, first = self._build_pack(seed, levels, width, height)
+        return self._start(seed, pack, first)
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
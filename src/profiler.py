@@ -0,0 +1,131 @@
+"""
+Per-phase frame timers with rolling percentiles.
+
+Code marks a phase with
+
+    t = profiler.now()
+    ...work...
+    profiler.add("tiles", t)
+
+and the main loop calls end_frame() once per rendered frame. Time added to a
+phase during one frame is summed (several physics ticks per frame count as one
+'physics' sample), then pushed into a rolling window of the last WINDOW frames.
+percentiles() reports p50/p95/p99 per phase; dump() writes them as CSV or JSON.
+
+While disabled, add() and end_frame() return immediately, so the calls can stay
+in the hot paths.
+"""
+import json
+import time
+from collections import deque
+import pygame
+
+WINDOW = 600  # frames kept per phase (10 s at 60 FPS)
+
+# Display order; phases not listed here are shown after these
+PHASES = ("frame", "physics", "collision", "parallax", "tiles", "sprites", "hud", "flip")
+
+now = time.perf_counter
+
+enabled = False
+_current = {}
+_windows = {}
+_frames = 0
+
+
+def enable(on=True):
+    global enabled
+    enabled = on
+    _current.clear()
+
+
+def add(phase, start):
+    """Charge the time since start (a now() value) to phase for this frame."""
+    if enabled:
+        _current[phase] = _current.get(phase, 0.0) + (now() - start)
+
+
+def end_frame():
+    global _frames
+    if not enabled:
+        return
+    for phase, seconds in _current.items():
+        window = _windows.get(phase)
+        if window is None:
+            window = _windows[phase] = deque(maxlen=WINDOW)
+        window.append(seconds)
+    _current.clear()
+    _frames += 1
+
+
+def _ordered():
+    return sorted(_windows, key=lambda p: (PHASES.index(p) if p in PHASES else len(PHASES), p))
+
+
+def percentiles(qs=(50, 95, 99)):
+    """{phase: {'p50': ms, ..., 'samples': n}} over the rolling window, in display order."""
+    out = {}
+    for phase in _ordered():
+        samples = sorted(_windows[phase])
+        n = len(samples)
+        if not n:
+            continue
+        row = {f"p{q}": samples[min(n - 1, int(n * q / 100))] * 1e3 for q in qs}
+        row['samples'] = n
+        out[phase] = row
+    return out
+
+
+def reset():
+    global _frames
+    _current.clear()
+    _windows.clear()
+    _frames = 0
+
+
+def dump(path):
+    """Write the current percentiles to path; .json gives JSON, anything else CSV."""
+    stats = percentiles()
+    path = str(path)
+    with open(path, "w", encoding="utf-8") as f:
+        if path.endswith(".json"):
+            json.dump({'frames': _frames, 'window': WINDOW, 'phases_ms': stats}, f, indent=2)
+        else:
+            f.write("phase,p50_ms,p95_ms,p99_ms,samples\n")
+            for phase, row in stats.items():
+                f.write(f"{phase},{row['p50']:.4f},{row['p95']:.4f},{row['p99']:.4f},{row['samples']}\n")
+
+
+class Overlay:
+    """On-screen table of the percentiles; re-rendered a few times per second, not every frame."""
+    REFRESH = 0.25
+
+    def __init__(self, font):
+        self.font = font
+        self.surface = None
+        self._next = 0.0
+
+    def draw(self, surf, pos=(16, 40)):
+        t = now()
+        if self.surface is None or t >= self._next:
+            self._next = t + self.REFRESH
+            self.surface = self._render()
+        surf.blit(self.surface, pos)
+
+    def _render(self):
+        rows = [("ms", "p50", "p95", "p99")]
+        for phase, row in percentiles().items():
+            rows.append((phase, f"{row['p50']:.2f}", f"{row['p95']:.2f}", f"{row['p99']:.2f}"))
+        # Proportional font: name column left-aligned, numbers right-aligned in fixed columns
+        cells = [[self.font.render(text, True, (230, 255, 230)) for text in row] for row in rows]
+        name_w = max(r[0].get_width() for r in cells) + 12
+        num_w = max(c.get_width() for r in cells for c in r[1:]) + 12
+        line_h = self.font.get_linesize()
+        box = pygame.Surface((name_w + 3 * num_w + 16, line_h * len(cells) + 12), pygame.SRCALPHA)
+        box.fill((0, 0, 0, 170))
+        for i, row in enumerate(cells):
+            y = 6 + i * line_h
+            box.blit(row[0], (8, y))
+            for j, cell in enumerate(row[1:], 1):
+                box.blit(cell, (8 + name_w + j * num_w - cell.get_width(), y))
+        return box
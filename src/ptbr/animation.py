@@ -0,0 +1,25 @@
+
+import textures
+
+
+class AnimationSet:
+    """Animações por nome com frames pra direita e pra esquerda (espelhados uma vez só, no load)."""
+    def __init__(self, strips):
+        self.right = {name: list(frames) for name, frames in strips.items()}
+        self.left = {
+            name: [textures.scaled(f, f.get_size(), flip_x=True) for f in frames]
+            for name, frames in self.right.items()
+        }
+
+    def frames(self, name, facing=1):
+        """Frames de uma animação; facing 1 = direita, -1 = esquerda."""
+        return self.left[name] if facing == -1 else self.right[name]
+
+    def __getitem__(self, name):
+        return self.right[name]
+
+    def __contains__(self, name):
+        return name in self.right
+
+    def keys(self):
+        return self.right.keys()
@@ -0,0 +1,65 @@
+
+from collections import OrderedDict
+import pygame
+from settings import CHUNK_TILES, CHUNK_CACHE_SIZE
+
+
+class StaticTileLayer:
+    """Tiles sólidos pré-renderizados em blocos; só desenha os blocos que a câmera vê."""
+    def __init__(self, grid, chunk_tiles=CHUNK_TILES, max_cached=CHUNK_CACHE_SIZE):
+        self.grid = grid
+        self.chunk_tiles = chunk_tiles
+        self.chunk_px = chunk_tiles * grid.cell_size
+        self.chunks_x = -(-grid.cols // chunk_tiles)
+        self.chunks_y = -(-grid.rows // chunk_tiles)
+        self.max_cached = max_cached
+        self._baked = OrderedDict()  # (cx, cy) -> Surface, ou None se o bloco for vazio
+
+    def _bake(self, cx, cy):
+        grid = self.grid
+        cs = grid.cell_size
+        c0, r0 = cx * self.chunk_tiles, cy * self.chunk_tiles
+        c1 = min(grid.cols, c0 + self.chunk_tiles)
+        r1 = min(grid.rows, r0 + self.chunk_tiles)
+        surf = None
+        for r in range(r0, r1):
+            row = grid.cells[r]
+            for c in range(c0, c1):
+                tile = row[c]
+                if tile is None:
+                    continue
+                if surf is None:
+                    surf = pygame.Surface(((c1 - c0) * cs, (r1 - r0) * cs), pygame.SRCALPHA)
+                surf.blit(tile.image, ((c - c0) * cs, (r - r0) * cs))
+        if surf is not None:
+            # RLE pula as áreas transparentes do bloco no blit
+            surf.set_alpha(255, pygame.RLEACCEL)
+        return surf
+
+    def chunk(self, cx, cy):
+        key = (cx, cy)
+        if key in self._baked:
+            self._baked.move_to_end(key)
+            return self._baked[key]
+        surf = self._bake(cx, cy)
+        self._baked[key] = surf
+        if len(self._baked) > self.max_cached:
+            self._baked.popitem(last=False)
+        return surf
+
+    def invalidate(self, row, col):
+        """Descarta o bloco da célula (row, col); ele é refeito no próximo draw."""
+        self._baked.pop((col // self.chunk_tiles, row // self.chunk_tiles), None)
+
+    def draw(self, surf, camera):
+        size = self.chunk_px
+        view_w, view_h = surf.get_size()
+        cx0 = max(0, int(camera.x) // size)
+        cx1 = min(self.chunks_x - 1, int(camera.x + view_w) // size)
+        cy0 = max(0, int(camera.y) // size)
+        cy1 = min(self.chunks_y - 1, int(camera.y + view_h) // size)
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                img = self.chunk(cx, cy)
+                if img is not None:
+                    surf.blit(img, (cx * size - camera.x, cy * size - camera.y))
@@ -1,16 +1,11 @@
 import pygame
+import textures
 
 class Coin(pygame.sprite.Sprite):
     def __init__(self, pos, image, size):
         super().__init__()
-        # spritesheet horizontal de moeda (frames quadrados)
-        self.frames = []
-        sheet = image
-        sheet_w, sheet_h = sheet.get_size()
-        frame_w = sheet_h
-        for x in range(0, sheet_w, frame_w):
-            frame = sheet.subsurface(pygame.Rect(x, 0, frame_w, frame_w))
-            self.frames.append(pygame.transform.scale(frame, (size, size)))
+        # spritesheet horizontal de moeda (frames quadrados, cortados uma vez e compartilhados)
+        self.frames = textures.sheet_frames(image, size)
 
         self.index = 0
         self.image = self.frames[0]
@@ -1,9 +1,15 @@
 import pygame
 from tile import Tile
+from spatial import TileGrid, SpatialHash
+from chunks import StaticTileLayer
 from coin import Coin
 from player import Player
 from background import ParallaxBackground
-from settings import TILE_SIZE, KILL_PLANE_Y, WIDTH, HEIGHT, CAMERA_MARGIN_X, CAMERA_MARGIN_Y
+from settings import (TILE_SIZE, KILL_PLANE_Y, WIDTH, HEIGHT, CAMERA_MARGIN_X, CAMERA_MARGIN_Y,
+                      SKIP_OFFSCREEN_COIN_ANIMATION)
+
+# moedas/bandeiras ficam em células de 4x4 tiles (culling e coleta)
+SPRITE_CELL = TILE_SIZE * 4
 
 class Level:
     lost: bool = False
@@ -16,6 +22,10 @@ class Level:
         self.tiles = pygame.sprite.Group()
         self.coins = pygame.sprite.Group()
         self.flags = pygame.sprite.Group()
+        self.grid = TileGrid(0, 0, TILE_SIZE)
+        self.tile_layer = None
+        self.coin_cells = SpatialHash(SPRITE_CELL)
+        self.flag_cells = SpatialHash(SPRITE_CELL)
         self.player = None
         self.spawn = (64, 64)
 
@@ -26,11 +36,14 @@ class Level:
         self.tiles.empty()
         self.coins.empty()
         self.flags.empty()
+        self.coin_cells = SpatialHash(SPRITE_CELL)
+        self.flag_cells = SpatialHash(SPRITE_CELL)
         self.player = None
 
         grid = self.layout
         rows = len(grid)
         cols = len(grid[0]) if rows else 0
+        self.grid = TileGrid(rows, cols, TILE_SIZE)
 
         def in_bounds(r, c):
             return 0 <= r < rows and 0 <= c < cols
@@ -71,21 +84,29 @@ class Level:
                     if img is None:
                         img = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
                         img.fill((100, 200, 100))
-                    self.tiles.add(Tile((x, y), img, TILE_SIZE))
+                    tile = Tile((x, y), img, TILE_SIZE)
+                    self.tiles.add(tile)
+                    self.grid.add(r, c, tile)
 
                 elif ch == 'B':
                     if box_img is None:
                         box_img = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
                         pygame.draw.rect(box_img, (180, 140, 80), (4, 4, TILE_SIZE - 8, TILE_SIZE - 8), 0, border_radius=6)
                         pygame.draw.rect(box_img, (100, 70, 40), (4, 4, TILE_SIZE - 8, TILE_SIZE - 8), 2, border_radius=6)
-                    self.tiles.add(Tile((x, y), box_img, TILE_SIZE))
+                    tile = Tile((x, y), box_img, TILE_SIZE)
+                    self.tiles.add(tile)
+                    self.grid.add(r, c, tile)
 
                 elif ch == 'C':
                     coin_img = self.assets['coin_image']
-                    self.coins.add(Coin((x + TILE_SIZE // 2, y + TILE_SIZE // 2), coin_img, TILE_SIZE))
+                    coin = Coin((x + TILE_SIZE // 2, y + TILE_SIZE // 2), coin_img, TILE_SIZE)
+                    self.coins.add(coin)
+                    self.coin_cells.add(coin)
 
                 elif ch == 'E':
-                    self.flags.add(Tile((x, y - TILE_SIZE // 2), self.assets['flag'], TILE_SIZE))
+                    flag = Tile((x, y - TILE_SIZE // 2), self.assets['flag'], TILE_SIZE)
+                    self.flags.add(flag)
+                    self.flag_cells.add(flag)
 
                 elif ch == 'P':
                     self.spawn = (x, y)
@@ -95,6 +116,8 @@ class Level:
         if self.player is None:
             self.player = Player(self.spawn, self.assets['player_anims'])
 
+        self.tile_layer = StaticTileLayer(self.grid)
+
     def respawn(self):
         """Volta o player pro spawn."""
         self.lost = False
@@ -104,8 +127,12 @@ class Level:
                 self.player.vel.update(0, 0)
 
     def update(self, dt, keys):
-        self.player.update(dt, self.tiles.sprites(), keys)
-        self.coins.update(dt)
+        self.player.update(dt, self.grid, keys)
+        if SKIP_OFFSCREEN_COIN_ANIMATION:
+            for coin in self.coin_cells.query(self.view_rect((WIDTH, HEIGHT))):
+                coin.update(dt)
+        else:
+            self.coins.update(dt)
 
         # câmera com margem
         px = self.player.rect.centerx
@@ -127,17 +154,21 @@ class Level:
         if self.player.rect.top > KILL_PLANE_Y:
             self.lost = True
 
+    def view_rect(self, size):
+        """Retângulo do mundo que a câmera está vendo."""
+        return pygame.Rect(int(self.camera.x), int(self.camera.y), size[0], size[1])
+
     def draw(self, surf):
         if hasattr(self, "parallax") and self.parallax:
             self.parallax.draw(surf, self.camera.x)
         else:
             surf.fill((25, 30, 45))
 
-        for t in self.tiles:
-            surf.blit(t.image, (t.rect.x - self.camera.x, t.rect.y - self.camera.y))
-        for coin in self.coins:
+        self.tile_layer.draw(surf, self.camera)
+        view = self.view_rect(surf.get_size())
+        for coin in self.coin_cells.query(view):
             surf.blit(coin.image, (coin.rect.x - self.camera.x, coin.rect.y - self.camera.y))
-        for f in self.flags:
+        for f in self.flag_cells.query(view):
             surf.blit(f.image, (f.rect.x - self.camera.x, f.rect.y - self.camera.y))
 
         sprite_x = self.player.rect.centerx - TILE_SIZE // 2
@@ -148,10 +179,9 @@ class Level:
         return len(self.coins) == 0
 
     def at_exit(self):
-        for flag in self.flags:
-            if self.player.rect.colliderect(flag.rect):
-                return True
-        return False
+        return bool(self.flag_cells.colliding(self.player.rect))
 
     def try_collect(self):
-        pygame.sprite.spritecollide(self.player, self.coins, dokill=True)
+        for coin in self.coin_cells.colliding(self.player.rect):
+            coin.kill()
+            self.coin_cells.remove(coin)
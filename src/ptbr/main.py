@@ -4,6 +4,8 @@ import random
 from settings import WIDTH, HEIGHT, TITLE, FPS, TILE_SIZE
 from utils import load_spritesheet
 from level import Level
+import textures
+from animation import AnimationSet
 
 from score import load_score, add_points, subtract_points
 
@@ -267,7 +269,8 @@ def load_assets():
         'fall': load_spritesheet(str(ap("player", "Fall.png")), 32, 32),
     }
     for k, frames in assets['player_anims'].items():
-        assets['player_anims'][k] = [pygame.transform.scale(f, (TILE_SIZE, TILE_SIZE)) for f in frames]
+        assets['player_anims'][k] = [textures.scaled(f, (TILE_SIZE, TILE_SIZE)) for f in frames]
+    assets['player_anims'] = AnimationSet(assets['player_anims'])
 
     # tiles
     def _load_img(p):
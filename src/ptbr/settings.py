@@ -17,6 +17,11 @@ KILL_PLANE_Y = HEIGHT + 200
 # velocidade horizontal do player
 PLAYER_SPEED = 5
 
+# terreno pré-renderizado em blocos de CHUNK_TILES x CHUNK_TILES tiles (ver chunks.py)
+CHUNK_TILES = 16
+CHUNK_CACHE_SIZE = 16  # máximo de blocos prontos guardados
+SKIP_OFFSCREEN_COIN_ANIMATION = True  # não anima moedas fora da câmera
+
 # níveis de exemplo (não usados quando gera procedural)
 LEVELS = [
     [
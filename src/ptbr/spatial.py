@@ -0,0 +1,88 @@
+
+class TileGrid:
+    """Índice de colisão em grade: cada célula do layout guarda no máximo um tile sólido."""
+    def __init__(self, rows, cols, cell_size):
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = cell_size
+        self.cells = [[None] * cols for _ in range(rows)]
+
+    def add(self, row, col, tile):
+        self.cells[row][col] = tile
+
+    def remove(self, row, col):
+        self.cells[row][col] = None
+
+    def get(self, row, col):
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return self.cells[row][col]
+        return None
+
+    def query(self, rect, margin=0):
+        """Tiles das células que encostam no rect (com margem em px), em ordem de linha."""
+        cs = self.cell_size
+        c0 = max(0, (rect.left - margin) // cs)
+        c1 = min(self.cols - 1, (rect.right - 1 + margin) // cs)
+        r0 = max(0, (rect.top - margin) // cs)
+        r1 = min(self.rows - 1, (rect.bottom - 1 + margin) // cs)
+        found = []
+        for r in range(r0, r1 + 1):
+            row = self.cells[r]
+            for c in range(c0, c1 + 1):
+                tile = row[c]
+                if tile is not None:
+                    found.append(tile)
+        return found
+
+    def near(self, rect):
+        """Tiles que podem encostar no rect numa passada de colisão (uma célula de folga pro empurrão)."""
+        return self.query(rect, self.cell_size)
+
+    def __iter__(self):
+        for row in self.cells:
+            for tile in row:
+                if tile is not None:
+                    yield tile
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class SpatialHash:
+    """Agrupa sprites por célula (cell_x, cell_y) pra culling da câmera e coleta de moedas/bandeiras."""
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.buckets = {}
+
+    def _cells(self, rect):
+        cs = self.cell_size
+        for cy in range(rect.top // cs, (rect.bottom - 1) // cs + 1):
+            for cx in range(rect.left // cs, (rect.right - 1) // cs + 1):
+                yield cx, cy
+
+    def add(self, sprite):
+        for key in self._cells(sprite.rect):
+            self.buckets.setdefault(key, []).append(sprite)
+
+    def remove(self, sprite):
+        for key in self._cells(sprite.rect):
+            bucket = self.buckets.get(key)
+            if bucket and sprite in bucket:
+                bucket.remove(sprite)
+                if not bucket:
+                    del self.buckets[key]
+
+    def query(self, rect):
+        """Sprites das células que o rect cobre (sem repetir; pode vir algum que nem encosta)."""
+        found = {}
+        buckets = self.buckets
+        for key in self._cells(rect):
+            bucket = buckets.get(key)
+            if bucket:
+                for sprite in bucket:
+                    found[sprite] = None
+        return list(found)
+
+    def colliding(self, rect):
+        """Sprites que realmente encostam no rect."""
+        return [s for s in self.query(rect) if rect.colliderect(s.rect)]
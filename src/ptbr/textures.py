@@ -0,0 +1,76 @@
+
+import pygame
+
+# cache global de superfícies escaladas/espelhadas, chave (imagem, tamanho, flip_x, flip_y)
+# tile, moeda, bandeira e frames do player usam daqui: uma cópia por imagem distinta
+_cache = {}
+_sheets = {}
+_hits = 0
+_misses = 0
+
+
+def scaled(image, size, flip_x=False, flip_y=False):
+    """Imagem escalada pro tamanho (e espelhada se pedir), compartilhada."""
+    global _hits, _misses
+    size = (int(size[0]), int(size[1]))
+    if not (flip_x or flip_y) and image.get_size() == size:
+        # já no tamanho certo: usa a própria imagem, sem entrada no cache
+        _hits += 1
+        return image
+    key = (image, size, flip_x, flip_y)
+    surf = _cache.get(key)
+    if surf is not None:
+        _hits += 1
+        return surf
+    _misses += 1
+    surf = image if image.get_size() == size else pygame.transform.scale(image, size)
+    if flip_x or flip_y:
+        surf = pygame.transform.flip(surf, flip_x, flip_y)
+    _cache[key] = surf
+    return surf
+
+
+def sheet_frames(sheet, size):
+    """Corta spritesheet horizontal de frames quadrados e escala cada um pra (size, size)."""
+    global _hits, _misses
+    key = (sheet, size)
+    frames = _sheets.get(key)
+    if frames is not None:
+        _hits += 1
+        return frames
+    _misses += 1
+    sheet_w, sheet_h = sheet.get_size()
+    frame_w = sheet_h
+    frames = [
+        scaled(sheet.subsurface(pygame.Rect(x, 0, frame_w, frame_w)), (size, size))
+        for x in range(0, sheet_w, frame_w)
+    ]
+    _sheets[key] = frames
+    return frames
+
+
+def stats():
+    """Contadores do cache e memória de pixels das superfícies guardadas."""
+    seen = set()
+    nbytes = 0
+    for surf in _cache.values():
+        if id(surf) in seen:
+            continue
+        seen.add(id(surf))
+        w, h = surf.get_size()
+        nbytes += w * h * surf.get_bytesize()
+    lookups = _hits + _misses
+    return {
+        'hits': _hits,
+        'misses': _misses,
+        'hit_rate': _hits / lookups if lookups else 0.0,
+        'surfaces': len(seen),
+        'bytes': nbytes,
+    }
+
+
+def clear():
+    global _hits, _misses
+    _cache.clear()
+    _sheets.clear()
+    _hits = _misses = 0
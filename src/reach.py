@@ -0,0 +1,438 @@
+"""
+Jump reach table: which solid tiles a player standing on one tile can land on.
+
+    python src/reach.py show             # print the table (loaded from the cache or built)
+    python src/reach.py show --rebuild   # build it again and overwrite the cache entry
+
+can_reach(dx, dy) answers "standing on the tile at (c, r), can I land on the tile
+at (c + dx, r + dy)?" (dy < 0 is up) with one jump or by walking off the edge,
+in open air: nothing else in the way. It is a set lookup.
+
+The table is not derived from formulas. It comes from a breadth-first search
+over every state of the real physics (batch.BatchSim, which matches Player tick
+for tick): every standing position on the source tile, every input each tick,
+the 60%-wide hitbox, the fall speed clamp and pygame's rounding included. All
+(dx, dy) targets are searched at once, each in its own band of a scratch
+layout that holds just the source and the target tile.
+
+The search also keeps one witness Path per target and start residue (standing
+x mod PLAYER_SPEED: walking only moves in steps of PLAYER_SPEED, so it decides
+which pixels a player can start from), and one per flag cell the player can
+touch from the source tile. A Path holds the inputs, the cells the hitbox
+sweeps (its footprint) and the cells it overlaps after each tick; validate.py
+replays them against real layouts.
+
+Building takes a few seconds, so the result is kept in asset_cache/ (as JSON,
+reach-<key>.json) under a key made of the physics settings hash, the hitbox
+size and the fall clamp. Changing any of those just misses and builds a new
+entry, which replaces the old one.
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+from settings import TILE_SIZE, GRAVITY, JUMP_VELOCITY, PLAYER_SPEED, KILL_PLANE_Y
+from batch import BatchSim, PLAYER_W, PLAYER_H, MAX_FALL
+from inputs import LEFT, RIGHT, JUMP
+from replay import settings_hash
+from assetcache import CACHE_DIR
+
+VERSION = 2
+
+# Deepest drop in the table, in rows; deeper targets report unreachable
+MAX_DROP = 9
+
+_AIR_INPUTS = (0, LEFT, RIGHT)
+_GROUND_INPUTS = (0, LEFT, RIGHT, JUMP, JUMP | LEFT, JUMP | RIGHT)
+
+
+class Path:
+    """
+    One input sequence from standing on a source tile, in tile-relative units:
+    start/end are hitbox x offsets from the source tile's left edge, cells are
+    (dx, dy) tile offsets from the source tile.
+
+    footprint  cells the hitbox overlaps at any point (before and after each
+               vertical move), minus the source and target tiles; if they are
+               all empty the player moves exactly as in open air
+    touched    cells overlapped after some tick: coins picked up on the way
+    """
+    __slots__ = ("start", "end", "inputs", "footprint", "touched")
+
+    def __init__(self, start, end, inputs, footprint, touched):
+        self.start = start
+        self.end = end
+        self.inputs = inputs
+        self.footprint = footprint
+        self.touched = touched
+
+    def mirrored(self):
+        """The same path flipped left to right (the physics is symmetric)."""
+        def flip(cells):
+            return tuple((-dx, dy) for dx, dy in cells)
+        swap = {0: 0, LEFT: RIGHT, RIGHT: LEFT}
+        inputs = tuple(swap[m & (LEFT | RIGHT)] | (m & JUMP) for m in self.inputs)
+        span = TILE_SIZE - PLAYER_W
+        return Path(span - self.start, span - self.end, inputs, flip(self.footprint), flip(self.touched))
+
+    def to_list(self):
+        return [self.start, self.end, "".join(map(str, self.inputs)),
+                [v for cell in self.footprint for v in cell], [v for cell in self.touched for v in cell]]
+
+    @classmethod
+    def from_list(cls, data):
+        start, end, inputs, footprint, touched = data
+        return cls(start, end, tuple(map(int, inputs)),
+                   tuple(zip(footprint[::2], footprint[1::2])), tuple(zip(touched[::2], touched[1::2])))
+
+
+class ReachTable:
+    """
+    Reachable (dx, dy) tile offsets; the physics is mirror-symmetric, so dx is stored as |dx|.
+
+    landings[(dx, dy, k)]  a Path landing on the tile at (dx, dy) from a start x with x % PLAYER_SPEED == k
+    exits[(dx, dy, k)]     a Path whose hitbox touches an exit flag placed in the cell at (dx, dy)
+    """
+    def __init__(self, up, down, width, cells, landings=None, exits=None):
+        self.up = up
+        self.down = down
+        self.width = width
+        self._cells = frozenset(cells)
+        self.landings = dict(landings or {})
+        self.exits = dict(exits or {})
+        for (dx, dy, k), path in list(self.landings.items()):
+            flip = path.mirrored()
+            self.landings.setdefault((-dx, dy, flip.start % PLAYER_SPEED), flip)
+
+    def can_reach(self, dx, dy):
+        return (abs(dx), dy) in self._cells
+
+    def max_rise(self, dx=None):
+        """Most rows up that can be landed on, at column offset dx or at any offset."""
+        return max((-dy for cdx, dy in self._cells if dx is None or cdx == abs(dx)), default=0)
+
+    def max_gap(self, dy=0):
+        """Widest run of empty columns that can be jumped across to a tile dy rows down."""
+        gaps = [dx - 1 for dx in range(1, self.width) if (dx, dy) in self._cells]
+        return max(gaps, default=0)
+
+    def rows(self):
+        """One string per dy, top (most up) first: '#' where reachable, dx from 0 to the right."""
+        return [
+            "".join('#' if (dx, dy) in self._cells else '.' for dx in range(self.width))
+            for dy in range(-self.up, self.down + 1)
+        ]
+
+    def to_json(self):
+        # Only the right-facing landings are stored; the left ones are their mirror images
+        return json.dumps({
+            "version": VERSION, "up": self.up, "down": self.down, "width": self.width,
+            "cells": sorted(self._cells),
+            "landings": [[dx, dy, k] + p.to_list() for (dx, dy, k), p in self.landings.items() if dx >= 0],
+            "exits": [[dx, dy, k] + p.to_list() for (dx, dy, k), p in self.exits.items()],
+        }, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text):
+        try:
+            data = json.loads(text)
+            if data.get("version") != VERSION:
+                return None
+            return cls(data["up"], data["down"], data["width"], map(tuple, data["cells"]),
+                       {tuple(e[:3]): Path.from_list(e[3:]) for e in data["landings"]},
+                       {tuple(e[:3]): Path.from_list(e[3:]) for e in data["exits"]})
+        except (ValueError, KeyError, TypeError):
+            return None
+
+
+def _flight():
+    """Free-flight (bottom offset, ticks) samples of a jump, used only to size and prune the search."""
+    vy, pos, ticks = float(JUMP_VELOCITY), 0.0, 0
+    peak = 0.0
+    while pos <= MAX_DROP * TILE_SIZE:
+        vy = min(vy + GRAVITY, float(MAX_FALL))
+        pos += vy
+        peak = min(peak, pos)
+        ticks += 1
+    return -peak, ticks
+
+
+def _cells(x, y):
+    """Tile cells a hitbox at (x, y) overlaps, in tile-relative coordinates."""
+    cs = TILE_SIZE
+    return [(c, r) for r in range(y // cs, (y + PLAYER_H - 1) // cs + 1)
+            for c in range(x // cs, (x + PLAYER_W - 1) // cs + 1)]
+
+
+def _path(steps, inputs, skip):
+    """Path from tile-relative hitbox positions (start first, one per tick after it)."""
+    footprint = set(_cells(*steps[0]))
+    touched = set()
+    for (_, y0), (x1, y1) in zip(steps, steps[1:]):
+        footprint.update(_cells(x1, y0))
+        after = _cells(x1, y1)
+        footprint.update(after)
+        touched.update(after)
+    footprint.difference_update(skip)
+    return Path(steps[0][0], steps[-1][0], tuple(inputs), tuple(sorted(footprint)), tuple(sorted(touched)))
+
+
+def build():
+    """Search every target offset at once; returns a ReachTable."""
+    import numpy as np
+
+    cs = TILE_SIZE
+    peak, ticks = _flight()
+    up = int(peak // cs) + 1
+    down = MAX_DROP
+    width = (ticks * PLAYER_SPEED + cs + PLAYER_W) // cs + 1
+    if (up + down + 1) * cs > KILL_PLANE_Y:
+        raise ValueError("reach table taller than the kill plane; lower MAX_DROP")
+
+    # One band per target: the source tile at column pad, the target dx columns right
+    # of it and dy rows below. Bands are wide enough that nothing crosses between them.
+    # (0, 0) is a jump landing back on the source tile. After them comes one wider
+    # band with only the source tile, where the flags the player can touch are recorded.
+    targets = [(dx, dy) for dy in range(-up, down + 1) for dx in range(width)]
+    n = len(targets)
+    pad = 1
+    band_w = width + 2 * pad + 1
+    reach_x = width + 2  # flag band: source tile this many columns from either side
+    src_row = up
+    src_top = src_row * cs
+    grid = [['.'] * (band_w * n + 2 * reach_x + 1) for _ in range(up + down + 1)]
+    for b, (dx, dy) in enumerate(targets):
+        grid[src_row][b * band_w + pad] = 'X'
+        grid[src_row + dy][b * band_w + pad + dx] = 'X'
+    grid[src_row][n * band_w + reach_x] = 'X'
+    sim = BatchSim(["".join(row) for row in grid], 1)
+
+    home = targets.index((0, 0))
+    flags = n  # band index of the flag band
+    src_left = np.append(np.arange(n) * band_w + pad, n * band_w + reach_x) * cs
+    tgt_left = src_left + np.array([dx for dx, _ in targets] + [0]) * cs
+    tgt_top = src_top + np.array([dy for _, dy in targets] + [0]) * cs
+    # Further out than a tile past either block there is nothing to go around
+    lo = src_left - cs
+    hi = np.maximum(src_left, tgt_left) + 2 * cs
+    lo[flags] = src_left[flags] - (reach_x - 1) * cs
+    hi[flags] = src_left[flags] + reach_x * cs
+    reached = np.zeros((n, PLAYER_SPEED), dtype=bool)
+    found = {}  # (band, k) -> (depth, parent, input, x, y)
+    touches = {}  # (dx, dy, k) -> (depth, index)
+
+    # Start: standing on the source tile at every pixel where the hitbox still overlaps it
+    offsets = np.arange(1 - PLAYER_W, cs)
+    band = np.repeat(np.arange(n + 1), len(offsets))
+    x = (src_left[:, None] + offsets[None, :]).ravel()
+    y = np.full(len(x), src_top - PLAYER_H)
+    vy = np.zeros(len(x))
+    on_ground = np.ones(len(x), dtype=bool)
+    k = (x - src_left[band]) % PLAYER_SPEED
+    flown = np.zeros(len(x), dtype=bool)  # has left the ground: a landing back on the source counts
+
+    vy_ids = {}
+
+    def state_keys(band, x, y, vy, on_ground, k, flown):
+        # vy is compared bit for bit (float sums along different paths can differ in the last place)
+        uniq, inverse = np.unique(vy, return_inverse=True)
+        ids = np.array([vy_ids.setdefault(v, len(vy_ids)) for v in uniq.tolist()], dtype=np.int64)[inverse]
+        rel_x = x - lo[band]
+        key = ((band.astype(np.int64) << 12 | rel_x) << 12 | (y + 1024)) << 1 | on_ground
+        return ((key << 1 | flown) << 3 | k) << 16 | ids
+
+    def record_touches(depth, band, x, y, k):
+        # Flag cells the hitbox overlaps (a flag is drawn half a tile above its cell)
+        on = np.flatnonzero(band == flags)
+        if not len(on):
+            return
+        rx = x[on] - src_left[flags]
+        ry = y[on] - src_top
+        j0, j1 = rx // cs, (rx + PLAYER_W - 1) // cs
+        i0, i1 = (ry - cs // 2) // cs + 1, (ry + PLAYER_H + cs // 2 - 1) // cs
+        for j, i in ((j0, i0), (j0, i1), (j1, i0), (j1, i1)):
+            keys, first = np.unique(((j + 64) * 128 + i + 64) * 8 + k[on], return_index=True)
+            for key, idx in zip(keys.tolist(), on[first].tolist()):
+                cell = (key // 1024 - 64, key // 8 % 128 - 64, key % 8)
+                if cell not in touches:
+                    touches[cell] = (depth, idx)
+
+    # Per depth: positions, the index of the parent state one depth up and the input taken
+    hist_x, hist_y, hist_parent, hist_input = [x], [y], [None], [None]
+    record_touches(0, band, x, y, k)
+    seen = set(state_keys(band, x, y, vy, on_ground, k, flown).tolist())
+    ground_masks = np.array(_GROUND_INPUTS)
+    air_masks = np.array(_AIR_INPUTS + (-1,) * (len(_GROUND_INPUTS) - len(_AIR_INPUTS)))
+    while len(band):
+        masks = np.where(on_ground[:, None], ground_masks, air_masks).ravel()
+        valid = masks >= 0
+        parent = np.repeat(np.arange(len(band)), len(_GROUND_INPUTS))[valid]
+        masks = masks[valid]
+
+        sim.x, sim.y, sim.vy = x[parent], y[parent], vy[parent]
+        sim.vx = np.zeros(len(parent))
+        sim.on_ground = on_ground[parent]
+        sim.alive = np.ones(len(parent), dtype=bool)
+        sim.step(masks)
+        b, x, y, vy, on_ground = band[parent], sim.x, sim.y, sim.vy, sim.on_ground
+        k, flown = k[parent], flown[parent]
+        search = b != flags
+        bt = np.where(search, b, 0)
+
+        landed = (search & on_ground & (y == tgt_top[b] - PLAYER_H)
+                  & (x < tgt_left[b] + cs) & (x + PLAYER_W > tgt_left[b]))
+        landed &= flown | (b != home)
+        first_landing = landed & ~reached[bt, k]
+        keys, first = np.unique(b[first_landing] * PLAYER_SPEED + k[first_landing], return_index=True)
+        at = np.flatnonzero(first_landing)[first]
+        for key, i in zip(keys.tolist(), at.tolist()):
+            found[divmod(key, PLAYER_SPEED)] = (len(hist_x) - 1, int(parent[i]), int(masks[i]), int(x[i]), int(y[i]))
+        reached[bt[landed], k[landed]] = True
+        # Only the (0, 0) band needs to remember a flight; elsewhere standing again is a fresh start
+        flown = np.where(b == home, flown, False) | ~on_ground
+        keep = sim.alive & (x >= lo[b]) & (x < hi[b]) & ~(search & reached[bt, k])
+        # Falling with the feet already below the target's top: it can only be missed now
+        keep &= ~search | on_ground | (vy < 0) | (y + PLAYER_H <= tgt_top[b])
+        # The flag band goes as deep as the table does
+        keep &= search | (y <= src_top + down * cs)
+        parent, masks = parent[keep], masks[keep]
+        b, x, y, vy, on_ground, k, flown = b[keep], x[keep], y[keep], vy[keep], on_ground[keep], k[keep], flown[keep]
+        search = search[keep]
+
+        # Drop states that can't cover the horizontal distance before they fall past the target
+        feet = (y + PLAYER_H).astype(float)
+        fall_vy = vy.copy()
+        left = np.zeros(len(b))
+        flying = ~on_ground & search
+        while flying.any():
+            fall_vy = np.minimum(fall_vy + GRAVITY, float(MAX_FALL))
+            feet += fall_vy
+            left += flying
+            flying &= (feet <= tgt_top[b] + 0.5) | (fall_vy < 0)
+        distance = np.maximum(0, np.maximum(tgt_left[b] - (x + PLAYER_W) + 1, x - (tgt_left[b] + cs) + 1))
+        keep = ~search | on_ground | (distance <= PLAYER_SPEED * (left + 1))
+        parent, masks = parent[keep], masks[keep]
+        b, x, y, vy, on_ground, k, flown = b[keep], x[keep], y[keep], vy[keep], on_ground[keep], k[keep], flown[keep]
+
+        keys, first = np.unique(state_keys(b, x, y, vy, on_ground, k, flown), return_index=True)
+        fresh = np.fromiter((key not in seen for key in keys.tolist()), dtype=bool, count=len(keys))
+        seen.update(keys[fresh].tolist())
+        idx = first[fresh]
+        band, x, y, vy, on_ground, k, flown = b[idx], x[idx], y[idx], vy[idx], on_ground[idx], k[idx], flown[idx]
+        hist_x.append(x)
+        hist_y.append(y)
+        hist_parent.append(parent[idx])
+        hist_input.append(masks[idx])
+        record_touches(len(hist_x) - 1, band, x, y, k)
+
+    hist_x = [a.tolist() for a in hist_x]
+    hist_y = [a.tolist() for a in hist_y]
+    hist_parent = [None] + [a.tolist() for a in hist_parent[1:]]
+    hist_input = [None] + [a.tolist() for a in hist_input[1:]]
+
+    def trace(depth, i, left):
+        steps, inputs = [], []
+        while depth > 0:
+            steps.append((hist_x[depth][i] - left, hist_y[depth][i] - src_top))
+            inputs.append(hist_input[depth][i])
+            i = hist_parent[depth][i]
+            depth -= 1
+        steps.append((hist_x[0][i] - left, hist_y[0][i] - src_top))
+        return steps[::-1], inputs[::-1]
+
+    landings = {}
+    for (b, kk), (depth, i, mask, fx, fy) in found.items():
+        steps, inputs = trace(depth, i, int(src_left[b]))
+        steps.append((fx - int(src_left[b]), fy - src_top))
+        inputs.append(mask)
+        landings[targets[b] + (kk,)] = _path(steps, inputs, {(0, 0), targets[b]})
+    exits = {}
+    for cell, (depth, i) in touches.items():
+        steps, inputs = trace(depth, i, int(src_left[flags]))
+        exits[cell] = _path(steps, inputs, {(0, 0)})
+
+    cells = sorted({(dx, dy) for dx, dy, _ in landings} | {(0, 0)})
+    return ReachTable(up, down, width, cells, landings, exits)
+
+
+def entry_path():
+    key = f"{VERSION}|{settings_hash().hex()}|{PLAYER_W}x{PLAYER_H}|{MAX_FALL}|{MAX_DROP}"
+    return CACHE_DIR / f"reach-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]}.json"
+
+
+def load(path):
+    try:
+        return ReachTable.from_json(path.read_text(encoding="utf-8"))
+    except OSError:
+        return None
+
+
+def write(path, table):
+    """Atomic like assetcache.write; a failed write only means building again next time."""
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(table.to_json(), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return
+    # Entries for other settings, and the binary reach-*.bin ones of the first
+    # format, are never read again
+    for old in CACHE_DIR.glob("reach-*"):
+        if old != path and old.suffix != ".tmp":
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+
+_table = None
+_lock = threading.Lock()  # the pregen worker and the main thread may both ask first
+
+
+def table():
+    """The ReachTable for the current physics: from memory, the disk cache, or built now."""
+    global _table
+    with _lock:
+        if _table is None:
+            path = entry_path()
+            _table = load(path)
+            if _table is None:
+                _table = build()
+                write(path, _table)
+        return _table
+
+
+def main(argv=None):
+    global _table
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=("show",))
+    parser.add_argument("--rebuild", action="store_true", help="ignore the cache entry and build again")
+    args = parser.parse_args(argv)
+
+    path = entry_path()
+    cached = path.exists() and not args.rebuild
+    start = time.perf_counter()
+    if args.rebuild:
+        _table = build()
+        write(path, _table)
+    t = table()
+    print(f"{path.name}: {'loaded' if cached else 'built'} in {time.perf_counter() - start:.2f}s")
+    print("  dy  dx 0..")
+    for dy, row in zip(range(-t.up, t.down + 1), t.rows()):
+        print(f"  {dy:+3d} {row}")
+    print(f"max rise {t.max_rise()} rows, max gap {t.max_gap()} columns, "
+          f"max rise across one empty column {t.max_rise(2)} rows")
+    print(f"{len(t.landings)} landing paths, {len(t.exits)} exit paths")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
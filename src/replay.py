@@ -0,0 +1,187 @@
+"""
+Compact input replays: every physics tick's LEFT/RIGHT/JUMP bitmask, run-length encoded.
+
+    python src/replay.py info  replays/run-....rpl
+    python src/replay.py play  replays/run-....rpl     # headless, uncapped
+    python src/main.py --replay replays/run-....rpl [--fast]
+
+File layout (little endian):
+    b"PRPL", u8 version, 8-byte settings hash, i64 pack seed,
+    u8 levels, u16 width, u16 height, u32 ticks,
+    then runs as varints of (run_length << 3 | mask).
+
+A replay plus the pack seed rebuilds the exact same levels and inputs, and the
+fixed-timestep simulation makes the outcome identical in the headless engine and
+the windowed loop. The settings hash catches replays recorded with different physics.
+"""
+import sys
+import time
+import struct
+import hashlib
+import argparse
+from pathlib import Path
+import settings
+from inputs import FRAMES
+
+MAGIC = b"PRPL"
+VERSION = 3  # 3: seeds with unfinishable levels are skipped, so a seed can give a different pack
+_HEADER = struct.Struct("<4sB8sqBHHI")
+
+REPLAY_DIR = Path(__file__).resolve().parent / "replays"
+
+# Everything that changes what a tick does; rendering-only settings are left out
+_SIM_SETTINGS = ("TILE_SIZE", "GRAVITY", "JUMP_VELOCITY", "PLAYER_SPEED", "PHYSICS_HZ", "KILL_PLANE_Y")
+
+
+class ReplayMismatch(Exception):
+    pass
+
+
+def settings_hash():
+    text = ";".join(f"{name}={getattr(settings, name)!r}" for name in _SIM_SETTINGS)
+    return hashlib.sha1(text.encode("utf-8")).digest()[:8]
+
+
+def _write_varint(out, n):
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def _read_varints(data, pos):
+    n = shift = 0
+    for byte in data[pos:]:
+        n |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            yield n
+            n = shift = 0
+
+
+class Replay:
+    """Pack parameters plus the input runs [(mask, length), ...]."""
+    def __init__(self, seed, levels=3, width=42, height=11, runs=None, sim_hash=None):
+        self.seed = seed
+        self.levels = levels
+        self.width = width
+        self.height = height
+        self.runs = runs if runs is not None else []
+        self.sim_hash = sim_hash if sim_hash is not None else settings_hash()
+
+    @property
+    def ticks(self):
+        return sum(length for _, length in self.runs)
+
+    def append(self, mask):
+        if self.runs and self.runs[-1][0] == mask:
+            self.runs[-1] = (mask, self.runs[-1][1] + 1)
+        else:
+            self.runs.append((mask, 1))
+
+    def masks(self):
+        for mask, length in self.runs:
+            for _ in range(length):
+                yield mask
+
+    def layouts(self):
+        from main import generate_level_pack
+        return generate_level_pack(self.levels, self.width, self.height, seed=self.seed)
+
+    def check_settings(self):
+        if self.sim_hash != settings_hash():
+            raise ReplayMismatch("replay was recorded with different physics settings")
+
+    def to_bytes(self):
+        out = bytearray(_HEADER.pack(MAGIC, VERSION, self.sim_hash, self.seed,
+                                     self.levels, self.width, self.height, self.ticks))
+        for mask, length in self.runs:
+            _write_varint(out, (length << 3) | mask)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, sim_hash, seed, levels, width, height, ticks = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a replay file (or unsupported version)")
+        runs = [(v & 7, v >> 3) for v in _read_varints(data, _HEADER.size)]
+        replay = cls(seed, levels, width, height, runs, sim_hash)
+        if replay.ticks != ticks:
+            raise ValueError("truncated replay")
+        return replay
+
+    def save(self, path=None):
+        if path is None:
+            REPLAY_DIR.mkdir(parents=True, exist_ok=True)
+            path = REPLAY_DIR / f"run-{time.strftime('%Y%m%d-%H%M%S')}-{self.seed}.rpl"
+        path = Path(path)
+        path.write_bytes(self.to_bytes())
+        return path
+
+    @classmethod
+    def load(cls, path):
+        return cls.from_bytes(Path(path).read_bytes())
+
+
+class RecordingInput:
+    """Wraps another input provider and appends every polled mask to a Replay."""
+    def __init__(self, provider, replay):
+        self.provider = provider
+        self.replay = replay
+
+    def poll(self, level):
+        frame = self.provider.poll(level)
+        self.replay.append(frame.mask)
+        return frame
+
+
+class ReplayInput:
+    """Input provider that feeds a Replay's masks back, one per tick."""
+    def __init__(self, replay):
+        self._masks = replay.masks()
+        self.finished = False
+
+    def poll(self, level):
+        mask = next(self._masks, None)
+        if mask is None:
+            self.finished = True
+            return FRAMES[0]
+        return FRAMES[mask]
+
+
+def play_headless(replay):
+    """Re-run a replay at uncapped speed; returns (engine, stats)."""
+    from headless import HeadlessEngine
+
+    replay.check_settings()
+    engine = HeadlessEngine(replay.layouts(), ReplayInput(replay))
+    stats = engine.run(replay.ticks)
+    return engine, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=("info", "play"))
+    parser.add_argument("path")
+    args = parser.parse_args(argv)
+
+    replay = Replay.load(args.path)
+    size = Path(args.path).stat().st_size
+    print(f"seed {replay.seed}, {replay.levels} levels {replay.width}x{replay.height}, "
+          f"{replay.ticks} ticks ({replay.ticks / settings.PHYSICS_HZ:.1f}s), "
+          f"{len(replay.runs)} runs, {size} bytes")
+    if args.command == "play":
+        engine, stats = play_headless(replay)
+        print(f"result: {engine.status} on level {min(engine.level_index + 1, replay.levels)}/{replay.levels}, "
+              f"{len(engine.level.coins)} coins left; "
+              f"replayed in {stats['seconds']:.3f}s ({stats['steps_per_sec']:,.0f} ticks/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,43 +1,155 @@
 from __future__ import annotations
 from pathlib import Path
+import os
 import json
+import time
+import atexit
+import threading
 from typing import Any
 
 # Save file lives next to this script (same folder as main.py)
 BASE_DIR = Path(__file__).resolve().parent
 SAVE_PATH = BASE_DIR / "score.json"
 
-def _read_raw() -> dict:
-    if SAVE_PATH.exists():
+# How long the writer waits after a change so a burst of updates becomes one write
+WRITE_DELAY = 0.5
+
+def _read_raw(path: Path = SAVE_PATH) -> dict:
+    if path.exists():
         try:
-            return json.loads(SAVE_PATH.read_text(encoding="utf-8"))
+            return json.loads(path.read_text(encoding="utf-8"))
         except Exception:
             # If file is corrupted, reset
             return {"score": 0}
     return {"score": 0}
 
-def _write_raw(data: dict) -> None:
-    tmp = SAVE_PATH.with_suffix(".json.tmp")
-    tmp.write_text(json.dumps(data, ensure_ascii=False, indent=0), encoding="utf-8")
-    tmp.replace(SAVE_PATH)
+def _write_raw(data: dict, path: Path = SAVE_PATH) -> None:
+    # Write + fsync a temp file, then rename over the save: a crash leaves either the old or the new file
+    tmp = path.with_suffix(".json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(json.dumps(data, ensure_ascii=False, indent=0))
+        f.flush()
+        os.fsync(f.fileno())
+    tmp.replace(path)
 
-def load_score() -> int:
-    """Return current score (defaults to 0)."""
-    data = _read_raw()
+def _parse(data: Any) -> int:
     try:
         return int(data.get("score", 0))
     except Exception:
         return 0
 
+class JsonScoreFile:
+    """Score persisted as score.json (the default backend)."""
+    def __init__(self, path: Path = SAVE_PATH) -> None:
+        self.path = path
+
+    def read(self) -> int:
+        return _parse(_read_raw(self.path))
+
+    def write(self, value: int) -> None:
+        _write_raw({"score": value}, self.path)
+
+class ScoreStore:
+    """
+    Score kept in memory and written behind by a background thread.
+    The in-memory value is authoritative; the backend is read once, at construction.
+    Call flush() (or close()) before quitting to make sure the last change is saved.
+    backend: anything with read() -> int and write(int); JsonScoreFile by default.
+    """
+    def __init__(self, backend: Any = None, delay: float = WRITE_DELAY) -> None:
+        self.backend = backend if backend is not None else JsonScoreFile()
+        self.delay = delay
+        self._value = self.backend.read()
+        self._saved = self._value
+        self._closed = False
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()  # writer thread and flush() never write at once
+        self._thread = threading.Thread(target=self._run, name="score-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def set(self, value: int) -> int:
+        with self._cond:
+            self._value = int(value)
+            self._cond.notify()
+        return int(value)
+
+    def add(self, n: int) -> int:
+        with self._cond:
+            self._value += int(n)
+            value = self._value
+            self._cond.notify()
+        return value
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._value == self._saved and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+            time.sleep(self.delay)
+            self._write_pending()
+
+    def _write_pending(self) -> None:
+        with self._write_lock:
+            value = self._value
+            if value == self._saved:
+                return
+            try:
+                self.backend.write(value)
+            except OSError:
+                return  # stays dirty; the writer retries after its next delay
+            self._saved = value
+
+    def flush(self) -> None:
+        """Write any pending change now, on the calling thread."""
+        self._write_pending()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
+
+_store: ScoreStore | None = None
+
+def _get_store(backend: Any = None) -> ScoreStore:
+    global _store
+    if _store is None:
+        _store = ScoreStore(backend)
+        atexit.register(_store.close)
+    return _store
+
+def use_backend(backend: Any) -> int:
+    """Persist the score somewhere else (e.g. stats.StatsStore.score_backend()); returns its score."""
+    global _store
+    if _store is not None:
+        _store.close()
+        _store = None
+    return _get_store(backend).value
+
+def load_score() -> int:
+    """Return current score (defaults to 0). Only the first call reads the file."""
+    return _get_store().value
+
 def save_score(value: int) -> int:
-    """Persist exact score value and return it."""
-    _write_raw({"score": int(value)})
-    return int(value)
+    """Set exact score value (persisted in the background) and return it."""
+    return _get_store().set(value)
 
 def add_points(n: int = 1) -> int:
-    """Add points (can be negative) and persist. Returns new score."""
-    return save_score(load_score() + int(n))
+    """Add points (can be negative); persisted in the background. Returns new score."""
+    return _get_store().add(n)
 
 def subtract_points(n: int = 1) -> int:
-    """Subtract points and persist. Returns new score."""
+    """Subtract points; persisted in the background. Returns new score."""
     return add_points(-int(n))
+
+def flush_score() -> None:
+    """Block until the current score is on disk (call on quit)."""
+    if _store is not None:
+        _store.flush()
@@ -0,0 +1,164 @@
+"""
+Telas paradas (menu, pausa, derrota, vitória).
+
+Cada tela cria seus botões uma vez, desenha e então fica bloqueada em
+pygame.event.wait() até chegar uma entrada. Só redesenha quando algo muda
+(hover de botão, janela exposta), então parada no menu ela não gasta CPU.
+run() devolve a ação escolhida: uma das constantes abaixo.
+"""
+import pygame
+from settings import WIDTH, HEIGHT
+import textcache
+
+START = "start"
+RESUME = "resume"
+MENU = "menu"
+QUIT = "quit"
+
+_REDRAW_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWSHOWN, pygame.WINDOWRESTORED)
+
+class Button:
+    def __init__(self, rect, text, font):
+        self.rect = pygame.Rect(rect)
+        self.text = text
+        self.font = font
+        self.hovered = False
+
+    def update_hover(self, mouse_pos):
+        self.hovered = self.rect.collidepoint(mouse_pos)
+
+    def was_clicked(self, event):
+        return (
+            event.type == pygame.MOUSEBUTTONDOWN and
+            event.button == 1 and
+            self.rect.collidepoint(event.pos)
+        )
+
+    def draw(self, screen):
+        cor = (120, 160, 255) if self.hovered else (80, 120, 200)
+        pygame.draw.rect(screen, cor, self.rect, border_radius=8)
+        label = textcache.render(self.font, self.text, (255, 255, 255))
+        screen.blit(label, label.get_rect(center=self.rect.center))
+
+def draw_centered_text(screen, font, text, y, color=(240, 240, 240)):
+    surf = textcache.render(font, text, color)
+    screen.blit(surf, (WIDTH // 2 - surf.get_width() // 2, y))
+
+def _key(event, *keys):
+    return event.type == pygame.KEYDOWN and event.key in keys
+
+class IdleScreen:
+    """Base: desenha uma vez, depois espera eventos; subclasses fazem draw() e handle()."""
+    def __init__(self, font, big):
+        self.font = font
+        self.big = big
+        self.buttons = []
+
+    def draw(self, screen):
+        raise NotImplementedError
+
+    def handle(self, event):
+        """Ação para o evento, ou None para continuar esperando."""
+        return None
+
+    def _hover(self, pos):
+        # True se algum botão mudou de estado (só aí vale redesenhar)
+        changed = False
+        for b in self.buttons:
+            antes = b.hovered
+            b.update_hover(pos)
+            changed |= b.hovered != antes
+        return changed
+
+    def run(self, screen, ao_mostrar=None):
+        """ao_mostrar(): chamado uma vez, logo depois do primeiro desenho (trabalho que pode esperar a tela)."""
+        self._hover(pygame.mouse.get_pos())
+        sujo = True
+        while True:
+            if sujo:
+                self.draw(screen)
+                for b in self.buttons:
+                    b.draw(screen)
+                pygame.display.flip()
+                sujo = False
+                if ao_mostrar is not None:
+                    ao_mostrar()
+                    ao_mostrar = None
+            event = pygame.event.wait()
+            if event.type == pygame.QUIT:
+                return QUIT
+            if event.type == pygame.MOUSEMOTION:
+                sujo = self._hover(event.pos)
+            elif event.type in _REDRAW_EVENTS:
+                sujo = True
+            acao = self.handle(event)
+            if acao is not None:
+                return acao
+
+class MenuScreen(IdleScreen):
+    def __init__(self, font, big):
+        super().__init__(font, big)
+        self.btn_jogar = Button((WIDTH // 2 - 100, HEIGHT // 2 - 20, 200, 50), "Começar", font)
+        self.btn_sair  = Button((WIDTH // 2 - 100, HEIGHT // 2 + 50, 200, 50), "Sair", font)
+        self.buttons = [self.btn_jogar, self.btn_sair]
+
+    def draw(self, screen):
+        screen.fill((20, 25, 40))
+        draw_centered_text(screen, self.big, "Protótipo de Plataforma", HEIGHT // 2 - 100)
+
+    def handle(self, e):
+        if _key(e, pygame.K_RETURN, pygame.K_SPACE) or self.btn_jogar.was_clicked(e):
+            return START
+        if self.btn_sair.was_clicked(e):
+            return QUIT
+        return None
+
+class PausedScreen(IdleScreen):
+    def __init__(self, font, big):
+        super().__init__(font, big)
+        self.overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        self.overlay.fill((0, 0, 0, 140))
+
+    def draw(self, screen):
+        screen.fill((0, 0, 0))
+        screen.blit(self.overlay, (0, 0))
+        draw_centered_text(screen, self.big, "Pausado", HEIGHT // 2 - 30)
+        draw_centered_text(screen, self.font, "ESC = Voltar  •  Q = Sair", HEIGHT // 2 + 20)
+
+    def handle(self, e):
+        if _key(e, pygame.K_ESCAPE):
+            return RESUME
+        if _key(e, pygame.K_q):
+            return QUIT
+        return None
+
+class LostScreen(IdleScreen):
+    def __init__(self, font, big):
+        super().__init__(font, big)
+        self.btn_tentar = Button((WIDTH // 2 - 120, HEIGHT // 2 - 10, 240, 50), "Recomeçar do Nível 1", font)
+        self.btn_sair  = Button((WIDTH // 2 - 120, HEIGHT // 2 + 60, 240, 50), "Sair", font)
+        self.buttons = [self.btn_tentar, self.btn_sair]
+
+    def draw(self, screen):
+        screen.fill((20, 25, 40))
+        draw_centered_text(screen, self.big, "Você caiu!", HEIGHT // 2 - 100)
+
+    def handle(self, e):
+        if self.btn_tentar.was_clicked(e) or _key(e, pygame.K_RETURN, pygame.K_SPACE):
+            return START
+        if self.btn_sair.was_clicked(e) or _key(e, pygame.K_ESCAPE):
+            return QUIT
+        return None
+
+class VictoryScreen(IdleScreen):
+    def draw(self, screen):
+        screen.fill((10, 10, 10))
+        draw_centered_text(screen, self.big, "Você Venceu!", HEIGHT // 2 - 20)
+        draw_centered_text(screen, self.font, "ENTER = Menu  •  ESC = Sair", HEIGHT // 2 + 30)
+
+    def handle(self, e):
+        if _key(e, pygame.K_ESCAPE):
+            return QUIT
+        if _key(e, pygame.K_RETURN):
+            return MENU
+        return None
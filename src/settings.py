@@ -1,7 +1,11 @@
 
 WIDTH, HEIGHT = 960, 540
 TITLE = "Platformer Prototype"
-FPS = 60
+FPS = 60  # render cap (0 = uncapped); physics runs at PHYSICS_HZ regardless
+# Fixed-timestep simulation: GRAVITY, JUMP_VELOCITY and PLAYER_SPEED are per physics tick
+PHYSICS_HZ = 60
+FIXED_DT = 1.0 / PHYSICS_HZ
+MAX_FRAME_TIME = 0.25   # clamp long frames so a stall can't queue up hundreds of ticks
 
 TILE_SIZE = 48  # Render size
 GRAVITY = 0.8
@@ -13,6 +17,19 @@ CAMERA_MARGIN_Y = 100   # vertical margin before scrolling vertically
 KILL_PLANE_Y = HEIGHT + 200
 # Horizontal speed the Player uses when moving left/right (see player.handle_input)
 PLAYER_SPEED = 5
+# Static terrain is baked into square chunks of CHUNK_TILES x CHUNK_TILES tiles (see chunks.py)
+CHUNK_TILES = 16
+CHUNK_CACHE_SIZE = 16   # max baked chunk surfaces kept around at once
+# Coins outside the camera view don't advance their spin animation
+SKIP_OFFSCREEN_COIN_ANIMATION = True
+# Threads used to decode PNG/WAV files in parallel at startup
+LOAD_WORKERS = 8
+# Keep scaled images in src/asset_cache/ so later starts skip decoding and scaling
+ASSET_CACHE = True
+# Level packs kept generated ahead of time by the background worker
+PREGEN_PACKS = 2
+# Rendered text surfaces kept by textcache (LRU)
+TEXT_CACHE_SIZE = 128
 
 
 LEVELS = [
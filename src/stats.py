@@ -0,0 +1,218 @@
+"""
+Run history in SQLite (src/stats.db, WAL mode): one row per level played.
+
+    python src/stats.py top [--level 0] [--limit 10]    # best times and leaderboard
+    python src/stats.py bench --runs 200000              # synthetic load + query timings (temp db)
+
+Columns: run_id (one id per pack attempt), seed (pack seed), level_index,
+time (seconds of simulated time to clear it, NULL if not cleared), deaths,
+coins (collected), source ('human' or 'bot'), played_at (unix time).
+A packs table keeps one running total per run_id (levels cleared, time, coins),
+so the leaderboard is an index range scan instead of a GROUP BY over every row.
+
+The game loop only appends rows to a list; they are written in one transaction
+per flush() (end of a run, quit, or every BATCH_SIZE rows), so a frame never
+waits on more than an occasional commit. On first open the score from
+score.json is copied into the meta table, and score_backend() lets score.py
+keep the score here from then on.
+"""
+from __future__ import annotations
+import sys
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any
+from score import SAVE_PATH, JsonScoreFile
+
+DB_PATH = Path(__file__).resolve().parent / "stats.db"
+
+BATCH_SIZE = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY,
+    run_id      INTEGER NOT NULL,
+    seed        INTEGER NOT NULL,
+    level_index INTEGER NOT NULL,
+    time        REAL,
+    deaths      INTEGER NOT NULL DEFAULT 0,
+    coins       INTEGER NOT NULL DEFAULT 0,
+    source      TEXT    NOT NULL DEFAULT 'human',
+    played_at   REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_best_time ON runs (level_index, time) WHERE time IS NOT NULL;
+CREATE INDEX IF NOT EXISTS runs_by_run ON runs (run_id, level_index, time, coins);
+CREATE TABLE IF NOT EXISTS packs (
+    run_id     INTEGER PRIMARY KEY,
+    seed       INTEGER NOT NULL,
+    cleared    INTEGER NOT NULL,
+    total_time REAL    NOT NULL,
+    coins      INTEGER NOT NULL,
+    source     TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS packs_leaderboard ON packs (cleared, total_time);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class ScoreBackend:
+    """score.ScoreStore backend keeping the score in the stats database."""
+    def __init__(self, store: StatsStore) -> None:
+        self.store = store
+
+    def read(self) -> int:
+        return int(self.store.get_meta("score", "0"))
+
+    def write(self, value: int) -> None:
+        try:
+            self.store.set_meta("score", str(int(value)))
+        except sqlite3.Error as exc:
+            raise OSError(str(exc)) from exc
+
+
+class StatsStore:
+    def __init__(self, path: Path = DB_PATH, json_path: Path = SAVE_PATH) -> None:
+        self.path = path
+        # The score writer thread shares the connection, so every use goes through the lock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._pending: list[tuple] = []
+        self._migrate_json(json_path)
+
+    def _migrate_json(self, json_path: Path) -> None:
+        """One-time import of score.json; later opens see the marker and skip it."""
+        if self.get_meta("migrated_score_json") is not None:
+            return
+        with self._lock:
+            self._db.execute("BEGIN")
+            if json_path.exists():
+                self._db.execute("INSERT OR REPLACE INTO meta VALUES ('score', ?)",
+                                 (str(JsonScoreFile(json_path).read()),))
+            self._db.execute("INSERT INTO meta VALUES ('migrated_score_json', ?)", (str(time.time()),))
+            self._db.execute("COMMIT")
+
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def score_backend(self) -> ScoreBackend:
+        return ScoreBackend(self)
+
+    def record(self, run_id: int, seed: int, level_index: int, time_s: float | None,
+               deaths: int = 0, coins: int = 0, source: str = "human") -> None:
+        """Queue one level result; cheap enough to call from the game loop."""
+        self._pending.append((run_id, seed, level_index, time_s, deaths, coins, source, time.time()))
+        if len(self._pending) >= BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT INTO runs (run_id, seed, level_index, time, deaths, coins, source, played_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._db.executemany(
+                "INSERT INTO packs (run_id, seed, cleared, total_time, coins, source)"
+                " VALUES (?, ?, ? IS NOT NULL, COALESCE(?, 0), ?, ?)"
+                " ON CONFLICT (run_id) DO UPDATE SET cleared = cleared + excluded.cleared,"
+                " total_time = total_time + excluded.total_time, coins = coins + excluded.coins",
+                [(r[0], r[1], r[3], r[3], r[5], r[6]) for r in rows])
+            self._db.execute("COMMIT")
+
+    def best_times(self, level_index: int, limit: int = 10) -> list[tuple]:
+        """Fastest clears of one level: [(time, seed, coins, source), ...]."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT time, seed, coins, source FROM runs"
+                " WHERE level_index = ? AND time IS NOT NULL ORDER BY time LIMIT ?",
+                (level_index, limit)).fetchall()
+
+    def leaderboard(self, levels: int = 3, limit: int = 10) -> list[tuple]:
+        """Fastest full clears of a pack: [(total_time, seed, coins, source), ...]."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT total_time, seed, coins, source FROM packs"
+                " WHERE cleared = ? ORDER BY total_time LIMIT ?",
+                (levels, limit)).fetchall()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> StatsStore:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def _bench(store: StatsStore, runs: int, seed: int) -> None:
+    rnd = random.Random(seed)
+    start = time.perf_counter()
+    for _ in range(runs):
+        run_id = rnd.getrandbits(62)
+        pack_seed = rnd.randrange(2 ** 31)
+        for level_index in range(3):
+            if rnd.random() < 0.3:
+                store.record(run_id, pack_seed, level_index, None, 1, rnd.randrange(6), "bot")
+                break
+            store.record(run_id, pack_seed, level_index, rnd.uniform(8.0, 60.0), 0, rnd.randrange(6), "bot")
+    store.flush()
+    elapsed = time.perf_counter() - start
+    print(f"inserted {runs} runs in {elapsed:.2f}s ({runs / elapsed:,.0f} runs/s); table has {store.count()} rows")
+    for name, fn in (("best_times(0)", lambda: store.best_times(0)), ("leaderboard()", store.leaderboard)):
+        start = time.perf_counter()
+        fn()
+        print(f"{name}: {(time.perf_counter() - start) * 1e3:.2f} ms")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=("top", "bench"))
+    parser.add_argument("--db", type=Path, help=f"database file (default: {DB_PATH.name}; a temp file for bench)")
+    parser.add_argument("--level", type=int, default=0)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=100_000, help="synthetic runs to insert (bench)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        with tempfile.TemporaryDirectory() as tmp:
+            with StatsStore(args.db or Path(tmp) / "bench.db") as store:
+                _bench(store, args.runs, args.seed)
+        return 0
+    with StatsStore(args.db or DB_PATH) as store:
+        print(f"best times, level {args.level + 1}:")
+        for t, seed, coins, source in store.best_times(args.level, args.limit):
+            print(f"  {t:8.2f}s  seed {seed:<11} {coins} coins  {source}")
+        print("leaderboard (full packs):")
+        for t, seed, coins, source in store.leaderboard(limit=args.limit):
+            print(f"  {t:8.2f}s  seed {seed:<11} {coins} coins  {source}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
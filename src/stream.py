@@ -0,0 +1,207 @@
+"""
+Endless level: terrain is generated a few chunks ahead of the camera and thrown
+away once the camera has passed it.
+
+StreamLevel is a Level whose layout never exists as a whole. main.GeradorDeTrechos
+(the same chunk_flat / chunk_gap / chunk_stairs_up / ... generators the fixed-size
+levels use) runs in endless mode and hands over finished columns; tiles, coins and
+collision cells are created only for columns inside the live window
+
+    [camera left edge - BEHIND_TILES, camera right edge + AHEAD_TILES)
+
+and dropped as the window moves on. The camera only scrolls forward and the left
+screen edge is a wall, so dropped columns are never needed again. Memory and the
+work per frame depend on the window size, not on how far the player has run.
+
+    python src/stream.py --columns 1000
+"""
+import os
+import sys
+import time
+import random
+import tracemalloc
+import argparse
+from collections import deque
+
+import pygame
+from settings import TILE_SIZE, WIDTH, HEIGHT, CHUNK_TILES
+from spatial import TileWindow
+from chunks import StaticTileLayer
+from player import Player
+from level import Level
+import autotile
+
+# Columns kept generated past the right screen edge: a whole baked chunk, so no
+# chunk overlapping the view is ever baked before all of its columns exist
+AHEAD_TILES = CHUNK_TILES + 2
+# Columns kept left of the camera (collision looks one cell around the player)
+BEHIND_TILES = 2
+# Chance of a coin above each chunk's last foothold
+COIN_CHANCE = 0.5
+
+
+class StreamLevel(Level):
+    def __init__(self, assets, seed=None, height_tiles=11):
+        self.seed = seed
+        self.rows = height_tiles
+        self.coins_collected = 0
+        super().__init__(None, assets)
+
+    def build(self):
+        from main import GeradorDeTrechos
+        self.tiles.empty()
+        self.coins.empty()
+        self.flags.empty()
+        self.player = None
+        rnd = random.Random(self.seed) if self.seed is not None else random.Random()
+        self.generator = GeradorDeTrechos(self.rows, rnd=rnd)
+        self.grid = TileWindow(self.rows, TILE_SIZE)
+        self.tile_layer = StaticTileLayer(self.grid)
+        # layout rows of columns [_text_col0, generator.entregue): the live window, one
+        # column of left context and what is generated but not built yet (set_cell edits it)
+        self._text = [''] * self.rows
+        self._text_col0 = 0
+        self._built = 0  # columns [grid.col0, _built) have their tiles and coins
+        self._live_coins = deque()  # (column, coin) in column order, for eviction
+        self.coins_total = 0
+        self.stream()
+        if self.player is None:
+            self.player = Player(self.spawn, self.assets['player_anims'], self.sfx)
+
+    def _generate_until(self, col):
+        gen = self.generator
+        while gen.x <= col:
+            fx, fy = gen.proximo_trecho()
+            if gen.rnd.random() < COIN_CHANCE and gen.livre_acima(fx, fy):
+                gen.marcar(fx, fy - 1, 'C')
+            c0, rows = gen.colunas_prontas()
+            self._text = [old + new for old, new in zip(self._text, rows)]
+
+    def _build_until(self, col):
+        # The last finished column waits for its right neighbour before it is autotiled
+        self._generate_until(col + 1)
+        c0, c1 = self._built, col
+        if c1 <= c0:
+            return
+        self.grid.append_columns(c1 - c0)
+        masks = autotile.masks(self._text).tolist()
+        for c in range(c0, c1):
+            i = c - self._text_col0
+            for r in range(self.rows):
+                ch = self._text[r][i]
+                if ch == '.':
+                    continue
+                self.place(r, c, ch, masks[r][i])
+                if ch == 'C':
+                    self.coins_total += 1
+        self.tile_layer.invalidate_columns(c0, c1)
+        self._built = c1
+
+    def _drop_until(self, col):
+        for tile in self.grid.drop_columns(col):
+            tile.kill()
+        self.tile_layer.drop_columns(col)
+        coins = self._live_coins
+        while coins and coins[0][0] < col:
+            coin = coins.popleft()[1]
+            coin.kill()
+            self.coin_cells.remove(coin)
+        # Dropped columns keep one column of left context for autotiling
+        keep = self.grid.col0 - 1 - self._text_col0
+        if keep > 0:
+            self._text = [row[keep:] for row in self._text]
+            self._text_col0 += keep
+
+    def place(self, r, c, ch, mask=0):
+        sprite = super().place(r, c, ch, mask)
+        if ch == 'C':
+            # Eviction pops coins from the left; one added by set_cell behind newer ones
+            # just waits its turn
+            self._live_coins.append((c, sprite))
+        return sprite
+
+    def _char(self, r, c):
+        i = c - self._text_col0
+        if 0 <= r < self.rows and 0 <= i < len(self._text[r]):
+            return self._text[r][i]
+        return '.'
+
+    def _set_char(self, r, c, ch):
+        i = c - self._text_col0
+        row = self._text[r]
+        self._text[r] = row[:i] + ch + row[i + 1:]
+
+    def stream(self):
+        """Build the columns now ahead of the camera and drop those behind it."""
+        left = int(self.camera.x) // TILE_SIZE
+        self._build_until(left + WIDTH // TILE_SIZE + 1 + AHEAD_TILES)
+        self._drop_until(left - BEHIND_TILES)
+
+    def update(self, dt, keys):
+        super().update(dt, keys)
+        # The camera never scrolls back and the left screen edge is a wall
+        if self.camera.x < self.prev_camera.x:
+            self.camera.x = self.prev_camera.x
+        if self.player.rect.left < self.camera.x:
+            self.player.rect.left = int(self.camera.x)
+        self.stream()
+
+    def try_collect(self):
+        before = len(self.coins)
+        super().try_collect()
+        self.coins_collected += before - len(self.coins)
+
+    def distance(self):
+        """Tiles run from the spawn."""
+        return max(0, (self.player.rect.x - self.spawn[0]) // TILE_SIZE)
+
+
+def main(argv=None):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from main import load_assets
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--columns", type=int, default=1000, help="how far to scroll the camera, in tiles")
+    parser.add_argument("--step", type=int, default=5, help="camera pixels per frame")
+    parser.add_argument("--reports", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    assets = load_assets()
+    level = StreamLevel(assets, seed=args.seed)
+    # Park the player above the camera so only streaming and drawing are measured
+    level.player.rect.topleft = (0, -10 * TILE_SIZE)
+
+    tracemalloc.start()
+    end = args.columns * TILE_SIZE
+    every = max(1, end // args.step // args.reports)
+    print(f"{'column':>8} {'stream us':>10} {'worst us':>9} {'draw us':>8} {'tiles':>6} {'coins':>6} "
+          f"{'window':>7} {'chunks':>7} {'KiB':>8}")
+    frame = 0
+    streamed = worst = drawn = 0.0
+    while level.camera.x < end:
+        level.prev_camera.update(level.camera)
+        level.camera.x += args.step
+        t = time.perf_counter()
+        level.stream()
+        spent = time.perf_counter() - t
+        level.draw(screen)
+        drawn += time.perf_counter() - t - spent
+        streamed += spent
+        worst = max(worst, spent)
+        frame += 1
+        if frame % every == 0:
+            kib = tracemalloc.get_traced_memory()[0] / 1024
+            print(f"{int(level.camera.x) // TILE_SIZE:>8} {streamed / every * 1e6:>10.1f} {worst * 1e6:>9.1f} "
+                  f"{drawn / every * 1e6:>8.1f} {len(level.tiles):>6} {len(level.coins):>6} "
+                  f"{level.grid.cols:>7} {len(level.tile_layer._baked):>7} {kib:>8.1f}")
+            streamed = worst = drawn = 0.0
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
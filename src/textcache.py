@@ -0,0 +1,42 @@
+from collections import OrderedDict
+from settings import TEXT_CACHE_SIZE
+
+# Rendered text surfaces keyed by (font, text, color, antialias), least recently used
+# evicted first. HUD lines, button labels and screen titles repeat frame after frame,
+# so font rasterisation only happens the first time a string is shown.
+_cache = OrderedDict()
+_hits = 0
+_misses = 0
+
+
+def render(font, text, color, antialias=True):
+    """font.render(text, antialias, color), shared between callers; don't draw on the result."""
+    global _hits, _misses
+    key = (font, text, tuple(color), antialias)
+    surf = _cache.get(key)
+    if surf is not None:
+        _hits += 1
+        _cache.move_to_end(key)
+        return surf
+    _misses += 1
+    surf = font.render(text, antialias, color)
+    _cache[key] = surf
+    if len(_cache) > TEXT_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return surf
+
+
+def stats():
+    lookups = _hits + _misses
+    return {
+        'hits': _hits,
+        'misses': _misses,
+        'hit_rate': _hits / lookups if lookups else 0.0,
+        'surfaces': len(_cache),
+    }
+
+
+def clear():
+    global _hits, _misses
+    _cache.clear()
+    _hits = _misses = 0
@@ -0,0 +1,77 @@
+
+import pygame
+
+# Process-wide cache of derived surfaces, keyed by (source surface, size, flip_x, flip_y).
+# Tiles, coins, the flag and player frames all go through here, so every distinct
+# image exists once no matter how many sprites use it or how often levels are rebuilt.
+_cache = {}
+_sheets = {}
+_hits = 0
+_misses = 0
+
+
+def scaled(image, size, flip_x=False, flip_y=False):
+    """Return image scaled to size (and optionally flipped), shared between callers."""
+    global _hits, _misses
+    size = (int(size[0]), int(size[1]))
+    if not (flip_x or flip_y) and image.get_size() == size:
+        # Already the right size: share the source itself, no cache entry needed
+        _hits += 1
+        return image
+    key = (image, size, flip_x, flip_y)
+    surf = _cache.get(key)
+    if surf is not None:
+        _hits += 1
+        return surf
+    _misses += 1
+    surf = image if image.get_size() == size else pygame.transform.scale(image, size)
+    if flip_x or flip_y:
+        surf = pygame.transform.flip(surf, flip_x, flip_y)
+    _cache[key] = surf
+    return surf
+
+
+def sheet_frames(sheet, size):
+    """Slice a horizontal strip of square frames and scale each to (size, size)."""
+    global _hits, _misses
+    key = (sheet, size)
+    frames = _sheets.get(key)
+    if frames is not None:
+        _hits += 1
+        return frames
+    _misses += 1
+    sheet_w, sheet_h = sheet.get_size()
+    frame_w = sheet_h  # frames are square: width == height == sheet height
+    frames = [
+        scaled(sheet.subsurface(pygame.Rect(x, 0, frame_w, frame_w)), (size, size))
+        for x in range(0, sheet_w, frame_w)
+    ]
+    _sheets[key] = frames
+    return frames
+
+
+def stats():
+    """Cache counters plus the pixel memory held by cached surfaces."""
+    seen = set()
+    nbytes = 0
+    for surf in _cache.values():
+        if id(surf) in seen:
+            continue
+        seen.add(id(surf))
+        w, h = surf.get_size()
+        nbytes += w * h * surf.get_bytesize()
+    lookups = _hits + _misses
+    return {
+        'hits': _hits,
+        'misses': _misses,
+        'hit_rate': _hits / lookups if lookups else 0.0,
+        'surfaces': len(seen),
+        'bytes': nbytes,
+    }
+
+
+def clear():
+    global _hits, _misses
+    _cache.clear()
+    _sheets.clear()
+    _hits = _misses = 0
@@ -2,7 +2,9 @@
 import pygame
 
 def load_spritesheet(path, frame_w, frame_h):
-    sheet = pygame.image.load(path).convert_alpha()
+    return slice_spritesheet(pygame.image.load(path).convert_alpha(), frame_w, frame_h)
+
+def slice_spritesheet(sheet, frame_w, frame_h):
     frames = []
     sheet_w, sheet_h = sheet.get_size()
     for x in range(0, sheet_w, frame_w):
@@ -13,3 +15,26 @@ def load_spritesheet(path, frame_w, frame_h):
 def scale_surface(surf, scale):
     w, h = surf.get_size()
     return pygame.transform.scale(surf, (int(w*scale), int(h*scale)))
+
+class LazySound:
+    """
+    Sound effect that starts the mixer and decodes its file on the first play().
+    Keeps audio out of startup; a missing file or audio device just means silence.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.sound = None
+        self.failed = False
+
+    def play(self):
+        if self.sound is None:
+            if self.failed:
+                return
+            try:
+                if not pygame.mixer.get_init():
+                    pygame.mixer.init()
+                self.sound = pygame.mixer.Sound(str(self.path))
+            except (pygame.error, OSError):
+                self.failed = True
+                return
+        self.sound.play()
@@ -0,0 +1,573 @@
+"""
+Completability check for generated layouts: can every coin be picked up and the exit then reached?
+
+    python src/validate.py scan --seeds 0:20000              # report the seeds that can't be finished
+    python src/validate.py scan --seeds 0:20000 --workers 4
+    python src/validate.py check --seeds 0:300               # replay every jump the checker relied on
+
+problems(layout) lists what stops a layout from being finished, [] when a full
+run exists; completable(layout) is `not problems(layout)`.
+main.generate_level_pack uses it to skip seeds that would soft-lock the player.
+
+The search runs over grid cells, not pixels. A node is a standing segment (a
+run of solid tiles with air above) plus the player's x mod PLAYER_SPEED:
+walking moves PLAYER_SPEED pixels a tick, so that residue decides which pixels
+a jump can start from, and only walking into a wall changes it. Edges are the
+witness Paths from reach.py, input sequences recorded with the real physics in
+open air. A Path is only taken where every cell of its footprint is empty in
+the layout, and then the player moves exactly as recorded, so every run the
+checker finds can really be played. The converse doesn't hold: a jump that only
+works by brushing past a block, or only along another path than the recorded
+one, doesn't count, and the layout is reported even though it might be beatable.
+
+Footprints, solids and coins are Python ints used as bitsets over the padded
+grid, so trying a Path is one shift and one AND. Nodes are then merged into
+strongly connected components (everything inside one can be visited in any
+order) and the coin sets that can be carried along the component DAG decide.
+"""
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from settings import TILE_SIZE, PLAYER_SPEED
+from batch import PLAYER_W, PLAYER_H
+import reach
+
+SOLID_CHARS = "XB"
+
+# bytes.translate tables turning a layout row into a binary string
+_SOLID_DIGITS = bytes(49 if chr(i) in SOLID_CHARS else 48 for i in range(256))
+_COIN_DIGITS = bytes(49 if chr(i) == 'C' else 48 for i in range(256))
+
+# Coin sets kept per component; more only happens on contrived layouts, and dropping
+# some can only make the answer "not completable"
+MAX_CARRIED = 32
+
+
+class _Masks:
+    """
+    reach.Path bitsets for one padded grid width, relative to the source tile.
+    landings[(dx, dy)][base] and exits[(dx, dy)][base] list the Paths to that
+    target for a source tile whose left edge is base mod PLAYER_SPEED, as
+    (start residue, start, arrival residue, footprint bits, touched bits, path).
+    touched[(dx, dy)] is the union of the touched bits of a landings group and
+    common[(dx, dy)] the cells all its footprints share.
+    """
+    def __init__(self, table, cols):
+        self.pad_x = table.width + 3
+        self.pad_top = table.up + 2
+        self.stride = cols + 2 * self.pad_x
+        self.landings = self._group(table.landings)
+        self.exits = self._group(table.exits)
+        self.touched = {key: _union(o[4] for o in options[0]) for key, options in self.landings.items()}
+        self.common = {}
+        for key, options in self.landings.items():
+            common = options[0][0][3]
+            for o in options[0]:
+                common &= o[3]
+            self.common[key] = common
+        # dx offsets with landing Paths, per dy
+        self.offsets = {}
+        for dx, dy in self.landings:
+            self.offsets.setdefault(dy, set()).add(dx)
+
+    def bits(self, cells):
+        total = 0
+        for dx, dy in cells:
+            total |= 1 << ((dy + self.pad_top) * self.stride + dx + self.pad_x)
+        return total
+
+    def _group(self, paths):
+        grouped = {}
+        for (dx, dy, k), p in sorted(paths.items()):
+            grouped.setdefault((dx, dy), []).append((k, p, self.bits(p.footprint), self.bits(p.touched)))
+        return {
+            key: tuple(tuple(((base + k) % PLAYER_SPEED, p.start, (base + p.end) % PLAYER_SPEED, footprint, touched, p)
+                             for k, p, footprint, touched in options)
+                       for base in range(PLAYER_SPEED))
+            for key, options in grouped.items()
+        }
+
+
+def _union(values):
+    total = 0
+    for v in values:
+        total |= v
+    return total
+
+
+_compiled = {}
+
+
+def _masks(cols):
+    masks = _compiled.get(cols)
+    if masks is None:
+        masks = _compiled[cols] = _Masks(reach.table(), cols)
+    return masks
+
+
+class _Segment:
+    """Solid tiles row, c0..c1 with air above; x_min/x_max bound the standing hitbox x."""
+    __slots__ = ("row", "c0", "c1", "x_min", "x_max", "walls")
+
+    def __init__(self, row, c0, c1, wall_left, wall_right):
+        cs = TILE_SIZE
+        self.row, self.c0, self.c1 = row, c0, c1
+        self.x_min = c0 * cs if wall_left else c0 * cs - PLAYER_W + 1
+        self.x_max = (c1 + 1) * cs - PLAYER_W if wall_right else (c1 + 1) * cs - 1
+        # Walking into a wall snaps x to it: the only way to change the residue on foot
+        self.walls = [x % PLAYER_SPEED for x, wall in ((self.x_min, wall_left), (self.x_max, wall_right)) if wall]
+
+    def span(self, residue):
+        """First and last standing x with that residue."""
+        lo = self.x_min + (residue - self.x_min) % PLAYER_SPEED
+        hi = self.x_max - (self.x_max - residue) % PLAYER_SPEED
+        return lo, hi
+
+
+class Graph:
+    """
+    Standing nodes reachable from the spawn and the Paths between them. A node is
+    segment index * PLAYER_SPEED + residue.
+
+    edges[node]  list of (next node, coins bitset, (row, col, path)); path is None for walking into a wall
+    exits[node]  list of (coins bitset, (row, col, path)); path is None for touching the flag on foot
+    """
+    def __init__(self, layout):
+        rows = len(layout)
+        cols = len(layout[0]) if rows else 0
+        m = _masks(cols)
+        self.masks = m
+        cs = TILE_SIZE
+
+        def bit(r, c):
+            return 1 << ((r + m.pad_top) * m.stride + c + m.pad_x)
+
+        def row_shift(r):
+            return (r + m.pad_top) * m.stride + m.pad_x
+
+        # One int per row (bit c = column c), then the same bits placed in the padded grid
+        solid_rows, coin_rows = [], []
+        solids = coins = 0
+        flags = []
+        spawn = None
+        for r, line in enumerate(layout):
+            raw = line[:cols].encode("latin-1")[::-1]
+            solid_rows.append(int(raw.translate(_SOLID_DIGITS), 2) if cols else 0)
+            coin_rows.append(int(raw.translate(_COIN_DIGITS), 2) if cols else 0)
+            solids |= solid_rows[r] << row_shift(r)
+            coins |= coin_rows[r] << row_shift(r)
+            c = line.find('E', 0, cols)
+            while c != -1:
+                flags.append((r, c))
+                c = line.find('E', c + 1, cols)
+            if spawn is None and 'P' in line[:cols]:
+                spawn = (r, line.index('P'))
+        self.solids = solids
+        self.coins = coins
+        self.coin_rows = coin_rows
+        self.flags = flags
+        self.bit = bit
+
+        # Standing segments: runs of solid bits with no solid bit above
+        segments = []
+        segment_at = {}
+        for r in range(rows):
+            above = solid_rows[r - 1] if r else 0
+            runs = solid_rows[r] & ~above
+            while runs:
+                c0 = (runs & -runs).bit_length() - 1
+                past = runs + (1 << c0)
+                c1 = (past & -past).bit_length() - 2
+                runs &= ~((1 << (c1 + 1)) - 1)
+                for c in range(c0, c1 + 1):
+                    segment_at[r, c] = len(segments)
+                wall_left = c0 > 0 and above >> (c0 - 1) & 1
+                wall_right = above >> (c1 + 1) & 1
+                segments.append(_Segment(r, c0, c1, wall_left, wall_right))
+        self.segments = segments
+        # Segments close enough for a landing Path, per segment
+        table = reach.table()
+        self._near = [
+            [t for t, other in enumerate(segments)
+             if -table.up <= other.row - seg.row <= table.down
+             and other.c0 - seg.c1 < table.width and seg.c0 - other.c1 < table.width]
+            for seg in segments
+        ]
+
+        self.start = None
+        self.spawn_coins = 0
+        if spawn is not None:
+            # Player.__init__ centres the hitbox in the spawn cell; with no input it falls straight down
+            r, c = spawn
+            x = c * cs + cs // 2 - PLAYER_W // 2
+            while r < rows and not solid_rows[r] >> c & 1:
+                self.spawn_coins |= coins & bit(r, c)
+                r += 1
+            if r < rows:
+                self.start = segment_at[r, c] * PLAYER_SPEED + x % PLAYER_SPEED
+
+        self.edges = {}
+        self.exits = {}
+        self.standing = {}
+        done = {}
+        pending = [] if self.start is None else [self.start]
+        while pending:
+            node = pending.pop()
+            if node in self.edges:
+                continue
+            s, residue = divmod(node, PLAYER_SPEED)
+            if s not in done:
+                done[s] = self._segment_paths(s)
+            edges, exits = done[s][residue]
+            seg = segments[s]
+            r = seg.row
+
+            # Walking: coins beside the hitbox, a flag within half a tile of it, the walls
+            lo, hi = seg.span(residue)
+            covered = range(lo // cs, (hi + PLAYER_W - 1) // cs + 1)
+            if r:
+                beside = coin_rows[r - 1] & (1 << covered.stop) - (1 << max(0, covered.start))
+                self.standing[node] = beside << row_shift(r - 1)
+            else:
+                self.standing[node] = 0
+            if any(fr in (r - 1, r) and fc in covered for fr, fc in flags):
+                exits = exits + [(0, None)]
+            walls = [(node - residue + wall, 0, None) for wall in seg.walls if wall != residue]
+            self.edges[node] = walls + edges
+            self.exits[node] = exits
+            pending.extend(nxt for nxt, _, _ in self.edges[node])
+
+    def _segment_paths(self, s):
+        """
+        Landing and exit Paths that fit the layout from segment s, per start residue.
+
+        Offsets to a target segment are tried nearest first, and the search moves
+        on to the next target once every start residue has a Path to it: more
+        Paths to the same place only matter for coins picked up on the way.
+        """
+        m = self.masks
+        cs = TILE_SIZE
+        seg = self.segments[s]
+        r = seg.row
+        spans = [seg.span(residue) for residue in range(PLAYER_SPEED)]
+        out = [{} for _ in range(PLAYER_SPEED)]  # per residue: (next node, coins) -> how
+        fin = [{} for _ in range(PLAYER_SPEED)]  # per residue: coins -> how
+
+        # Per column: left edge, bit shift, and the solids and coins seen from there
+        placed = []
+        for c in range(seg.c0, seg.c1 + 1):
+            shift = r * m.stride + c
+            placed.append((c * cs, shift, self.solids >> shift, self.coins >> shift))
+
+        everything = (1 << PLAYER_SPEED) - 1
+        table = reach.table()
+        for t in self._near[s]:
+            if t == s:
+                # Back onto the same segment only matters for coins picked up in the air
+                reach_cols = (1 << seg.c1 + table.width) - (1 << max(0, seg.c0 - table.width + 1))
+                if not any(row & reach_cols for row in self.coin_rows[max(0, r - table.up - 1):max(0, r - 1)]):
+                    continue
+            target = self.segments[t]
+            dy = target.row - r
+            covered = 0  # bit per start residue that has a Path to t picking up no coins
+            offsets = m.offsets.get(dy)
+            if offsets is None:
+                continue
+            for dx in sorted(offsets.intersection(range(target.c0 - seg.c1, target.c1 - seg.c0 + 1)), key=abs):
+                c0 = seg.c0 if seg.c0 > target.c0 - dx else target.c0 - dx
+                c1 = seg.c1 if seg.c1 < target.c1 - dx else target.c1 - dx
+                options = m.landings[dx, dy]
+                common = m.common[dx, dy]
+                for c in range(c0, c1 + 1):
+                    left, shift, here, coins_here = placed[c - seg.c0]
+                    if here & common:
+                        continue
+                    if t == s and not m.touched[dx, dy] & coins_here:
+                        continue
+                    for residue, start, arrival, footprint, touched, path in options[left % PLAYER_SPEED]:
+                        got = touched & coins_here
+                        if covered >> residue & 1 and not got:
+                            continue
+                        lo, hi = spans[residue]
+                        if not lo <= left + start <= hi or here & footprint:
+                            continue
+                        key = (t * PLAYER_SPEED + arrival, got << shift if got else 0)
+                        if key not in out[residue]:
+                            out[residue][key] = (r, c, path)
+                            if not got:
+                                covered |= 1 << residue
+                    if covered == everything:
+                        break
+                if covered == everything:
+                    break
+
+        for fr, fc in self.flags:
+            covered = 0
+            for c in sorted(range(seg.c0, seg.c1 + 1), key=lambda c: abs(fc - c)):
+                options = m.exits.get((fc - c, fr - r))
+                if options is None:
+                    continue
+                left, shift, here, coins_here = placed[c - seg.c0]
+                for residue, start, _, footprint, touched, path in options[left % PLAYER_SPEED]:
+                    got = touched & coins_here
+                    if covered >> residue & 1 and not got:
+                        continue
+                    lo, hi = spans[residue]
+                    got = got << shift if got else 0
+                    if lo <= left + start <= hi and got not in fin[residue] and not here & footprint:
+                        fin[residue][got] = (r, c, path)
+                        if not got:
+                            covered |= 1 << residue
+                if covered == everything:
+                    break
+        return [([(nxt, got, how) for (nxt, got), how in out[i].items()],
+                 [(got, how) for got, how in fin[i].items()]) for i in range(PLAYER_SPEED)]
+
+    def components(self):
+        """Strongly connected components of the node graph, sources first (iterative Tarjan)."""
+        index, low, comp = {}, {}, {}
+        stack, out = [], []
+        counter = 0
+        for root in self.edges:
+            if root in index:
+                continue
+            work = [(root, iter(self.edges[root]))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            while work:
+                node, it = work[-1]
+                for nxt, _, _ in it:
+                    if nxt not in index:
+                        index[nxt] = low[nxt] = counter
+                        counter += 1
+                        stack.append(nxt)
+                        work.append((nxt, iter(self.edges[nxt])))
+                        break
+                    if nxt not in comp:
+                        low[node] = min(low[node], index[nxt])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == index[node]:
+                        members = []
+                        while True:
+                            top = stack.pop()
+                            comp[top] = len(out)
+                            members.append(top)
+                            if top == node:
+                                break
+                        out.append(members)
+        # Tarjan finishes sinks first
+        order = len(out) - 1
+        return [out[order - i] for i in range(len(out))], {n: order - c for n, c in comp.items()}
+
+    def describe(self, bits):
+        m = self.masks
+        cells = []
+        b = 0
+        while bits:
+            if bits & 1:
+                r, c = divmod(b, m.stride)
+                cells.append((c - m.pad_x, r - m.pad_top))
+            bits >>= 1
+            b += 1
+        return cells
+
+
+def _pareto(masks):
+    """Drop coin sets contained in another one."""
+    keep = []
+    for mask in sorted(set(masks), key=lambda v: -bin(v).count("1")):
+        if all(mask | other != other for other in keep):
+            keep.append(mask)
+    return keep[:MAX_CARRIED]
+
+
+def problems(layout):
+    """What stops layout from being completed, as readable strings; [] when a full run exists."""
+    g = Graph(layout)
+    if g.start is None:
+        return ["the player falls from the spawn into a pit"]
+    want = g.coins
+    comps, comp_of = g.components()
+    carried = [[] for _ in comps]
+    carried[comp_of[g.start]].append(g.spawn_coins)
+    for i, members in enumerate(comps):
+        if not carried[i]:
+            continue
+        inside = 0
+        for node in members:
+            inside |= g.standing[node]
+            for nxt, got, _ in g.edges[node]:
+                if comp_of[nxt] == i:
+                    inside |= got
+        held = _pareto(have | inside for have in carried[i])
+        finish = [got for node in members for got, _ in g.exits[node]]
+        if any(have | got == want for have in held for got in finish):
+            return []
+        for node in members:
+            for nxt, got, _ in g.edges[node]:
+                j = comp_of[nxt]
+                if j != i:
+                    carried[j] = _pareto(carried[j] + [have | got for have in held])
+
+    # No run: say why, looking at everything reachable in any order
+    found = g.spawn_coins
+    exit_seen = False
+    for node, edges in g.edges.items():
+        found |= g.standing[node]
+        for _, got, _ in edges:
+            found |= got
+        for got, _ in g.exits[node]:
+            found |= got
+            exit_seen = True
+    out = [f"coin at column {c}, row {r} can't be reached" for c, r in g.describe(want & ~found)]
+    if not exit_seen:
+        out.append("the exit can't be reached")
+    if not out:
+        out.append("no single run picks up every coin and then reaches the exit")
+    return out
+
+
+def completable(layout):
+    return not problems(layout)
+
+
+def replay_paths(layout):
+    """
+    Run every Path the checker would take on layout through batch.BatchSim on the
+    real layout. Returns (paths checked, mismatches); a mismatch is a Path that
+    didn't end where it was recorded to or picked up other coins than predicted.
+    """
+    import numpy as np
+    from batch import BatchSim
+
+    g = Graph(layout)
+    cs = TILE_SIZE
+    runs = []
+    for node, edges in g.edges.items():
+        for nxt, got, how in edges:
+            if how is not None:
+                seg = g.segments[nxt // PLAYER_SPEED]
+                runs.append((how, got, seg.row))
+        for got, how in g.exits[node]:
+            if how is not None:
+                runs.append((how, got, None))
+    if not runs:
+        return 0, []
+    sim = BatchSim(layout, len(runs))
+    sim.x = np.array([c * cs + p.start for (r, c, p), _, _ in runs])
+    sim.y = np.array([r * cs - PLAYER_H for (r, c, p), _, _ in runs])
+    sim.vx = np.zeros(len(runs))
+    sim.vy = np.zeros(len(runs))
+    sim.on_ground = np.ones(len(runs), dtype=bool)
+    sim.alive = np.ones(len(runs), dtype=bool)
+    longest = max(len(p.inputs) for (_, _, p), _, _ in runs)
+    inputs = np.zeros((longest, len(runs)), dtype=np.int64)
+    for i, ((_, _, p), _, _) in enumerate(runs):
+        inputs[:len(p.inputs), i] = p.inputs
+    trail = []
+    for t in range(longest):
+        sim.step(inputs[t])
+        trail.append((sim.x.copy(), sim.y.copy(), sim.on_ground.copy()))
+
+    def cells(x, y):
+        return [(r, c) for r in range(y // cs, (y + PLAYER_H - 1) // cs + 1)
+                for c in range(x // cs, (x + PLAYER_W - 1) // cs + 1)]
+
+    mismatches = []
+    for i, ((r, c, p), got, land_row) in enumerate(runs):
+        n = len(p.inputs)
+        picked = 0
+        for t in range(n):
+            for rr, cc in cells(int(trail[t][0][i]), int(trail[t][1][i])):
+                if 0 <= rr < len(layout) and 0 <= cc < len(layout[0]) and layout[rr][cc] == 'C':
+                    picked |= g.bit(rr, cc)
+        x, y, ground = int(trail[n - 1][0][i]), int(trail[n - 1][1][i]), bool(trail[n - 1][2][i])
+        if land_row is not None:
+            ok = ground and x == c * cs + p.end and y == land_row * cs - PLAYER_H
+        else:
+            ok = x == c * cs + p.end and any(
+                layout[fr][fc] == 'E' and x < (fc + 1) * cs and x + PLAYER_W > fc * cs
+                and y < fr * cs + cs // 2 and y + PLAYER_H > fr * cs - cs // 2
+                for fr in range(len(layout)) for fc in range(len(layout[0])))
+        if not ok or picked != got:
+            mismatches.append((r, c, p, (x, y, ground)))
+    return len(runs), mismatches
+
+
+def _seed_range(text):
+    first, _, last = text.partition(":")
+    return range(int(first), int(last))
+
+
+def _scan_chunk(seeds, width, height):
+    from main import generate_level_layout
+
+    failing = []
+    spent = 0.0
+    for seed in seeds:
+        layout = generate_level_layout(width, height, seed=seed)
+        start = time.perf_counter()
+        found = problems(layout)
+        spent += time.perf_counter() - start
+        if found:
+            failing.append((seed, found))
+    return failing, spent
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=("scan", "check"))
+    parser.add_argument("--seeds", type=_seed_range, default=range(0, 1000), help="first:last (last excluded)")
+    parser.add_argument("--width", type=int, default=42)
+    parser.add_argument("--height", type=int, default=11)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk", type=int, default=500, help="seeds per worker task")
+    parser.add_argument("--show", type=int, default=20, help="failing seeds to list")
+    args = parser.parse_args(argv)
+
+    reach.table()  # build the cache entry once, before the workers all try to
+    if args.command == "check":
+        from main import generate_level_layout
+        total = 0
+        bad = 0
+        for seed in args.seeds:
+            checked, mismatches = replay_paths(generate_level_layout(args.width, args.height, seed=seed))
+            total += checked
+            for r, c, p, state in mismatches[:args.show]:
+                print(f"seed {seed}: path from column {c}, row {r} ended at {state}")
+            bad += len(mismatches)
+        print(f"{len(args.seeds)} layouts, {total} paths replayed, {bad} mismatches")
+        return 1 if bad else 0
+
+    seeds = args.seeds
+    chunks = [seeds[i:i + args.chunk] for i in range(0, len(seeds), args.chunk)]
+    start = time.perf_counter()
+    if args.workers > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            results = list(pool.map(_scan_chunk, chunks, [args.width] * len(chunks), [args.height] * len(chunks)))
+    else:
+        results = [_scan_chunk(chunk, args.width, args.height) for chunk in chunks]
+    elapsed = time.perf_counter() - start
+
+    failing = sorted(f for part, _ in results for f in part)
+    spent = sum(s for _, s in results)
+    for seed, found in failing[:args.show]:
+        print(f"seed {seed}: {'; '.join(found)}")
+    if len(failing) > args.show:
+        print(f"... {len(failing) - args.show} more")
+    print(f"{len(failing)} of {len(seeds)} seeds can't be completed ({len(failing) / max(1, len(seeds)):.2%})")
+    print(f"{len(seeds) / elapsed:,.0f} seeds/s generated and checked on {args.workers} worker(s); "
+          f"checking alone {spent / max(1, len(seeds)) * 1e3:.3f} ms per layout "
+          f"({len(seeds) / spent if spent else 0:,.0f}/s per worker)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())